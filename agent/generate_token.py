@@ -9,6 +9,14 @@ import json
 import base64
 from datetime import datetime
 import sys
+import os
+import csv
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# This must match the JWT_SECRET in .env.local
+JWT_SECRET = 'your-secret-key-change-this-in-production'
 
 def base64url_encode(data):
     """Encode data to base64url format"""
@@ -16,8 +24,7 @@ def base64url_encode(data):
 
 def generate_token(user_id, username):
     """Generate a valid JWT token"""
-    # This must match the JWT_SECRET in .env.local
-    secret = 'your-secret-key-change-this-in-production'
+    secret = JWT_SECRET
     
     # Create header
     header = {
@@ -49,7 +56,132 @@ def generate_token(user_id, username):
     token = f"{header_encoded}.{payload_encoded}.{signature_encoded}"
     return token
 
+class TokenMinter:
+    """Mints the same tokens as generate_token with per-token work kept minimal"""
+
+    def __init__(self, secret=JWT_SECRET):
+        # The header never changes and the HMAC key schedule is computed once;
+        # each token only copies the keyed state and hashes its own message
+        self._prefix = base64url_encode(json.dumps({'alg': 'HS256', 'typ': 'JWT'})) + '.'
+        self._mac = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+    def mint(self, user_id, username, iat=None):
+        payload = {
+            'id': user_id,
+            'username': username,
+            'iat': int(time.time() * 1000) if iat is None else iat
+        }
+        message = self._prefix + base64url_encode(json.dumps(payload))
+        mac = self._mac.copy()
+        mac.update(message.encode())
+        signature_encoded = base64.urlsafe_b64encode(mac.digest()).decode().rstrip('=')
+        return f"{message}.{signature_encoded}"
+
+_worker_minter = None
+
+def _init_worker(secret):
+    global _worker_minter
+    _worker_minter = TokenMinter(secret)
+
+def _mint_chunk(rows):
+    return [(user_id, username, _worker_minter.mint(user_id, username)) for user_id, username in rows]
+
+def read_pairs(stream):
+    """Yield (user_id, username) pairs from CSV lines; username defaults to user_id"""
+    for row in csv.reader(stream):
+        if not row or not row[0].strip() or row[0].startswith('#'):
+            continue
+        if row[0].strip().lower() in ('user_id', 'id'):
+            continue  # header line
+        user_id = row[0].strip()
+        username = row[1].strip() if len(row) > 1 and row[1].strip() else user_id
+        yield user_id, username
+
+def _chunks(pairs, size):
+    chunk = []
+    for pair in pairs:
+        chunk.append(pair)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def mint_bulk(pairs, out, fmt='csv', workers=None, chunk_size=2000, secret=JWT_SECRET):
+    """Mint a token for every pair and write them to out; returns the count"""
+    workers = workers or os.cpu_count() or 1
+
+    if fmt == 'csv':
+        writer = csv.writer(out)
+        writer.writerow(('user_id', 'username', 'token'))
+        write = writer.writerows
+    else:
+        def write(results):
+            for user_id, username, token in results:
+                out.write(json.dumps({'user_id': user_id, 'username': username, 'token': token}) + '\n')
+
+    count = 0
+    chunks = _chunks(pairs, chunk_size)
+
+    if workers == 1:
+        _init_worker(secret)
+        for chunk in chunks:
+            results = _mint_chunk(chunk)
+            write(results)
+            count += len(results)
+        return count
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(secret,)) as pool:
+        # Keep a bounded number of chunks in flight so input is streamed and
+        # output stays in input order
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(_mint_chunk, chunk))
+            if len(pending) >= workers * 2:
+                results = pending.pop(0).result()
+                write(results)
+                count += len(results)
+        for future in pending:
+            results = future.result()
+            write(results)
+            count += len(results)
+
+    return count
+
+def bulk_main(args):
+    """Mint tokens for a whole fleet from a file or stdin"""
+    source = sys.stdin if args.bulk == '-' else open(args.bulk, newline='')
+    out = sys.stdout if not args.output else open(args.output, 'w', newline='')
+
+    try:
+        started = time.perf_counter()
+        count = mint_bulk(read_pairs(source), out, args.format, args.workers, args.chunk_size)
+        elapsed = time.perf_counter() - started
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"[✓] Minted {count} tokens in {elapsed:.2f}s ({rate:,.0f} tokens/sec)", file=sys.stderr)
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate JWT tokens for monitor agents')
+    parser.add_argument('user_id', nargs='?')
+    parser.add_argument('username', nargs='?', default=None)
+    parser.add_argument('--bulk', metavar='FILE',
+                        help="Mint tokens for user_id,username lines from FILE ('-' for stdin)")
+    parser.add_argument('--format', choices=['csv', 'ndjson'], default='csv', help='Bulk output format')
+    parser.add_argument('--output', '-o', help='Bulk output file (default: stdout)')
+    parser.add_argument('--workers', type=int, help='Bulk worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=2000, help='Pairs per worker task')
+    args = parser.parse_args()
+    
+    if args.bulk:
+        bulk_main(args)
+        sys.exit(0)
+    
     # You would normally get these from registration
     # For now, let's create a test token
     
@@ -57,9 +189,9 @@ if __name__ == '__main__':
     print("Smart Meter Monitor - Token Generator")
     print("="*60 + "\n")
     
-    if len(sys.argv) > 1:
-        user_id = sys.argv[1]
-        username = sys.argv[2] if len(sys.argv) > 2 else 'testuser'
+    if args.user_id:
+        user_id = args.user_id
+        username = args.username or 'testuser'
     else:
         # Default test values
         user_id = '6f749fa5-76f6-4ade-ac9c-f23199dc1fcc'
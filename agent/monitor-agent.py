@@ -16,39 +16,107 @@ import hashlib
 from datetime import datetime
 from urllib.parse import urljoin
 import argparse
-import re
+
+# Shared client modules live in ../common in the source tree and are
+# packaged next to this script in the download
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'common'))
+from resilience import Resilience, CircuitOpenError
+from pipeline import Pipeline, ticker
+from memprofile import MemoryProfiler
+from checkpoint import KeyCheckpoint, key_digest
+from netns import NamespaceScanner
+from capture_filter import CaptureFilter, FilterError
+from addresses import AddressClassifier, load_sites
+from ifaddrs import AddressWatcher
+from geodb import GeoDatabase
 
 # Configuration
 SERVER_URL = os.environ.get('MONITOR_SERVER_URL', 'http://localhost:3000')
 AUTH_TOKEN = os.environ.get('MONITOR_AUTH_TOKEN', '')
 DEVICE_NAME = os.environ.get('MONITOR_DEVICE_NAME', socket.gethostname())
 REFRESH_INTERVAL = int(os.environ.get('MONITOR_REFRESH_INTERVAL', '10'))
+STATE_FILE = os.environ.get('MONITOR_STATE_FILE',
+                            os.path.join(os.path.expanduser('~'), '.monitor-agent', 'connections.ckpt'))
+CHECKPOINT_INTERVAL = int(os.environ.get('MONITOR_CHECKPOINT_INTERVAL', '60'))
+CAPTURE_FILTER = os.environ.get('MONITOR_FILTER', '')
+SITES_FILE = os.environ.get('MONITOR_SITES', '')
+GEODB_FILE = os.environ.get('MONITOR_GEODB', '')
+
+# What `ss -tuln` used to select when no capture filter is set
+LISTENING = CaptureFilter('state listen,unconn')
 
 
 class NetworkMonitor:
-    def __init__(self, server_url, auth_token, device_name):
+    def __init__(self, server_url, auth_token, device_name, state_file=None,
+                 checkpoint_interval=CHECKPOINT_INTERVAL):
         self.server_url = server_url
         self.auth_token = auth_token
         self.device_name = device_name
         self.registered = False
         self.os_type = platform.system()
         self.seen_connections = set()
+        # Keys present in the latest scan, reported or not
+        self.live_connections = set()
         self.ipv4_addresses = set()
+        # Module-level requests by default; a requests.Session can be swapped in
+        # to reuse pooled connections
+        self.http = requests
+        # Retries, backoff and circuit breakers for every server call
+        self.resilience = Resilience()
+        self.registration_rejected = False
+        # Warm start: digests of the connections reported before the last
+        # restart, consulted only until the first scan has run
+        self.checkpoint = KeyCheckpoint(state_file) if state_file else None
+        self.checkpoint_interval = checkpoint_interval
+        self.warm_digests = None
+        self.warm_restored = 0
+        self.last_checkpoint = time.monotonic()
+        # Set by enable_namespaces() on container hosts
+        self.namespace_scanner = None
+        # Linux: keeps ipv4_addresses current from kernel address change notifications
+        self.address_watcher = None
+        # Set by set_filter(); None reports listening sockets as before
+        self.capture_filter = None
+        # Tags remote addresses with their scope and, with set_sites(), the operator's site
+        self.classifier = AddressClassifier()
+        # Country/ASN range file (tools/build_geodb.py), set by set_geodb()
+        self.geodb = None
     
     def is_ipv4(self, ip):
         """Check if an IP address is IPv4"""
-        ipv4_pattern = r'^(\d{1,3}\.){3}\d{1,3}$'
-        if re.match(ipv4_pattern, ip):
-            try:
-                parts = ip.split('.')
-                return all(0 <= int(part) <= 255 for part in parts)
-            except:
-                return False
-        return False
+        address = self.classifier.classify(ip)
+        return address is not None and address.version == 4 and ':' not in ip
     
     def is_ipv6(self, ip):
         """Check if an IP address is IPv6"""
-        return ':' in ip and not ip.startswith('127') and not ip.startswith('0')
+        address = self.classifier.classify(ip)
+        return address is not None and address.version == 6
+
+    def set_sites(self, path):
+        """Load operator site ranges (`CIDR [label]` lines) used to tag remote addresses"""
+        self.classifier = AddressClassifier(load_sites(path))
+
+    def set_geodb(self, path):
+        """Enrich public remote addresses with country and ASN from a compiled range file"""
+        self.geodb = GeoDatabase(path)
+
+    def tag_connection(self, connection):
+        """Add the remote address's scope and site, and its country and ASN if public, to a connection"""
+        address = self.classifier.classify(connection['destIp'])
+        if address is not None:
+            connection['destScope'] = address.scope
+            if address.site:
+                connection['destSite'] = address.site
+            if self.geodb and address.scope == 'public':
+                info = self.geodb.lookup(connection['destIp'])
+                if info is not None:
+                    if info.country:
+                        connection['destCountry'] = info.country
+                    if info.asn:
+                        connection['destAsn'] = info.asn
+                    if info.org:
+                        connection['destOrg'] = info.org
+        return connection
 
     def register_device(self):
         """Register the device with the monitoring server"""
@@ -59,7 +127,7 @@ class NetworkMonitor:
                 'deviceName': self.device_name
             }
             
-            response = requests.post(endpoint, json=payload, timeout=5)
+            response = self.resilience.post(self.http, endpoint, json=payload, timeout=5)
             
             if response.status_code == 200:
                 data = response.json()
@@ -74,7 +142,12 @@ class NetworkMonitor:
                 except:
                     error_msg = response.text or f"HTTP {response.status_code}"
                 print(f"[✗] Registration failed: {error_msg}")
+                # 4xx means the server rejected us; retrying will not help
+                self.registration_rejected = response.status_code < 500 and response.status_code != 429
                 return False
+        except CircuitOpenError as e:
+            print(f"[✗] Server unavailable, next attempt in {e.retry_after:.0f}s")
+            return False
         except requests.exceptions.ConnectionError:
             print(f"[✗] Connection error: Cannot reach server at {self.server_url}")
             print(f"    Make sure the dashboard server is running: npm run dev")
@@ -85,6 +158,14 @@ class NetworkMonitor:
 
     def get_local_ipv4_addresses(self):
         """Get all local IPv4 addresses on the machine"""
+        if self.os_type == 'Linux' and self.address_watcher is None:
+            try:
+                self.address_watcher = AddressWatcher()
+            except OSError as e:
+                print(f"[!] rtnetlink unavailable ({str(e)}); local addresses are read once at startup")
+        if self.address_watcher:
+            self.ipv4_addresses = self.address_watcher.ips(4)
+            return
         try:
             if self.os_type == 'Windows':
                 cmd = "ipconfig"
@@ -103,32 +184,73 @@ class NetworkMonitor:
         except:
             pass
     
+    def refresh_local_addresses(self):
+        """Apply the address changes the kernel has queued since the last cycle (Linux)"""
+        if not self.address_watcher:
+            return
+        try:
+            added, removed = self.address_watcher.refresh()
+        except OSError as e:
+            print(f"    [!] Could not read address changes: {str(e)}")
+            return
+        if added or removed:
+            self.ipv4_addresses = self.address_watcher.ips(4)
+            changes = [f"+{a.ip} ({a.interface})" for a in added] + [f"-{a.ip} ({a.interface})" for a in removed]
+            print(f"    Local addresses changed: {', '.join(changes)}")
+
+    def set_filter(self, expression):
+        """Only report sockets matching a capture filter expression (see common/capture_filter.py)"""
+        self.capture_filter = CaptureFilter(expression)
+
+    def wanted(self, proto, state, local_ip, local_port, remote_ip, remote_port):
+        """Exact capture filter check for sockets from backends that cannot filter themselves"""
+        if self.capture_filter is None:
+            return True
+        return self.capture_filter.match(proto, state, local_ip, local_port, remote_ip, remote_port)
+
+    def read_ss(self):
+        """(proto, state, local, remote) rows from ss, which filters them in the kernel"""
+        capture = self.capture_filter or LISTENING
+        if capture.matches_nothing():
+            return []
+        result = subprocess.run(['ss', '-H', '-n', *capture.ss_args()],
+                                capture_output=True, text=True, timeout=5)
+        # ss leaves out the Netid and State columns when only one value is possible
+        has_netid, has_state = capture.ss_columns()
+        proto = None if has_netid else next(iter(capture.protocols))
+        state = None if has_state else next(iter(capture.states))
+        rows = []
+        for line in result.stdout.splitlines():
+            parts = line.split()
+            if len(parts) < 4 + has_netid + has_state:
+                continue
+            rows.append((parts[0].upper() if has_netid else proto,
+                         parts[has_netid] if has_state else state,
+                         parts[-2], parts[-1]))
+        return rows
+
+    def read_netstat_linux(self):
+        """(proto, state, local, remote) rows from netstat, for hosts without ss"""
+        # Without a filter, listening sockets only, as before
+        flags = '-tuan' if self.capture_filter else '-tuln'
+        result = subprocess.run(['netstat', flags], capture_output=True, text=True, timeout=5)
+        rows = []
+        for line in result.stdout.splitlines():
+            parts = line.split()
+            if len(parts) < 5 or not parts[0].startswith(('tcp', 'udp')):
+                continue
+            rows.append((parts[0].upper(), parts[5] if len(parts) > 5 else '', parts[3], parts[4]))
+        return rows
+
     def get_connections_linux(self):
         """Get network connections on Linux"""
         connections = []
         try:
-            # Use netstat or ss command
-            cmd = "ss -tuln | grep -E 'tcp|udp'"
-            if not self._command_exists('ss'):
-                cmd = "netstat -tuln | grep -E 'tcp|udp'"
-            
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=5)
+            rows = self.read_ss() if self._command_exists('ss') else self.read_netstat_linux()
             
-            for line in result.stdout.strip().split('\n'):
-                if not line.strip():
-                    continue
-                
-                parts = line.split()
-                if len(parts) < 5:
-                    continue
-                
-                proto = parts[0].upper().split('/')[0]
-                
+            for proto, state, local_addr, remote_addr in rows:
                 # Parse local and remote addresses
                 try:
-                    local_addr = parts[3] if len(parts) > 3 else ''
-                    remote_addr = parts[4] if len(parts) > 4 else ''
-                    
                     if ':' not in local_addr:
                         continue
                     
@@ -139,20 +261,23 @@ class NetworkMonitor:
                     else:
                         remote_ip, remote_port = '0.0.0.0', '0'
                     
-                    # Only include TCP and UDP
-                    if proto.startswith('TCP') or proto.startswith('UDP'):
-                        proto = proto.replace('TCP', 'TCP').replace('UDP', 'UDP').split('[')[0]
-                        
-                        conn_hash = f"{local_ip}:{local_port}:{remote_ip}:{remote_port}:{proto}"
-                        if conn_hash not in self.seen_connections:
-                            connections.append({
-                                'sourceIp': local_ip.replace('[', '').replace(']', ''),
-                                'sourcePort': int(local_port) if local_port.isdigit() else 0,
-                                'destIp': remote_ip.replace('[', '').replace(']', ''),
-                                'destPort': int(remote_port) if remote_port.isdigit() else 0,
-                                'protocol': 'TCP' if 'TCP' in proto else 'UDP'
-                            })
-                            self.seen_connections.add(conn_hash)
+                    proto = 'TCP' if proto.startswith('TCP') else 'UDP'
+                    source_port = int(local_port) if local_port.isdigit() else 0
+                    dest_port = int(remote_port) if remote_port.isdigit() else 0
+                    # ss has already applied everything but terms it cannot express
+                    if not self.wanted(proto, state, local_ip, source_port, remote_ip, dest_port):
+                        continue
+                    
+                    conn_hash = f"{local_ip}:{local_port}:{remote_ip}:{remote_port}:{proto}"
+                    if self.is_new_connection(conn_hash):
+                        connections.append({
+                            'sourceIp': local_ip.replace('[', '').replace(']', ''),
+                            'sourcePort': source_port,
+                            'destIp': remote_ip.replace('[', '').replace(']', ''),
+                            'destPort': dest_port,
+                            'protocol': proto
+                        })
+                        self.seen_connections.add(conn_hash)
                 except:
                     continue
         except Exception as e:
@@ -160,6 +285,40 @@ class NetworkMonitor:
         
         return connections
 
+    def enable_namespaces(self, workers=32, budget=None):
+        """Also scan every other network namespace on the host (Linux, needs root for other users' processes)"""
+        if self.os_type != 'Linux':
+            print(f"[!] --all-namespaces is Linux only; scanning the host namespace on {self.os_type}")
+            return
+        # Leave at least half the cycle for sending
+        self.namespace_scanner = NamespaceScanner(
+            workers=workers, budget=budget or max(1.0, REFRESH_INTERVAL / 2),
+            predicate=self.capture_filter.match if self.capture_filter else None)
+
+    def get_connections_namespaces(self):
+        """Connections in other network namespaces, tagged with the namespace and its container"""
+        connections = []
+        for namespace, sockets in self.namespace_scanner.scan():
+            for local_ip, local_port, remote_ip, remote_port, proto, state in sockets:
+                # The same address and port is common across pods, so the namespace is part of the key
+                conn_hash = f"{namespace.inode}/{local_ip}:{local_port}:{remote_ip}:{remote_port}:{proto}"
+                if self.is_new_connection(conn_hash):
+                    connections.append({
+                        'sourceIp': local_ip,
+                        'sourcePort': local_port,
+                        'destIp': remote_ip,
+                        'destPort': remote_port,
+                        'protocol': proto,
+                        'namespace': namespace.name,
+                        'container': namespace.container
+                    })
+                    self.seen_connections.add(conn_hash)
+        stats = self.namespace_scanner.last_stats
+        if stats.get('over_budget'):
+            print(f"\n[!] {stats['over_budget']} of {stats['namespaces']} namespaces did not finish "
+                  f"within {self.namespace_scanner.budget:g}s", end='')
+        return connections
+
     def get_connections_windows(self):
         """Get network connections on Windows"""
         connections = []
@@ -192,8 +351,15 @@ class NetworkMonitor:
                         else:
                             remote_ip, remote_port = '0.0.0.0', '0'
                         
+                        # UDP rows have no state column
+                        state = parts[3] if len(parts) > 3 else ''
+                        if not self.wanted('TCP' if proto.startswith('TCP') else 'UDP', state, local_ip,
+                                           int(local_port) if local_port.isdigit() else 0, remote_ip,
+                                           int(remote_port) if remote_port.isdigit() else 0):
+                            continue
+                        
                         conn_hash = f"{local_ip}:{local_port}:{remote_ip}:{remote_port}:{proto}"
-                        if conn_hash not in self.seen_connections:
+                        if self.is_new_connection(conn_hash):
                             connections.append({
                                 'sourceIp': local_ip,
                                 'sourcePort': int(local_port) if local_port.isdigit() else 0,
@@ -240,8 +406,13 @@ class NetworkMonitor:
                         remote_ip = remote_addr.rsplit('.', 1)[0]
                         remote_port = remote_addr.rsplit('.', 1)[1]
                         
+                        if not self.wanted('TCP' if proto.startswith('TCP') else 'UDP', parts[5], local_ip,
+                                           int(local_port) if local_port.isdigit() else 0, remote_ip,
+                                           int(remote_port) if remote_port.isdigit() else 0):
+                            continue
+                        
                         conn_hash = f"{local_ip}:{local_port}:{remote_ip}:{remote_port}:{proto}"
-                        if conn_hash not in self.seen_connections:
+                        if self.is_new_connection(conn_hash):
                             connections.append({
                                 'sourceIp': local_ip,
                                 'sourcePort': int(local_port) if local_port.isdigit() else 0,
@@ -257,10 +428,50 @@ class NetworkMonitor:
         
         return connections
 
+    def is_new_connection(self, conn_hash):
+        """True if conn_hash has not been reported, by this run or (while warm starting) the previous one"""
+        self.live_connections.add(conn_hash)
+        if conn_hash in self.seen_connections:
+            return False
+        if self.warm_digests and key_digest(conn_hash) in self.warm_digests:
+            self.seen_connections.add(conn_hash)
+            self.warm_restored += 1
+            return False
+        return True
+
+    def restore_state(self):
+        """Load the last checkpoint so the first scan only reports connections opened since"""
+        if not self.checkpoint:
+            return
+        try:
+            digests = self.checkpoint.load()
+        except (OSError, ValueError) as e:
+            print(f"[!] Ignoring connection state {self.checkpoint.path}: {str(e)}")
+            return
+        if digests:
+            self.warm_digests = digests
+            print(f"[*] Loaded {len(digests)} known connections from {self.checkpoint.path}")
+
+    def save_state(self, force=False):
+        """Checkpoint reported connections that are still open, at most every checkpoint_interval seconds"""
+        if not self.checkpoint:
+            return
+        if not force and time.monotonic() - self.last_checkpoint < self.checkpoint_interval:
+            return
+        self.last_checkpoint = time.monotonic()
+        try:
+            self.checkpoint.save(self.seen_connections & self.live_connections)
+        except OSError as e:
+            print(f"[!] Could not save connection state: {str(e)}")
+
     def get_connections(self):
         """Get network connections based on OS"""
+        self.live_connections = set()
         if self.os_type == 'Linux':
-            return self.get_connections_linux()
+            connections = self.get_connections_linux()
+            if self.namespace_scanner:
+                connections.extend(self.get_connections_namespaces())
+            return connections
         elif self.os_type == 'Windows':
             return self.get_connections_windows()
         elif self.os_type == 'Darwin':
@@ -278,7 +489,7 @@ class NetworkMonitor:
                 **connection
             }
             
-            response = requests.post(endpoint, json=payload, timeout=5)
+            response = self.resilience.post(self.http, endpoint, json=payload, timeout=5)
             
             if response.status_code == 200:
                 return True
@@ -296,35 +507,64 @@ class NetworkMonitor:
         print(f"    Device: {self.device_name}")
         print(f"    OS: {self.os_type}")
         print(f"    Refresh interval: {REFRESH_INTERVAL}s")
+        if self.capture_filter:
+            print(f"    Filter: {self.capture_filter.expression}")
+        if self.classifier.site_count:
+            print(f"    Sites: {self.classifier.site_count} ranges")
+        if self.geodb:
+            print(f"    GeoIP/ASN: {self.geodb.ranges:,} ranges from {self.geodb.path}")
+        if self.namespace_scanner:
+            print(f"    Namespaces: all (budget {self.namespace_scanner.budget:g}s per cycle)")
         if self.ipv4_addresses:
             print(f"    Local IPv4: {', '.join(self.ipv4_addresses)}")
         print()
         
-        cycle = 0
-        while True:
-            try:
-                cycle += 1
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] Cycle {cycle}: Scanning connections...", end='')
-                
-                connections = self.get_connections()
-                print(f" Found {len(connections)} new connections")
-                
-                sent_count = 0
-                for conn in connections:
-                    if self.send_connection(conn):
-                        sent_count += 1
-                
-                if sent_count > 0:
-                    print(f"    [{sent_count}] connections reported to server")
-                
-                time.sleep(REFRESH_INTERVAL)
-            
-            except KeyboardInterrupt:
-                print("\n\n[*] Monitoring stopped by user")
-                break
-            except Exception as e:
-                print(f"\n[✗] Error in monitoring loop: {str(e)}")
-                time.sleep(REFRESH_INTERVAL)
+        # One scan per tick; each scan's new connections travel as one batch
+        pipeline = (
+            Pipeline(on_error=lambda stage, item, e: print(f"\n[✗] Error in monitoring loop: {str(e)}"))
+            .source('ticker', ticker(REFRESH_INTERVAL))
+            .map('scan', self.scan_cycle)
+        )
+        if self.checkpoint:
+            # Checkpoint only after sending so a crash in between re-reports rather than loses
+            pipeline.map('http', self.send_batch).sink('checkpoint', lambda sent: self.save_state())
+        else:
+            pipeline.sink('http', self.send_batch)
+        try:
+            pipeline.run()
+        except KeyboardInterrupt:
+            print("\n\n[*] Monitoring stopped by user")
+        self.save_state(force=True)
+        if self.address_watcher:
+            self.address_watcher.close()
+        if self.geodb:
+            self.geodb.close()
+        print(pipeline.report())
+
+    def scan_cycle(self, cycle):
+        """Scan once and return the new connections as one batch"""
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] Cycle {cycle}: Scanning connections...", end='')
+        
+        connections = [self.tag_connection(conn) for conn in self.get_connections()]
+        print(f" Found {len(connections)} new connections")
+        self.refresh_local_addresses()
+        if self.warm_digests is not None:
+            # Whatever the first scan did not match has closed since the checkpoint
+            print(f"    Warm start: {self.warm_restored} connections already reported, "
+                  f"{len(self.warm_digests) - self.warm_restored} closed since last run")
+            self.warm_digests = None
+        return connections
+
+    def send_batch(self, connections):
+        """Send one scan's connections; returns how many the server accepted"""
+        sent_count = 0
+        for conn in connections:
+            if self.send_connection(conn):
+                sent_count += 1
+        
+        if sent_count > 0:
+            print(f"    [{sent_count}] connections reported to server")
+        return sent_count
 
     def _command_exists(self, command):
         """Check if a command exists on the system"""
@@ -347,26 +587,88 @@ def main():
                        default=DEVICE_NAME)
     parser.add_argument('--interval', type=int, help='Refresh interval in seconds',
                        default=REFRESH_INTERVAL)
+    parser.add_argument('--profile-memory', nargs='?', const='agent-memory.log', metavar='REPORT',
+                       help='Trace allocations and append growth reports to REPORT (default: agent-memory.log)')
+    parser.add_argument('--profile-interval', type=float, default=300,
+                       help='Seconds between memory reports')
+    parser.add_argument('--state-file', default=STATE_FILE,
+                       help='Connection state checkpoint for warm restarts (empty to disable)')
+    parser.add_argument('--checkpoint-interval', type=int, default=CHECKPOINT_INTERVAL,
+                       help='Seconds between connection state checkpoints')
+    parser.add_argument('--all-namespaces', action='store_true',
+                       default=os.environ.get('MONITOR_ALL_NAMESPACES', '') == '1',
+                       help='Also scan container/pod network namespaces (Linux, run as root)')
+    parser.add_argument('--namespace-workers', type=int, default=32,
+                       help='Namespaces scanned in parallel with --all-namespaces')
+    parser.add_argument('--sites', default=SITES_FILE, metavar='FILE',
+                       help='Site ranges (`CIDR [label]` per line) used to tag remote addresses')
+    parser.add_argument('--geodb', default=GEODB_FILE, metavar='FILE',
+                       help='Range file from tools/build_geodb.py for destination country and ASN')
+    parser.add_argument('--filter', default=CAPTURE_FILTER, metavar='EXPR',
+                       help="Capture filter, e.g. 'tcp and state established and not remote net 10.0.0.0/8' "
+                            "(default: listening sockets)")
     
     args = parser.parse_args()
     
     # Update globals
     globals()['REFRESH_INTERVAL'] = args.interval
     
-    # Create monitor
-    monitor = NetworkMonitor(args.server, args.token, args.device)
-    
-    # Register device
-    if not monitor.register_device():
-        print("[✗] Failed to register device. Check your token and server URL.")
-        sys.exit(1)
+    # Started first so the monitor's own allocations are traced too
+    profiler = None
+    if args.profile_memory:
+        profiler = MemoryProfiler(args.profile_memory, args.profile_interval, label='monitor-agent').start()
+        print(f"[*] Memory profiling every {args.profile_interval:g}s -> {args.profile_memory}")
     
-    # Start monitoring
     try:
-        monitor.monitor_loop()
-    except Exception as e:
-        print(f"[✗] Fatal error: {str(e)}")
-        sys.exit(1)
+        # Create monitor
+        monitor = NetworkMonitor(args.server, args.token, args.device,
+                                 args.state_file, args.checkpoint_interval)
+        monitor.restore_state()
+        if args.filter:
+            try:
+                monitor.set_filter(args.filter)
+            except FilterError as e:
+                print(f"[✗] Invalid --filter: {str(e)}")
+                sys.exit(1)
+        if args.sites:
+            try:
+                monitor.set_sites(args.sites)
+            except (OSError, ValueError) as e:
+                print(f"[✗] Cannot load --sites: {str(e)}")
+                sys.exit(1)
+        if args.geodb:
+            try:
+                monitor.set_geodb(args.geodb)
+            except (OSError, ValueError) as e:
+                print(f"[✗] Cannot open --geodb: {str(e)}")
+                sys.exit(1)
+        if args.all_namespaces:
+            monitor.enable_namespaces(args.namespace_workers)
+        
+        # Register device, backing off while the server is unreachable
+        attempt = 0
+        while not monitor.register_device():
+            if monitor.registration_rejected:
+                print("[✗] Failed to register device. Check your token and server URL.")
+                sys.exit(1)
+            delay = monitor.resilience.reconnect_delay(attempt, '/api/monitor/register')
+            attempt += 1
+            print(f"[*] Retrying registration in {delay:.0f}s")
+            try:
+                time.sleep(delay)
+            except KeyboardInterrupt:
+                print("\n[*] Registration cancelled by user")
+                sys.exit(1)
+        
+        # Start monitoring
+        try:
+            monitor.monitor_loop()
+        except Exception as e:
+            print(f"[✗] Fatal error: {str(e)}")
+            sys.exit(1)
+    finally:
+        if profiler:
+            profiler.stop()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,173 @@
+"""
+Address Classification
+Parses IP addresses once into integers and tags them by longest-prefix match
+against the special-purpose ranges and operator-supplied site lists
+"""
+
+import socket
+import ipaddress
+from collections import namedtuple
+from functools import lru_cache
+
+# IANA special-purpose address registries (RFC 6890 and updates); the longest match wins
+SPECIAL_RANGES = (
+    ("0.0.0.0/8", "unspecified"),
+    ("10.0.0.0/8", "private"),
+    ("100.64.0.0/10", "shared"),  # RFC 6598 carrier-grade NAT
+    ("127.0.0.0/8", "loopback"),
+    ("169.254.0.0/16", "link-local"),
+    ("172.16.0.0/12", "private"),
+    ("192.0.0.0/24", "reserved"),
+    ("192.0.2.0/24", "documentation"),
+    ("192.168.0.0/16", "private"),
+    ("198.18.0.0/15", "benchmarking"),
+    ("198.51.100.0/24", "documentation"),
+    ("203.0.113.0/24", "documentation"),
+    ("224.0.0.0/4", "multicast"),
+    ("240.0.0.0/4", "reserved"),
+    ("255.255.255.255/32", "broadcast"),
+    ("::/128", "unspecified"),
+    ("::1/128", "loopback"),
+    ("64:ff9b::/96", "nat64"),
+    ("100::/64", "discard"),
+    ("2001:db8::/32", "documentation"),
+    ("fc00::/7", "private"),  # unique local
+    ("fe80::/10", "link-local"),
+    ("ff00::/8", "multicast"),
+)
+PUBLIC = "public"
+
+AddressClass = namedtuple("AddressClass", "version scope site")
+
+
+@lru_cache(maxsize=65536)
+def parse_address(ip: str):
+    """(version, integer) for an address string, or None; IPv4-mapped IPv6 counts as IPv4"""
+    # ss and netstat decorate addresses: [v6], zone ids and * for dual-stack wildcards
+    text = ip.split("%", 1)[0].strip("[]")
+    if text == "*":
+        text = "::"
+    try:
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, text), "big")
+    except OSError:
+        pass
+    try:
+        value = int.from_bytes(socket.inet_pton(socket.AF_INET6, text), "big")
+    except OSError:
+        return None
+    if value >> 32 == 0xFFFF:
+        return 4, value & 0xFFFFFFFF
+    return 6, value
+
+
+class _Node:
+    __slots__ = ("tags", "lengths", "children")
+
+    def __init__(self):
+        self.tags = {}
+        self.lengths = {}
+        self.children = {}
+
+
+class PrefixTrie:
+    """
+    Longest-prefix match over `width`-bit integers, a byte per level. A
+    prefix that ends inside a byte is expanded to every byte value it covers
+    (controlled prefix expansion), so a lookup is at most width / 8 dict
+    probes: four for IPv4 however many prefixes are loaded.
+    """
+
+    def __init__(self, width: int):
+        self.width = width
+        self.root = _Node()
+        self.default = None
+        self.size = 0
+
+    def insert(self, value: int, length: int, tag):
+        self.size += 1
+        if length == 0:
+            self.default = tag
+            return
+        node, shift, depth = self.root, self.width - 8, 8
+        while length > depth:
+            byte = (value >> shift) & 0xFF
+            child = node.children.get(byte)
+            if child is None:
+                child = node.children[byte] = _Node()
+            node, shift, depth = child, shift - 8, depth + 8
+
+        span = 1 << (depth - length)
+        first = (value >> shift) & 0xFF & ~(span - 1)
+        for byte in range(first, first + span):
+            # A longer prefix already expanded here stays
+            if node.lengths.get(byte, 0) <= length:
+                node.tags[byte] = tag
+                node.lengths[byte] = length
+
+    def lookup(self, value: int):
+        tag = self.default
+        node, shift = self.root, self.width - 8
+        while node is not None:
+            byte = (value >> shift) & 0xFF
+            found = node.tags.get(byte)
+            if found is not None:
+                tag = found
+            node = node.children.get(byte)
+            shift -= 8
+        return tag
+
+
+def load_sites(path: str) -> list:
+    """[(cidr, label)] from a file of `CIDR [label]` lines; # starts a comment"""
+    sites = []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            fields = line.split("#", 1)[0].split()
+            if not fields:
+                continue
+            try:
+                ipaddress.ip_network(fields[0], strict=False)
+            except ValueError:
+                raise ValueError(f"{path}:{number}: bad network {fields[0]!r}")
+            sites.append((fields[0], " ".join(fields[1:]) or "site"))
+    return sites
+
+
+class AddressClassifier:
+    """
+    classify(ip) -> AddressClass(version, scope, site), or None for
+    something that is not an address. Scope comes from SPECIAL_RANGES
+    ("public" when none match) and site from the operator's ranges, each
+    the longest match in its own trie, so a site inside 10.0.0.0/8 is still
+    "private". Results are memoized per address string: the agent sees the
+    same few hundred addresses every cycle.
+    """
+
+    def __init__(self, sites=(), cache_size: int = 65536):
+        self._scopes = {4: PrefixTrie(32), 6: PrefixTrie(128)}
+        self._sites = {4: PrefixTrie(32), 6: PrefixTrie(128)}
+        for cidr, scope in SPECIAL_RANGES:
+            self._insert(self._scopes, cidr, scope)
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+        for cidr, label in sites:
+            self.add_site(cidr, label)
+
+    @staticmethod
+    def _insert(tries: dict, cidr: str, tag: str):
+        network = ipaddress.ip_network(cidr, strict=False)
+        tries[network.version].insert(int(network.network_address), network.prefixlen, tag)
+
+    def add_site(self, cidr: str, label: str):
+        self._insert(self._sites, cidr, label)
+        self.classify.cache_clear()
+
+    @property
+    def site_count(self) -> int:
+        return sum(trie.size for trie in self._sites.values())
+
+    def _classify(self, ip: str):
+        parsed = parse_address(ip)
+        if parsed is None:
+            return None
+        version, value = parsed
+        return AddressClass(version, self._scopes[version].lookup(value) or PUBLIC, self._sites[version].lookup(value))
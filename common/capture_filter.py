@@ -0,0 +1,340 @@
+"""
+Capture Filters
+A small socket filter language, compiled to ss(8) arguments (evaluated in the kernel)
+and to a generated Python predicate for /proc and netstat scans
+"""
+
+import re
+import ipaddress
+
+from addresses import parse_address
+
+# Filter language state name -> ss state name
+STATES = {
+    "established": "established",
+    "syn-sent": "syn-sent",
+    "syn-recv": "syn-recv",
+    "fin-wait-1": "fin-wait-1",
+    "fin-wait-2": "fin-wait-2",
+    "time-wait": "time-wait",
+    "close-wait": "close-wait",
+    "last-ack": "last-ack",
+    "closing": "closing",
+    "listen": "listening",
+    # Unconnected UDP sockets (and closed TCP ones)
+    "unconn": "closed",
+}
+
+# State spellings of ss, /proc (see netns.TCP_STATES) and netstat -> filter language name
+_STATE_ALIASES = {
+    "ESTAB": "established", "ESTABLISHED": "established",
+    "SYN-SENT": "syn-sent", "SYN_SENT": "syn-sent",
+    "SYN-RECV": "syn-recv", "SYN_RECV": "syn-recv", "SYN_RCVD": "syn-recv",
+    "FIN-WAIT-1": "fin-wait-1", "FIN_WAIT1": "fin-wait-1", "FIN_WAIT_1": "fin-wait-1",
+    "FIN-WAIT-2": "fin-wait-2", "FIN_WAIT2": "fin-wait-2", "FIN_WAIT_2": "fin-wait-2",
+    "TIME-WAIT": "time-wait", "TIME_WAIT": "time-wait",
+    "CLOSE-WAIT": "close-wait", "CLOSE_WAIT": "close-wait",
+    "LAST-ACK": "last-ack", "LAST_ACK": "last-ack",
+    "CLOSING": "closing",
+    "LISTEN": "listen", "LISTENING": "listen",
+    "UNCONN": "unconn", "CLOSE": "unconn", "CLOSED": "unconn", "": "unconn",
+}
+
+_SIDES = {"local": "local", "src": "local", "remote": "remote", "dst": "remote"}
+_TOKEN = re.compile(r"\s*(?:([(),])|([^\s(),]+))")
+
+
+class FilterError(ValueError):
+    """The filter expression does not parse"""
+
+
+def normalize_state(state: str) -> str:
+    return _STATE_ALIASES.get(state.upper(), state.lower())
+
+
+# Stands in for unparseable addresses so `net` terms simply do not match
+_NO_ADDRESS = (0, -1)
+
+
+# =========================
+# PARSING
+# =========================
+class _Parser:
+    """
+    expr    := and ('or' and)*
+    and     := unary ('and' unary)*
+    unary   := 'not' unary | '(' expr ')' | primitive
+    primitive := 'tcp' | 'udp'
+               | 'state' NAME (',' NAME)*
+               | [local|remote|src|dst] 'port' N['-'M]
+               | [local|remote|src|dst] 'net' CIDR
+    """
+
+    def __init__(self, text: str):
+        self.tokens = []
+        position = 0
+        text = text.strip()
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if not match:
+                raise FilterError(f"unexpected character at {position}: {text[position:]!r}")
+            self.tokens.append(match.group(1) or match.group(2))
+            position = match.end()
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position].lower() if self.position < len(self.tokens) else None
+
+    def take(self, what: str = "more") -> str:
+        if self.position >= len(self.tokens):
+            raise FilterError(f"expected {what} at end of filter")
+        self.position += 1
+        return self.tokens[self.position - 1]
+
+    def expect(self, literal: str):
+        token = self.take(repr(literal))
+        if token.lower() != literal:
+            raise FilterError(f"expected {literal!r}, got {token!r}")
+
+    def parse(self):
+        node = self.expr()
+        if self.peek() is not None:
+            raise FilterError(f"unexpected {self.tokens[self.position]!r}")
+        return node
+
+    def expr(self):
+        node = self.conjunction()
+        while self.peek() == "or":
+            self.take()
+            node = ("or", node, self.conjunction())
+        return node
+
+    def conjunction(self):
+        node = self.unary()
+        while self.peek() == "and":
+            self.take()
+            node = ("and", node, self.unary())
+        return node
+
+    def unary(self):
+        token = self.peek()
+        if token == "not":
+            self.take()
+            return ("not", self.unary())
+        if token == "(":
+            self.take()
+            node = self.expr()
+            self.expect(")")
+            return node
+        return self.primitive()
+
+    def primitive(self):
+        token = self.take("a filter term").lower()
+        if token in ("tcp", "udp"):
+            return ("proto", token.upper())
+        if token == "state":
+            names = [self.state_name()]
+            while self.peek() == ",":
+                self.take()
+                names.append(self.state_name())
+            return ("state", frozenset(names))
+
+        side = None
+        if token in _SIDES:
+            side = _SIDES[token]
+            token = self.take("'port' or 'net'").lower()
+        if token == "port":
+            return ("port", side) + self.port_range()
+        if token == "net":
+            value = self.take("a CIDR")
+            try:
+                network = ipaddress.ip_network(value, strict=False)
+            except ValueError:
+                raise FilterError(f"bad network {value!r}")
+            return ("net", side, network)
+        raise FilterError(f"unknown filter term {token!r}")
+
+    def state_name(self) -> str:
+        name = self.take("a state").lower()
+        if name not in STATES:
+            raise FilterError(f"unknown state {name!r} (one of {', '.join(sorted(STATES))})")
+        return name
+
+    def port_range(self):
+        value = self.take("a port")
+        low, _, high = value.partition("-")
+        try:
+            low, high = int(low), int(high or low)
+        except ValueError:
+            raise FilterError(f"bad port {value!r}")
+        if not 0 <= low <= high <= 65535:
+            raise FilterError(f"port out of range: {value!r}")
+        return low, high
+
+
+def _conjuncts(node) -> list:
+    if node[0] == "and":
+        return _conjuncts(node[1]) + _conjuncts(node[2])
+    return [node]
+
+
+def _protocols(node):
+    """The protocol set if node only tests protocols, else None"""
+    if node[0] == "proto":
+        return {node[1]}
+    if node[0] == "not":
+        inner = _protocols(node[1])
+        return None if inner is None else {"TCP", "UDP"} - inner
+    if node[0] == "or":
+        left, right = _protocols(node[1]), _protocols(node[2])
+        if left is not None and right is not None:
+            return left | right
+    return None
+
+
+# =========================
+# COMPILED FILTER
+# =========================
+class CaptureFilter:
+    """
+    A parsed filter with two compiled forms. ss_args() pushes what ss can
+    express down to ss, which turns it into inet_diag bytecode the kernel
+    runs while dumping sockets, so excluded sockets never reach the agent.
+    Top-level protocol and state terms become -t/-u and `state` options and
+    the remaining terms become an ss expression when they only use ports and
+    networks. Anything ss cannot express is dropped from the ss side, which
+    only widens it, and `match` (always exact) is applied to what comes back.
+
+    `match(proto, state, local_ip, local_port, remote_ip, remote_port)` is
+    generated Python source compiled once, with constants bound as
+    defaults; addresses are parsed once per distinct string.
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tree = _Parser(expression).parse()
+        self.match = self._compile_predicate()
+        self.protocols, self.states, self._ss_expression = self._plan_ss()
+
+    def __repr__(self):
+        return f"CaptureFilter({self.expression!r})"
+
+    # ----- Python -----
+    def _compile_predicate(self):
+        constants = {}
+
+        def constant(value):
+            name = f"_c{len(constants)}"
+            constants[name] = value
+            return name
+
+        def emit(node) -> str:
+            kind = node[0]
+            if kind == "and":
+                return f"({emit(node[1])} and {emit(node[2])})"
+            if kind == "or":
+                return f"({emit(node[1])} or {emit(node[2])})"
+            if kind == "not":
+                return f"(not {emit(node[1])})"
+            if kind == "proto":
+                return f"(proto == {node[1]!r})"
+            if kind == "state":
+                return f"(state in {constant(node[1])})"
+            if kind == "port":
+                _, side, low, high = node
+                tests = [f"({low} <= {port} <= {high})" if low != high else f"({port} == {low})"
+                         for port in _side_fields(side, "local_port", "remote_port")]
+                return f"({' or '.join(tests)})"
+            if kind == "net":
+                _, side, network = node
+                first, last = int(network.network_address), int(network.broadcast_address)
+                tests = []
+                for field in _side_fields(side, "local", "remote"):
+                    tests.append(f"({field}[0] == {network.version} and {first} <= {field}[1] <= {last})")
+                return f"({' or '.join(tests)})"
+            raise AssertionError(kind)
+
+        body = emit(self.tree)
+        bound = ", ".join(["_parse=parse_address", "_none=_NO_ADDRESS", "_normalize=normalize_state"]
+                          + [f"{n}={n}" for n in constants])
+        source = (
+            f"def match(proto, state, local_ip, local_port, remote_ip, remote_port, {bound}):\n"
+            f"    proto = proto.upper()\n"
+            f"    state = _normalize(state)\n"
+            f"    local = _parse(local_ip) or _none\n"
+            f"    remote = _parse(remote_ip) or _none\n"
+            f"    return {body}\n"
+        )
+        namespace = {"parse_address": parse_address, "_NO_ADDRESS": _NO_ADDRESS, "normalize_state": normalize_state,
+                     **constants}
+        exec(compile(source, f"<capture filter {self.expression!r}>", "exec"), namespace)
+        return namespace["match"]
+
+    # ----- ss -----
+    def _plan_ss(self):
+        protocols, states, rest = None, None, []
+        for node in _conjuncts(self.tree):
+            found = _protocols(node)
+            if found is not None:
+                protocols = found if protocols is None else protocols & found
+            elif node[0] == "state":
+                states = node[1] if states is None else states & node[1]
+            else:
+                expression = _ss_expression(node)
+                if expression is not None:
+                    rest.append(expression)
+        protocols = protocols if protocols is not None else {"TCP", "UDP"}
+        expression = []
+        for index, part in enumerate(rest):
+            if index:
+                expression.append("and")
+            expression.extend(part)
+        return protocols, states, expression
+
+    def ss_args(self) -> list:
+        """Arguments for `ss -H -n` that select (a superset of) the matching sockets"""
+        args = [flag for proto, flag in (("TCP", "-t"), ("UDP", "-u")) if proto in self.protocols]
+        if self.states is None:
+            args.append("-a")
+        else:
+            for name in sorted(self.states):
+                args += ["state", STATES[name]]
+        return args + self._ss_expression
+
+    def ss_columns(self) -> tuple:
+        """(has Netid column, has State column) in the output of ss_args(): ss drops fixed columns"""
+        return len(self.protocols) > 1, self.states is None or len(self.states) > 1
+
+    def matches_nothing(self) -> bool:
+        return not self.protocols or (self.states is not None and not self.states)
+
+
+def _side_fields(side, local, remote):
+    return (local,) if side == "local" else (remote,) if side == "remote" else (local, remote)
+
+
+def _ss_expression(node):
+    """ss filter tokens for node, or None if it uses terms ss cannot filter on"""
+    kind = node[0]
+    if kind in ("and", "or"):
+        left, right = _ss_expression(node[1]), _ss_expression(node[2])
+        if left is None or right is None:
+            return None
+        return ["("] + left + [kind] + right + [")"]
+    if kind == "not":
+        inner = _ss_expression(node[1])
+        return None if inner is None else ["not", "("] + inner + [")"]
+    if kind == "port":
+        _, side, low, high = node
+        tests = []
+        for field in _side_fields(side, "sport", "dport"):
+            if low == high:
+                tests.append([field, "=", f":{low}"])
+            else:
+                tests.append(["(", field, ">=", f":{low}", "and", field, "<=", f":{high}", ")"])
+        return tests[0] if len(tests) == 1 else ["("] + tests[0] + ["or"] + tests[1] + [")"]
+    if kind == "net":
+        _, side, network = node
+        tests = [[field, str(network)] for field in _side_fields(side, "src", "dst")]
+        return tests[0] if len(tests) == 1 else ["("] + tests[0] + ["or"] + tests[1] + [")"]
+    return None
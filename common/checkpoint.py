@@ -0,0 +1,70 @@
+"""
+Key Checkpoints
+Compact binary snapshots of a set of string keys (as 8-byte digests) for warm restarts
+"""
+
+import os
+import time
+import zlib
+import struct
+import hashlib
+
+MAGIC = b"KCP1"
+DIGEST_SIZE = 8
+# magic, digest size, key count, written at (unix seconds), crc32 of the digests
+_HEADER = struct.Struct("<4sBIQI")
+
+
+def key_digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode(), digest_size=DIGEST_SIZE).digest()
+
+
+class KeyCheckpoint:
+    """
+    Stores only digests: 8 bytes per key, and a restored digest means
+    nothing until a live key hashes to it, which is also how stale entries
+    fall away. Writes go to a temporary file that replaces the old one, so
+    a crash mid-write leaves the previous checkpoint intact.
+    """
+
+    def __init__(self, path: str, max_age: float = None):
+        self.path = path
+        self.max_age = max_age
+        self.written_at = None
+
+    def save(self, keys) -> int:
+        digests = sorted({key_digest(key) for key in keys})
+        body = b"".join(digests)
+        header = _HEADER.pack(MAGIC, DIGEST_SIZE, len(digests), int(time.time()), zlib.crc32(body))
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(header)
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.written_at = time.time()
+        return len(digests)
+
+    def load(self) -> set:
+        """Digests from the last checkpoint; empty if missing or older than max_age, ValueError if corrupt"""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return set()
+
+        if len(data) < _HEADER.size:
+            raise ValueError("checkpoint is truncated")
+        magic, digest_size, count, written_at, crc = _HEADER.unpack_from(data)
+        body = data[_HEADER.size:]
+        if magic != MAGIC or digest_size != DIGEST_SIZE:
+            raise ValueError("not a key checkpoint")
+        if len(body) != count * DIGEST_SIZE or zlib.crc32(body) != crc:
+            raise ValueError("checkpoint is corrupt")
+        if self.max_age is not None and time.time() - written_at > self.max_age:
+            return set()
+        return {body[i:i + DIGEST_SIZE] for i in range(0, len(body), DIGEST_SIZE)}
@@ -0,0 +1,235 @@
+"""
+GeoIP/ASN Ranges
+Compiles CSV address ranges once into a sorted binary file that is mmap'd and
+binary-searched in place for country and ASN lookups
+"""
+
+import io
+import os
+import csv
+import sys
+import mmap
+import heapq
+import bisect
+import struct
+import ipaddress
+from collections import namedtuple
+
+from addresses import parse_address
+
+MAGIC = b"GEO1"
+# magic, IPv4 ranges, IPv6 ranges, string table size
+_HEADER = struct.Struct("<4sIII")
+# country, ASN, organisation offset and length in the string table
+_INFO = struct.Struct("<2sIIH")
+_WIDTH = {4: 4, 6: 16}
+
+GeoInfo = namedtuple("GeoInfo", "country asn org")
+
+
+def _network_bounds(text: str):
+    network = ipaddress.ip_network(text.strip(), strict=False)
+    return network.version, int(network.network_address), int(network.broadcast_address)
+
+
+def read_ranges(path: str):
+    """
+    (version, first, last, country, asn, org) from a CSV or TSV file. Either
+    `network,country,asn,org` with a CIDR, or `first,last,country,asn,org`
+    with addresses (the iptoasn.com layout is `first last asn country org`
+    and is recognised by its numeric third column). Header lines are skipped.
+    """
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        dialect = csv.excel_tab if "\t" in sample.split("\n", 1)[0] else csv.excel
+        for number, row in enumerate(csv.reader(f, dialect), 1):
+            row = [field.strip() for field in row]
+            if not row or not row[0] or row[0].startswith("#"):
+                continue
+            try:
+                if "/" in row[0]:
+                    version, first, last = _network_bounds(row[0])
+                    rest = row[1:]
+                else:
+                    start, end = parse_address(row[0]), parse_address(row[1])
+                    if start is None or end is None or start[0] != end[0]:
+                        raise ValueError("bad address range")
+                    version, first, last = start[0], start[1], end[1]
+                    rest = row[2:]
+                    if len(rest) >= 2 and rest[0].isdigit() and not rest[1].isdigit():
+                        # iptoasn.com: asn before country
+                        rest = [rest[1], rest[0]] + rest[2:]
+            except (ValueError, IndexError):
+                if number == 1:
+                    # Header
+                    continue
+                raise ValueError(f"{path}:{number}: cannot parse {row[:2]}")
+            country = (rest[0] if rest else "").upper()
+            if country in ("NONE", "-", "ZZ"):
+                country = ""
+            asn = rest[1].upper() if len(rest) > 1 else ""
+            asn = asn[2:] if asn.startswith("AS") else asn
+            yield (version, first, last, country[:2], int(asn) if asn.isdigit() else 0,
+                   rest[2] if len(rest) > 2 else "")
+
+
+def _most_specific(ranges: list):
+    """
+    Split overlapping (first, last, *info) ranges into disjoint ones where the
+    narrowest covering range wins, so 8.8.8.0/24 carved out of 8.8.0.0/16
+    keeps its own data and the /16 keeps the rest. Sweeps the range
+    boundaries with a heap of the ranges covering the current stretch.
+    """
+    ranges.sort()
+    bounds = sorted({r[0] for r in ranges} | {r[1] + 1 for r in ranges})
+    active, index = [], 0
+    for low, next_low in zip(bounds, bounds[1:]):
+        while index < len(ranges) and ranges[index][0] == low:
+            first, last = ranges[index][:2]
+            heapq.heappush(active, (last - first, index, last))
+            index += 1
+        # Ranges that ended are only popped once they reach the top
+        while active and active[0][2] < low:
+            heapq.heappop(active)
+        if active:
+            yield (low, next_low - 1) + ranges[active[0][1]][2:]
+
+
+def compile_ranges(rows, path: str) -> dict:
+    """
+    Write rows from read_ranges() to a range file at path; returns counts.
+    Where ranges overlap the most specific one wins.
+    """
+    families = {4: [], 6: []}
+    for version, first, last, country, asn, org in rows:
+        if first <= last and (country or asn):
+            families[version].append((first, last, country, asn, org))
+
+    strings, offsets = io.BytesIO(), {}
+    sections, stats = [], {"overlaps_resolved": 0}
+    for version in (4, 6):
+        end = -1
+        for first, last, *_ in sorted(families[version]):
+            if first <= end:
+                stats["overlaps_resolved"] += 1
+            end = max(end, last)
+
+        ranges = []
+        for first, last, country, asn, org in _most_specific(families[version]):
+            if ranges and first == ranges[-1][1] + 1 and ranges[-1][2:] == (country, asn, org):
+                ranges[-1] = (ranges[-1][0], last) + ranges[-1][2:]
+                continue
+            ranges.append((first, last, country, asn, org))
+
+        width = _WIDTH[version]
+        starts, ends, infos = bytearray(), bytearray(), bytearray()
+        for first, last, country, asn, org in ranges:
+            starts += first.to_bytes(width, "little" if version == 4 else "big")
+            ends += last.to_bytes(width, "little" if version == 4 else "big")
+            encoded = org.encode()[:65535]
+            if encoded not in offsets:
+                offsets[encoded] = strings.tell()
+                strings.write(encoded)
+            infos += _INFO.pack(country.encode("ascii", "replace").ljust(2), asn, offsets[encoded], len(encoded))
+        sections.append((len(ranges), bytes(starts + ends + infos)))
+        stats[f"ipv{version}_ranges"] = len(ranges)
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, sections[0][0], sections[1][0], strings.tell()))
+        for _, body in sections:
+            f.write(body)
+        f.write(strings.getvalue())
+    os.replace(tmp, path)
+    stats["bytes"] = os.path.getsize(path)
+    return stats
+
+
+class _Keys:
+    """Sequence view of packed unsigned integers, for bisect where memoryview.cast cannot help"""
+
+    def __init__(self, view: memoryview, width: int, byteorder: str):
+        self.view = view
+        self.width = width
+        self.byteorder = byteorder
+
+    def __len__(self):
+        return len(self.view) // self.width
+
+    def __getitem__(self, index: int) -> int:
+        offset = index * self.width
+        return int.from_bytes(self.view[offset:offset + self.width], self.byteorder)
+
+
+class GeoDatabase:
+    """
+    The file is mapped read-only and never parsed into Python objects:
+    bisect runs directly over the mapped start addresses (IPv4 as a
+    memoryview of uint32, IPv6 through a 16-byte big-endian view), so
+    memory use is the page cache for the handful of pages a lookup
+    touches, whatever the size of the database.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, "MADV_RANDOM"):
+            # Binary search hops across the file; readahead would only pull in pages never read
+            self._map.madvise(mmap.MADV_RANDOM)
+        try:
+            magic, v4_count, v6_count, strings_size = _HEADER.unpack_from(self._map)
+        except struct.error:
+            self._map.close()
+            raise ValueError(f"{path} is not a range file")
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a range file")
+
+        # Every view into the map, released before it is closed
+        self._views = [memoryview(self._map)]
+        offset = _HEADER.size
+        self._sections = {}
+        for version, count in ((4, v4_count), (6, v6_count)):
+            width = _WIDTH[version]
+            keys = []
+            for array_offset in (offset, offset + count * width):
+                view = self._views[0][array_offset:array_offset + count * width]
+                self._views.append(view)
+                if version == 4 and sys.byteorder == "little":
+                    view = view.cast("I")
+                    self._views.append(view)
+                    keys.append(view)
+                else:
+                    keys.append(_Keys(view, width, "little" if version == 4 else "big"))
+            infos = offset + 2 * count * width
+            self._sections[version] = (keys[0], keys[1], infos)
+            offset = infos + count * _INFO.size
+        self._strings = offset
+        if offset + strings_size != len(self._map):
+            self.close()
+            raise ValueError(f"{path} is truncated or corrupt")
+        self.ranges = v4_count + v6_count
+
+    def lookup(self, ip: str):
+        """GeoInfo for ip, or None if no range covers it"""
+        parsed = parse_address(ip)
+        if parsed is None:
+            return None
+        version, value = parsed
+        starts, ends, infos = self._sections[version]
+        index = bisect.bisect_right(starts, value) - 1
+        if index < 0 or ends[index] < value:
+            return None
+        country, asn, org_offset, org_length = _INFO.unpack_from(self._map, infos + index * _INFO.size)
+        org_start = self._strings + org_offset
+        return GeoInfo(country.decode("ascii", "replace").strip(), asn,
+                       self._map[org_start:org_start + org_length].decode("utf-8", "replace"))
+
+    def close(self):
+        self._sections = {}
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
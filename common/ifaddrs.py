@@ -0,0 +1,200 @@
+"""
+Interface Addresses
+Tracks the host's IP addresses over rtnetlink (Linux): one RTM_GETADDR dump, then
+the kernel's address change notifications
+"""
+
+import errno
+import socket
+import struct
+from collections import namedtuple
+
+NETLINK_ROUTE = 0
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTM_GETADDR = 22
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+IFA_LABEL = 3
+
+# rtm_scope of addresses usable only on this host (127.0.0.0/8, ::1)
+RT_SCOPE_HOST = 254
+
+# length, type, flags, sequence, port id
+_NLMSGHDR = struct.Struct("=IHHII")
+# family, prefix length, flags, scope, interface index
+_IFADDRMSG = struct.Struct("=BBBBI")
+_RTATTR = struct.Struct("=HH")
+
+LocalAddress = namedtuple("LocalAddress", "ip version prefixlen interface scope")
+
+
+def _align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def parse_messages(data: bytes):
+    """(type, sequence, payload) for each netlink message in one datagram"""
+    offset = 0
+    while offset + _NLMSGHDR.size <= len(data):
+        length, kind, _, seq, _ = _NLMSGHDR.unpack_from(data, offset)
+        if length < _NLMSGHDR.size:
+            break
+        yield kind, seq, data[offset + _NLMSGHDR.size:offset + length]
+        offset += _align(length)
+
+
+def parse_ifaddr(payload: bytes):
+    """LocalAddress from an RTM_NEWADDR/RTM_DELADDR payload, or None"""
+    if len(payload) < _IFADDRMSG.size:
+        return None
+    family, prefixlen, _, scope, index = _IFADDRMSG.unpack_from(payload)
+    if family not in (socket.AF_INET, socket.AF_INET6):
+        return None
+    attrs = {}
+    offset = _IFADDRMSG.size
+    while offset + _RTATTR.size <= len(payload):
+        length, kind = _RTATTR.unpack_from(payload, offset)
+        if length < _RTATTR.size:
+            break
+        attrs[kind] = payload[offset + _RTATTR.size:offset + length]
+        offset += _align(length)
+    # On point-to-point links IFA_ADDRESS is the peer and IFA_LOCAL our end
+    raw = attrs.get(IFA_LOCAL) or attrs.get(IFA_ADDRESS)
+    if raw is None:
+        return None
+    try:
+        interface = socket.if_indextoname(index)
+    except OSError:
+        # Already gone by the time a deletion is read
+        interface = attrs.get(IFA_LABEL, b"").rstrip(b"\0").decode(errors="replace") or str(index)
+    return LocalAddress(socket.inet_ntop(family, raw), 4 if family == socket.AF_INET else 6, prefixlen, interface,
+                        scope)
+
+
+class AddressWatcher:
+    """
+    The socket joins the IPv4 and IPv6 ifaddr multicast groups before the
+    dump is requested, so no change can fall between the two; notifications
+    that arrive mid-dump are replayed over it. Afterwards the kernel queues
+    every address change on the socket and refresh() reads whatever is
+    queued without blocking: an unchanged host costs one recv() that returns
+    EAGAIN. If the queue ever overflows (ENOBUFS) the table is dumped again.
+    """
+
+    def __init__(self, rcvbuf: int = 1 << 20):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+        try:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+            self.sock.bind((0, RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+            self.sock.setblocking(False)
+        except OSError:
+            self.sock.close()
+            raise
+        # (interface, ip) -> LocalAddress
+        self.addresses = {}
+        self.seq = 0
+        self.dumps = 0
+        self.events = 0
+        self.dump()
+
+    def dump(self, attempts: int = 3):
+        """Replace the table with a full RTM_GETADDR dump"""
+        for attempt in range(attempts):
+            # Everything already queued is older than the dump and superseded by it
+            self._discard()
+            try:
+                self._dump()
+                return
+            except OSError as e:
+                if e.errno != errno.ENOBUFS or attempt == attempts - 1:
+                    raise
+
+    def _discard(self):
+        while True:
+            try:
+                self.sock.recv(65536)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                if e.errno != errno.ENOBUFS:
+                    raise
+
+    def _dump(self):
+        self.seq += 1
+        request = _NLMSGHDR.pack(_NLMSGHDR.size + _IFADDRMSG.size, RTM_GETADDR, NLM_F_REQUEST | NLM_F_DUMP, self.seq, 0)
+        self.sock.send(request + _IFADDRMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0))
+        self.dumps += 1
+        dumped, interleaved = {}, []
+        self.sock.setblocking(True)
+        self.sock.settimeout(5.0)
+        try:
+            done = False
+            while not done:
+                for kind, seq, payload in parse_messages(self.sock.recv(65536)):
+                    if seq != self.seq:
+                        # A notification racing the dump; replayed on top of it, in order
+                        interleaved.append((kind, payload))
+                    elif kind == NLMSG_DONE:
+                        done = True
+                    elif kind == NLMSG_ERROR:
+                        code = -struct.unpack_from("=i", payload)[0]
+                        if code:
+                            raise OSError(code, f"RTM_GETADDR: {errno.errorcode.get(code, code)}")
+                    elif kind == RTM_NEWADDR:
+                        address = parse_ifaddr(payload)
+                        if address is not None:
+                            dumped[address.interface, address.ip] = address
+        finally:
+            self.sock.setblocking(False)
+        self.addresses = dumped
+        for kind, payload in interleaved:
+            self._apply(kind, payload)
+
+    def _apply(self, kind: int, payload: bytes):
+        if kind not in (RTM_NEWADDR, RTM_DELADDR):
+            return
+        address = parse_ifaddr(payload)
+        if address is None:
+            return
+        self.events += 1
+        if kind == RTM_NEWADDR:
+            self.addresses[address.interface, address.ip] = address
+        else:
+            self.addresses.pop((address.interface, address.ip), None)
+
+    def refresh(self) -> tuple:
+        """Apply queued change notifications; returns (added, removed) LocalAddress lists"""
+        before = dict(self.addresses)
+        while True:
+            try:
+                data = self.sock.recv(65536)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno != errno.ENOBUFS:
+                    raise
+                # Changes were dropped; start over from a fresh dump
+                self.dump()
+                break
+            for kind, _, payload in parse_messages(data):
+                self._apply(kind, payload)
+        added = [a for key, a in self.addresses.items() if key not in before]
+        removed = [a for key, a in before.items() if key not in self.addresses]
+        return added, removed
+
+    def ips(self, version: int = None, host_scope: bool = False) -> set:
+        """Current addresses; like `hostname -I`, loopback (host scope) ones only if asked"""
+        return {a.ip for a in self.addresses.values()
+                if (version is None or a.version == version) and (host_scope or a.scope != RT_SCOPE_HOST)}
+
+    def close(self):
+        self.sock.close()
@@ -0,0 +1,146 @@
+"""
+Long-run Memory Profiler
+Periodic tracemalloc snapshot diffs written to a report file, for canary agents and meters
+"""
+
+import os
+import sys
+import time
+import threading
+import tracemalloc
+from datetime import datetime
+
+# Allocation sites that are bookkeeping rather than client state
+_IGNORED_FILES = (
+    tracemalloc.__file__,
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+    "<unknown>",
+)
+
+
+def _rss_bytes():
+    """Current resident set size, or None where it can't be read cheaply"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Peak rather than current off Linux; KB on most systems, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+
+def _mb(size) -> str:
+    return "n/a" if size is None else f"{size / (1 << 20):.1f} MB"
+
+
+class MemoryProfiler:
+    """
+    Traces allocations with `frames` frames per block and, every `interval`
+    seconds, compares a snapshot with the previous one and with the first.
+    Only those two snapshots are kept. Tracing costs some CPU on every
+    allocation and the snapshots briefly need memory proportional to the
+    number of live blocks, so keep frames at 1 and the interval in minutes
+    for fleet canaries.
+    """
+
+    def __init__(self, report_path: str, interval: float = 300.0, top: int = 15, frames: int = 1,
+                 label: str = None, echo: bool = True):
+        self.report_path = report_path
+        self.interval = interval
+        self.top = top
+        self.frames = frames
+        self.label = label or os.path.basename(sys.argv[0] or "python")
+        self.echo = echo
+        self._key = "traceback" if frames > 1 else "lineno"
+        self._filters = [tracemalloc.Filter(False, name) for name in _IGNORED_FILES]
+        self._filters.append(tracemalloc.Filter(False, os.path.abspath(__file__)))
+        self._baseline = None
+        self._previous = None
+        self._started = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.reports = 0
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._started = time.monotonic()
+        self._baseline = self._previous = self._snapshot()
+        self._write_header()
+        self._thread = threading.Thread(target=self._run, name="memprofile", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Write a final report and stop tracing"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._baseline is not None:
+            self.report()
+        tracemalloc.stop()
+        self._baseline = self._previous = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.report()
+            except Exception as e:
+                print(f"[MEMORY] Report failed: {e}", file=sys.stderr)
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(self._filters)
+
+    def _format_stat(self, stat) -> str:
+        if self._key == "traceback":
+            site = " <- ".join(f"{frame.filename}:{frame.lineno}" for frame in stat.traceback)
+        else:
+            frame = stat.traceback[0]
+            site = f"{frame.filename}:{frame.lineno}"
+        return f"  {stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8d} blocks  {stat.size / 1024:10.1f} KiB now  {site}"
+
+    def _write_header(self):
+        with open(self.report_path, "a", encoding="utf-8") as f:
+            f.write(f"# {self.label} pid {os.getpid()} memory profile started "
+                    f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} "
+                    f"(interval {self.interval:g}s, {self.frames} frame(s))\n")
+
+    def report(self):
+        """Snapshot now, append the growth tables to the report file and return the snapshot stats"""
+        snapshot = self._snapshot()
+        since_previous = [s for s in snapshot.compare_to(self._previous, self._key) if s.size_diff > 0]
+        since_start = [s for s in snapshot.compare_to(self._baseline, self._key) if s.size_diff > 0]
+        self._previous = snapshot
+        self.reports += 1
+
+        traced, peak = tracemalloc.get_traced_memory()
+        rss = _rss_bytes()
+        uptime = time.monotonic() - self._started
+        lines = [
+            f"=== {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  report {self.reports}  uptime {uptime:.0f}s  "
+            f"rss {_mb(rss)}  traced {_mb(traced)} (peak {_mb(peak)})  "
+            f"tracing overhead {_mb(tracemalloc.get_tracemalloc_memory())} ===",
+            "Top growth since previous report:",
+            *[self._format_stat(s) for s in since_previous[:self.top]],
+            "Top growth since start:",
+            *[self._format_stat(s) for s in since_start[:self.top]],
+            "",
+        ]
+        with open(self.report_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+        if self.echo:
+            leader = f"; top growth {since_start[0].size_diff / 1024:+.1f} KiB at " \
+                     f"{since_start[0].traceback[0].filename}:{since_start[0].traceback[0].lineno}" if since_start else ""
+            print(f"[MEMORY] rss {_mb(rss)}, traced {_mb(traced)}{leader} (report: {self.report_path})")
+
+        return {"rss": rss, "traced": traced, "peak": peak, "since_start": since_start[:self.top]}
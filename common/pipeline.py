@@ -0,0 +1,260 @@
+"""
+Telemetry Pipeline
+Lazily evaluated source -> transform -> sink stages with per-stage throughput counters
+"""
+
+import sys
+import json
+import time
+from collections import OrderedDict
+
+# Returned by a per-item stage to drop the item
+_DROP = object()
+
+
+class StageStats:
+    def __init__(self, name: str, kind: str):
+        self.name = name
+        self.kind = kind
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        # Time spent in this stage's own code (per-item stages only)
+        self.seconds = 0.0
+
+    def as_dict(self, elapsed: float) -> dict:
+        return {
+            "stage": self.name,
+            "kind": self.kind,
+            "in": self.items_in,
+            "out": self.items_out,
+            "errors": self.errors,
+            "out_per_sec": round(self.items_out / elapsed, 3) if elapsed > 0 else 0.0,
+            "ms_per_item": round(self.seconds * 1000 / self.items_in, 3) if self.items_in else 0.0,
+        }
+
+
+class Pipeline:
+    """
+    Stages are chained generators, so nothing runs until the sink pulls and
+    each item flows all the way through before the source produces the next.
+
+    Per-item stages (map, tap, filter, sink) isolate failures: an exception
+    is counted, passed to on_error and the item is skipped. A sink that
+    returns False reports a failed delivery, counted as an error rather than
+    as output. Whole-stream stages added with then() (batching, dedup,
+    rollup) and the source itself end the run if they raise.
+    """
+
+    def __init__(self, on_error=None):
+        self._source = None
+        self._stages = []
+        self._sink = None
+        self.on_error = on_error or _print_error
+        self.started = None
+
+    # ----- building -----
+    def source(self, name: str, items):
+        self._source = (StageStats(name, "source"), items)
+        return self
+
+    def map(self, name: str, func):
+        return self._add(name, "map", func)
+
+    def tap(self, name: str, func):
+        """Call func for its side effect and pass the item on unchanged"""
+        def apply(item):
+            func(item)
+            return item
+        return self._add(name, "tap", apply)
+
+    def filter(self, name: str, predicate):
+        return self._add(name, "filter", lambda item: item if predicate(item) else _DROP)
+
+    def then(self, name: str, transform):
+        """Add a whole-stream transform: a function from an iterator to an iterator"""
+        self._stages.append((StageStats(name, "stream"), transform))
+        return self
+
+    def batch(self, name: str, size: int, max_wait: float = None):
+        return self.then(name, lambda items: batched(items, size, max_wait))
+
+    def flatten(self, name: str):
+        return self.then(name, flatten)
+
+    def sink(self, name: str, consume):
+        self._sink = (StageStats(name, "sink"), consume)
+        return self
+
+    def _add(self, name, kind, apply):
+        stats = StageStats(name, kind)
+        self._stages.append((stats, lambda items: self._per_item(stats, items, apply)))
+        return self
+
+    # ----- running -----
+    def _per_item(self, stats, items, apply):
+        for item in items:
+            stats.items_in += 1
+            started = time.perf_counter()
+            try:
+                result = apply(item)
+            except Exception as e:
+                stats.errors += 1
+                self.on_error(stats.name, item, e)
+                continue
+            finally:
+                stats.seconds += time.perf_counter() - started
+            if result is not _DROP:
+                stats.items_out += 1
+                yield result
+
+    @staticmethod
+    def _count_in(stats, items):
+        for item in items:
+            stats.items_in += 1
+            yield item
+
+    @staticmethod
+    def _count_out(stats, items):
+        for item in items:
+            stats.items_out += 1
+            yield item
+
+    def run(self, limit: int = None) -> int:
+        """Pull items through to the sink until the source ends (or `limit` items are sunk)"""
+        if self._source is None or self._sink is None:
+            raise ValueError("pipeline needs a source and a sink")
+
+        self.started = time.monotonic()
+        source_stats, items = self._source
+        stream = self._count_out(source_stats, iter(items))
+        for stats, transform in self._stages:
+            if stats.kind == "stream":
+                stream = self._count_out(stats, transform(self._count_in(stats, stream)))
+            else:
+                stream = transform(stream)
+
+        sink_stats, consume = self._sink
+
+        def deliver(item):
+            if consume(item) is False:
+                sink_stats.errors += 1
+                return _DROP
+            return item
+
+        for _ in self._per_item(sink_stats, stream, deliver):
+            if limit is not None and sink_stats.items_out >= limit:
+                break
+        return sink_stats.items_out
+
+    def stats(self) -> list:
+        elapsed = time.monotonic() - self.started if self.started else 0.0
+        stages = [self._source[0]] + [stats for stats, _ in self._stages] + [self._sink[0]]
+        return [stats.as_dict(elapsed) for stats in stages]
+
+    def report(self) -> str:
+        lines = [f"{'stage':<14}{'kind':<8}{'in':>9}{'out':>9}{'errors':>8}{'out/s':>10}{'ms/item':>10}"]
+        for row in self.stats():
+            lines.append(f"{row['stage']:<14}{row['kind']:<8}{row['in']:>9}{row['out']:>9}{row['errors']:>8}"
+                         f"{row['out_per_sec']:>10.2f}{row['ms_per_item']:>10.2f}")
+        return "\n".join(lines)
+
+
+def _print_error(stage, item, error):
+    print(f"[PIPELINE] Stage '{stage}' failed: {error}", file=sys.stderr)
+
+
+# =========================
+# SOURCES
+# =========================
+def ticker(interval: float, count: int = None):
+    """
+    Yield cycle numbers 1, 2, ... and sleep `interval` after each one has
+    gone through the pipeline, the same pacing as a work-then-sleep loop.
+    """
+    cycle = 0
+    while count is None or cycle < count:
+        cycle += 1
+        yield cycle
+        if count is None or cycle < count:
+            time.sleep(interval)
+
+
+# =========================
+# TRANSFORMS
+# =========================
+def batched(items, size: int, max_wait: float = None):
+    """
+    Group items into lists of `size`. With max_wait, a partial batch is also
+    emitted once an item arrives that long after the batch started; as
+    everything is pull-based there is no timer, so idle streams hold their
+    partial batch until the next item or the end of the stream.
+    """
+    batch = []
+    opened = None
+    for item in items:
+        if not batch:
+            opened = time.monotonic()
+        batch.append(item)
+        if len(batch) >= size or (max_wait is not None and time.monotonic() - opened >= max_wait):
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def flatten(batches):
+    for batch in batches:
+        yield from batch
+
+
+def dedup(items, key=None, maxsize: int = 100000):
+    """Drop items whose key was seen among the last `maxsize` distinct keys"""
+    seen = OrderedDict()
+    for item in items:
+        k = key(item) if key else item
+        if k in seen:
+            seen.move_to_end(k)
+            continue
+        seen[k] = None
+        if len(seen) > maxsize:
+            seen.popitem(last=False)
+        yield item
+
+
+def rollup(items, count: int, fields):
+    """
+    Average `fields` over every `count` dict items; the other keys come from
+    the last item of each window (so counters and timestamps stay current).
+    """
+    window = []
+    for item in items:
+        window.append(item)
+        if len(window) == count:
+            rolled = dict(window[-1])
+            for field in fields:
+                rolled[field] = sum(entry[field] for entry in window) / count
+            yield rolled
+            window = []
+
+
+# =========================
+# SINKS
+# =========================
+class FileSink:
+    """Append items as JSON lines"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def __call__(self, item):
+        self._file.write(json.dumps(item) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def stdout_sink(item):
+    print(json.dumps(item), flush=True)
@@ -0,0 +1,252 @@
+"""
+Client Resilience
+Bounded retries with jittered exponential backoff, per-endpoint circuit breakers and retry budgets
+"""
+
+import time
+import random
+import threading
+from urllib.parse import urlsplit
+
+import requests
+
+# Responses that mean "try again later" rather than "this request is wrong"
+RETRYABLE_STATUS = frozenset((429, 500, 502, 503, 504))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending while an endpoint's breaker is open"""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"circuit open for {endpoint}, next probe in {retry_after:.1f}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class RetryPolicy:
+    """
+    Full-jitter exponential backoff: retry n waits uniform(0, min(cap, base * 2^n)).
+    Spreading delays over the whole window is what keeps a fleet that failed
+    together from retrying together.
+    """
+
+    def __init__(self, max_attempts=4, base_delay=0.5, max_delay=8.0, rng=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def backoff(self, attempt: int, cap: float = None) -> float:
+        ceiling = min(self.max_delay if cap is None else cap, self.base_delay * (2 ** min(attempt, 30)))
+        return self._rng.uniform(0, ceiling)
+
+
+class RetryBudget:
+    """
+    Token bucket that lets retries add at most `ratio` extra load on top of
+    first attempts, plus a trickle of `min_per_sec` so quiet clients can still
+    retry at all. When the server is down, retries stop once the bucket is dry.
+    """
+
+    def __init__(self, ratio=0.2, min_per_sec=0.1, max_tokens=10.0):
+        self.ratio = ratio
+        self.min_per_sec = min_per_sec
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated) * self.min_per_sec)
+        self._updated = now
+
+    def deposit(self):
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls
+    until a jittered reset timeout passes, then lets a single probe through.
+    A failed probe doubles the timeout (up to `max_reset_timeout`).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=15.0, max_reset_timeout=300.0, rng=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._timeout = reset_timeout
+        self._open_until = 0.0
+        self._probing = False
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() >= self._open_until:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    return False
+                self._probing = True
+                return True
+            return self.state == self.CLOSED
+
+    def retry_after(self) -> float:
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._open_until - time.monotonic())
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._timeout = self.reset_timeout
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._timeout = min(self._timeout * 2, self.max_reset_timeout)
+                self._trip()
+                return
+            self._failures += 1
+            if self.state == self.CLOSED and self._failures >= self.failure_threshold:
+                self._trip()
+
+    def _trip(self):
+        self.state = self.OPEN
+        self._probing = False
+        # Jitter the open period so a fleet's breakers don't all probe at once
+        self._open_until = time.monotonic() + self._timeout * self._rng.uniform(0.5, 1.5)
+
+
+class Resilience:
+    """Retry, budget and breaker state for one client, keyed by endpoint path"""
+
+    def __init__(self, policy: RetryPolicy = None, reconnect_cap=300.0, sleep=time.sleep,
+                 breaker_factory=CircuitBreaker, budget_factory=RetryBudget):
+        self.policy = policy or RetryPolicy()
+        self.reconnect_cap = reconnect_cap
+        self._sleep = sleep
+        self._breaker_factory = breaker_factory
+        self._budget_factory = budget_factory
+        self._breakers = {}
+        self._budgets = {}
+
+        self.retries = 0
+        self.short_circuited = 0
+        self.budget_exhausted = 0
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = self._breaker_factory()
+        return breaker
+
+    def budget(self, endpoint: str) -> RetryBudget:
+        budget = self._budgets.get(endpoint)
+        if budget is None:
+            budget = self._budgets[endpoint] = self._budget_factory()
+        return budget
+
+    def call(self, endpoint: str, request):
+        """
+        Run request() until it returns a non-retryable response, retries or
+        budget run out, or the breaker opens. Returns the last response;
+        raises the last request error or CircuitOpenError.
+        """
+        breaker = self.breaker(endpoint)
+        budget = self.budget(endpoint)
+        budget.deposit()
+
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                self.short_circuited += 1
+                raise CircuitOpenError(endpoint, breaker.retry_after())
+
+            error = response = None
+            try:
+                response = request()
+            except requests.exceptions.RequestException as e:
+                # Broken or truncated responses count as failures too
+                error = e
+            except BaseException:
+                # Never leave a half-open probe outstanding, or the breaker wedges
+                breaker.record_failure()
+                raise
+
+            if response is not None and response.status_code not in RETRYABLE_STATUS:
+                # A 4xx still proves the server is up
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+
+            attempt += 1
+            delay = self.policy.backoff(attempt - 1)
+            retry_after = _retry_after_seconds(response)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+
+            if attempt >= self.policy.max_attempts or delay > self.policy.max_delay:
+                break
+            if not budget.withdraw():
+                self.budget_exhausted += 1
+                break
+
+            self.retries += 1
+            self._sleep(delay)
+
+        if error is not None:
+            raise error
+        return response
+
+    def post(self, http, url: str, endpoint: str = None, **kwargs):
+        """http.post(url, **kwargs) under the policy; endpoint defaults to the URL path"""
+        return self.call(endpoint or urlsplit(url).path, lambda: http.post(url, **kwargs))
+
+    def reconnect_delay(self, attempt: int, endpoint: str = None) -> float:
+        """Jittered wait before re-trying a failed startup step such as registration"""
+        delay = self.policy.backoff(attempt, cap=self.reconnect_cap)
+        if endpoint is not None:
+            delay = max(delay, self.breaker(endpoint).retry_after())
+        return delay
+
+    def stats(self) -> dict:
+        return {
+            "retries": self.retries,
+            "short_circuited": self.short_circuited,
+            "budget_exhausted": self.budget_exhausted,
+            "open_circuits": sorted(name for name, b in self._breakers.items() if b.state != CircuitBreaker.CLOSED),
+        }
+
+
+def _retry_after_seconds(response):
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
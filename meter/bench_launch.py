@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Encrypted Launch Benchmark
+Compares startup latency and resident memory of encrypted wrapper launch modes
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+from encrypt_meter import encrypt_file, create_executable_wrapper, build_bytecode_payload
+
+
+BENCH_PASSWORD = "benchmark-password"
+METER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# meter.py itself is the payload so import and compile costs are realistic;
+# instead of starting the telemetry loop it reports readiness, then idles
+# long enough for the process tree to be sampled.
+PAYLOAD_TAIL = '''
+print("BENCH_READY", flush=True)
+time.sleep(0.5)
+'''
+
+# label -> (METER_EXEC_MODE, precompiled payload)
+VARIANTS = {
+    "subprocess": ("subprocess", False),
+    "memory": ("memory", False),
+    "bytecode": ("memory", True),
+}
+
+
+def build_payload() -> bytes:
+    with open(os.path.join(METER_DIR, "meter.py")) as f:
+        source = f.read()
+    main_guard = 'if __name__=="__main__":\n    main()'
+    if main_guard not in source:
+        raise RuntimeError("meter.py main guard not found")
+    return source.replace(main_guard, PAYLOAD_TAIL).encode()
+
+
+def _tree_rss_kb(pid):
+    """Sum VmRSS over a process and its descendants (Linux /proc)"""
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+            with open(f"/proc/{current}/task/{current}/children") as f:
+                pending.extend(int(child) for child in f.read().split())
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+    return total
+
+
+def launch_once(wrapper_path, mode, extra_env=None):
+    """Return (seconds until payload ready, process-tree RSS in KB)"""
+
+    # meter.py's sibling and shared modules are imported from the source tree
+    common_dir = os.path.join(os.path.dirname(METER_DIR), "common")
+    pythonpath = os.pathsep.join(filter(None, [METER_DIR, common_dir, os.environ.get("PYTHONPATH")]))
+    env = dict(os.environ, METER_EXEC_MODE=mode, PYTHONPATH=pythonpath, **(extra_env or {}))
+    started = time.perf_counter()
+
+    proc = subprocess.Popen(
+        [sys.executable, wrapper_path],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        text=True, env=env, cwd=os.path.dirname(wrapper_path)
+    )
+    proc.stdin.write(BENCH_PASSWORD + "\n")
+    proc.stdin.flush()
+
+    ready = None
+    for line in proc.stdout:
+        if "BENCH_READY" in line:
+            ready = time.perf_counter() - started
+            break
+
+    rss = _tree_rss_kb(proc.pid) if ready is not None else 0
+    proc.stdout.read()
+    proc.wait()
+
+    if ready is None:
+        raise RuntimeError(f"{mode} launch never reached the payload (exit {proc.returncode})")
+
+    return ready, rss
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Benchmark encrypted wrapper launch modes")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modes", default=",".join(VARIANTS),
+                        help=f"Comma-separated launch variants to compare ({', '.join(VARIANTS)})")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/status"):
+        print("[ERROR] RSS sampling needs /proc (Linux)")
+        sys.exit(1)
+
+    workdir = tempfile.mkdtemp(prefix="meter-bench-")
+    try:
+        source = build_payload()
+        wrappers = {}
+        for precompiled in (False, True):
+            payload_path = os.path.join(workdir, f"payload{int(precompiled)}.bin")
+            with open(payload_path, "wb") as f:
+                f.write(build_bytecode_payload(source) if precompiled else source)
+
+            wrapper_path = os.path.join(workdir, f"payload{int(precompiled)}_encrypted.py")
+            encrypted_data, salt = encrypt_file(payload_path, BENCH_PASSWORD)
+            create_executable_wrapper(encrypted_data, salt, wrapper_path)
+            wrappers[precompiled] = wrapper_path
+
+        print(f"{'mode':<12}{'startup (median)':>18}{'startup (min)':>16}{'tree RSS (median)':>20}")
+        for label in args.modes.split(","):
+            mode, precompiled = VARIANTS[label]
+            results = [launch_once(wrappers[precompiled], mode) for _ in range(args.runs)]
+            latencies = sorted(r[0] for r in results)
+            rss = sorted(r[1] for r in results)
+            print(f"{label:<12}{latencies[len(latencies) // 2] * 1000:>15.1f} ms"
+                  f"{latencies[0] * 1000:>13.1f} ms{rss[len(rss) // 2] / 1024:>17.1f} MB")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Chunked Encryption Benchmark
+Measures streaming encrypt/decrypt throughput and peak memory against one-shot Fernet
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+from encrypt_meter import derive_key, encrypt_stream, decrypt_stream, DEFAULT_CHUNK_SIZE
+
+BENCH_SALT = b"\x00" * 16
+BENCH_ITERATIONS = 50000
+
+
+def parse_size(text: str) -> int:
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def _peak_rss_mb() -> float:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux and bytes on macOS
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(case: str, source: str, workdir: str, chunk_size: int) -> dict:
+    """Encrypt then decrypt source with one method, inside this process"""
+    key = derive_key("benchmark", BENCH_SALT, BENCH_ITERATIONS)
+    sealed = os.path.join(workdir, f"{case}.enc")
+    restored = os.path.join(workdir, f"{case}.out")
+
+    started = time.perf_counter()
+    if case == "stream":
+        with open(source, 'rb') as src, open(sealed, 'wb') as dst:
+            encrypt_stream(src, dst, key, chunk_size)
+    else:
+        from cryptography.fernet import Fernet
+        with open(source, 'rb') as src, open(sealed, 'wb') as dst:
+            dst.write(Fernet(key).encrypt(src.read()))
+    encrypt_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if case == "stream":
+        with open(sealed, 'rb') as src, open(restored, 'wb') as dst:
+            decrypt_stream(src, dst, key)
+    else:
+        from cryptography.fernet import Fernet
+        with open(sealed, 'rb') as src, open(restored, 'wb') as dst:
+            dst.write(Fernet(key).decrypt(src.read()))
+    decrypt_time = time.perf_counter() - started
+
+    result = {
+        "encrypt_s": encrypt_time,
+        "decrypt_s": decrypt_time,
+        "sealed_bytes": os.path.getsize(sealed),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    os.unlink(sealed)
+    os.unlink(restored)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chunked payload encryption")
+    parser.add_argument("--sizes", default="1M,100M,1G", help="Comma-separated payload sizes")
+    parser.add_argument("--chunk-size", type=parse_size, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--fernet-max", type=parse_size, default=parse_size("100M"),
+                        help="Largest size to also run the one-shot Fernet baseline for")
+    parser.add_argument("--worker", nargs=3, metavar=("CASE", "SOURCE", "WORKDIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_case(*args.worker, args.chunk_size)))
+        return
+
+    workdir = tempfile.mkdtemp(prefix="meter-stream-bench-")
+    try:
+        print(f"{'size':>8} {'method':<8}{'encrypt MB/s':>14}{'decrypt MB/s':>14}{'overhead':>10}{'peak RSS':>12}")
+        for label in args.sizes.split(","):
+            size = parse_size(label)
+            source = os.path.join(workdir, "payload.bin")
+            with open(source, 'wb') as f:
+                remaining = size
+                while remaining:
+                    block = min(remaining, 1 << 20)
+                    f.write(os.urandom(block))
+                    remaining -= block
+
+            cases = ["stream"] + (["fernet"] if size <= args.fernet_max else [])
+            for case in cases:
+                # Fresh interpreter per case so peak RSS is not shared
+                output = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--chunk-size", str(args.chunk_size),
+                     "--worker", case, source, workdir],
+                    capture_output=True, text=True, check=True
+                ).stdout
+                result = json.loads(output)
+                mb = size / (1 << 20)
+                print(f"{label:>8} {case:<8}{mb / result['encrypt_s']:>14.1f}{mb / result['decrypt_s']:>14.1f}"
+                      f"{(result['sealed_bytes'] - size) / max(size, 1):>9.1%}{result['peak_rss_mb']:>9.1f} MB")
+
+            os.unlink(source)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
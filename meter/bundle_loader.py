@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Encrypted Bundle Loader
+Imports modules from an encrypted bundle, decrypting each one on first import
+"""
+
+import os
+import sys
+import json
+import mmap
+import runpy
+import struct
+import importlib.abc
+import importlib.util
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+# Bundle layout:
+#   header  magic, version, salt, KDF iterations, index size
+#   index   nonce + AES-GCM(JSON {"entry": ..., "modules": {name: [offset, size, is_package]}})
+#   data    per module: nonce + AES-GCM(source), module name bound as associated data
+MAGIC = b"MBND"
+VERSION = 1
+HEADER = struct.Struct("<4sB16sII")
+NONCE_SIZE = 12
+INDEX_AAD = b"index"
+
+
+def derive_bundle_key(password: str, salt: bytes, iterations: int) -> bytes:
+    """Derive the raw AES-256 bundle key from a password"""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=iterations,
+    )
+    return kdf.derive(password.encode())
+
+
+def read_header(path: str) -> tuple[bytes, int]:
+    """Return (salt, iterations) so the caller can derive the key"""
+    with open(path, 'rb') as f:
+        magic, version, salt, iterations, _ = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not an encrypted bundle")
+    return salt, iterations
+
+
+class BundleImporter(importlib.abc.MetaPathFinder, importlib.abc.InspectLoader):
+    """
+    Meta path hook serving modules out of an mmap'd bundle. Only the index
+    is decrypted up front; module source is decrypted when it is imported.
+    """
+
+    def __init__(self, path: str, key: bytes):
+        self.path = path
+        self._aead = AESGCM(key)
+
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _, _, _, _, index_size = HEADER.unpack_from(self._map)
+        index_end = HEADER.size + index_size
+        index = json.loads(self._open(self._map[HEADER.size:index_end], INDEX_AAD))
+
+        self.entry = index.get("entry")
+        self.modules = index["modules"]
+        self._data_start = index_end
+        self.decrypted = set()
+
+    def _open(self, blob: bytes, aad: bytes) -> bytes:
+        return self._aead.decrypt(blob[:NONCE_SIZE], blob[NONCE_SIZE:], aad)
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname not in self.modules:
+            return None
+        return importlib.util.spec_from_loader(
+            fullname, self,
+            origin=f"<bundle:{fullname}>",
+            is_package=self.is_package(fullname)
+        )
+
+    def is_package(self, fullname):
+        return bool(self.modules[fullname][2])
+
+    def get_source(self, fullname):
+        offset, size, _ = self.modules[fullname]
+        start = self._data_start + offset
+        source = self._open(self._map[start:start + size], fullname.encode())
+        self.decrypted.add(fullname)
+        return source.decode()
+
+    def get_code(self, fullname):
+        return compile(self.get_source(fullname), f"<bundle:{fullname}>", "exec")
+
+    def install(self):
+        # Ahead of the path finders, so bundled modules shadow plaintext copies
+        sys.meta_path.insert(0, self)
+        return self
+
+
+def main():
+    """Unlock the bundle next to this loader and run its entry module"""
+    loader_path = os.path.abspath(sys.argv[0])
+    name = os.path.basename(loader_path)
+    name = name[:-len("_loader.py")] if name.endswith("_loader.py") else os.path.splitext(name)[0]
+    bundle_path = os.environ.get("METER_BUNDLE", os.path.join(os.path.dirname(loader_path), f"{name}.bundle"))
+
+    if not os.path.exists(bundle_path):
+        print(f"[ERROR] Bundle not found: {bundle_path}")
+        sys.exit(1)
+
+    password = input("Enter password to unlock bundle: ").strip()
+    if not password:
+        print("[ERROR] Password is required!")
+        sys.exit(1)
+
+    try:
+        salt, iterations = read_header(bundle_path)
+        importer = BundleImporter(bundle_path, derive_bundle_key(password, salt, iterations)).install()
+    except Exception as e:
+        print(f"[ERROR] Failed to unlock bundle: {str(e) or type(e).__name__}")
+        print("Please check your password and try again.")
+        sys.exit(1)
+
+    if not importer.entry:
+        print(f"[SUCCESS] Bundle unlocked ({len(importer.modules)} modules); no entry module to run")
+        return
+
+    print(f"[SUCCESS] Bundle unlocked. Executing {importer.entry}...")
+    print("=" * 50)
+    runpy.run_module(importer.entry, run_name="__main__", alter_sys=True)
+
+
+if __name__ == "__main__":
+    main()
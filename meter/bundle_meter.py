@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Encrypted Multi-Module Bundler
+Packs a directory of Python modules into one indexed, encrypted bundle
+"""
+
+import os
+import sys
+import json
+import shutil
+import fnmatch
+import getpass
+import argparse
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from bundle_loader import MAGIC, VERSION, HEADER, NONCE_SIZE, INDEX_AAD, derive_bundle_key
+from encrypt_meter import DEFAULT_KDF_ITERATIONS, MIN_KDF_ITERATIONS
+
+LOADER_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bundle_loader.py")
+
+
+def collect_modules(source_dir: str, exclude: tuple = ()) -> dict:
+    """
+    Map module names to (path, is_package). A directory containing
+    __init__.py is bundled as that package; any other directory is treated
+    as an import root whose files become top-level modules.
+    """
+    source_dir = os.path.abspath(source_dir)
+    if os.path.exists(os.path.join(source_dir, "__init__.py")):
+        root = os.path.dirname(source_dir)
+    else:
+        root = source_dir
+
+    modules = {}
+    for dirpath, dirnames, filenames in os.walk(source_dir):
+        dirnames[:] = sorted(d for d in dirnames if d != "__pycache__" and not d.startswith("."))
+        for filename in sorted(filenames):
+            if not filename.endswith(".py"):
+                continue
+            path = os.path.join(dirpath, filename)
+            relative = os.path.relpath(path, root)
+            if any(fnmatch.fnmatch(relative, pattern) for pattern in exclude):
+                continue
+
+            parts = relative[:-3].split(os.sep)
+            is_package = parts[-1] == "__init__"
+            if is_package:
+                parts = parts[:-1]
+            modules[".".join(parts)] = (path, is_package)
+
+    return modules
+
+
+def build_bundle(modules: dict, bundle_path: str, password: str, entry: str = None,
+                 iterations: int = DEFAULT_KDF_ITERATIONS) -> int:
+    """Encrypt every module into bundle_path and return its size in bytes"""
+    salt = os.urandom(16)
+    aead = AESGCM(derive_bundle_key(password, salt, iterations))
+
+    def seal(data: bytes, aad: bytes) -> bytes:
+        nonce = os.urandom(NONCE_SIZE)
+        return nonce + aead.encrypt(nonce, data, aad)
+
+    index = {"entry": entry, "modules": {}}
+    blobs = []
+    offset = 0
+    for name, (path, is_package) in modules.items():
+        with open(path, 'rb') as f:
+            blob = seal(f.read(), name.encode())
+        index["modules"][name] = [offset, len(blob), is_package]
+        blobs.append(blob)
+        offset += len(blob)
+
+    sealed_index = seal(json.dumps(index).encode(), INDEX_AAD)
+
+    with open(bundle_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, salt, iterations, len(sealed_index)))
+        f.write(sealed_index)
+        for blob in blobs:
+            f.write(blob)
+
+    return HEADER.size + len(sealed_index) + offset
+
+
+def main():
+    """Bundle a directory and write the loader next to it"""
+    parser = argparse.ArgumentParser(description="Encrypt a package directory into a lazily decrypted bundle")
+    parser.add_argument("source", nargs="+",
+                        help="Package directories or import roots to bundle; list shared code too "
+                             "(meter ../common), since bundled modules cannot import from the source tree")
+    parser.add_argument("-o", "--output-dir", default="dist", help="Where to write the bundle and loader")
+    parser.add_argument("--name", help="Bundle name (default: source directory name)")
+    parser.add_argument("--entry", help="Module to run as __main__ when the loader starts")
+    parser.add_argument("--exclude", action="append", default=[],
+                        help="Glob of relative paths to leave out (repeatable)")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_KDF_ITERATIONS,
+                        help="PBKDF2 iterations (see encrypt_meter.py --calibrate)")
+    args = parser.parse_args()
+
+    if args.iterations < MIN_KDF_ITERATIONS:
+        print(f"[ERROR] At least {MIN_KDF_ITERATIONS} PBKDF2 iterations are required")
+        sys.exit(1)
+
+    modules = {}
+    for source in args.source:
+        found = collect_modules(source, tuple(args.exclude))
+        clashes = sorted(set(found) & set(modules))
+        if clashes:
+            print(f"[ERROR] {source} redefines bundled modules: {', '.join(clashes)}")
+            sys.exit(1)
+        modules.update(found)
+    if not modules:
+        print(f"[ERROR] No Python modules found in {', '.join(args.source)}")
+        sys.exit(1)
+    if args.entry and args.entry not in modules:
+        print(f"[ERROR] Entry module '{args.entry}' is not in the bundle")
+        sys.exit(1)
+
+    password = getpass.getpass("Enter encryption password: ").strip()
+    if not password or password != getpass.getpass("Confirm password: ").strip():
+        print("[ERROR] Passwords are empty or do not match!")
+        sys.exit(1)
+
+    name = args.name or os.path.basename(os.path.abspath(args.source[0]))
+    os.makedirs(args.output_dir, exist_ok=True)
+    bundle_path = os.path.join(args.output_dir, f"{name}.bundle")
+    loader_path = os.path.join(args.output_dir, f"{name}_loader.py")
+
+    size = build_bundle(modules, bundle_path, password, args.entry, args.iterations)
+    shutil.copyfile(LOADER_SOURCE, loader_path)
+    if os.name != 'nt':
+        os.chmod(loader_path, 0o755)
+
+    print(f"[SUCCESS] Bundled {len(modules)} modules ({size} bytes)")
+    print(f"Bundle: {bundle_path}")
+    print(f"Loader: {loader_path}")
+    print()
+    print("Usage:")
+    print(f"  python {loader_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Report-by-Exception Change Detection
+Streaming per-channel statistics, deadbands and power-quality event flags
+"""
+
+import time
+
+
+# =========================
+# STREAMING STATISTICS
+# =========================
+class ChannelStats:
+    """Welford running mean/variance plus an EWMA of recent values"""
+
+    def __init__(self, alpha=0.2):
+
+        self.alpha = alpha
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.ewma = None
+
+    def update(self, value):
+
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        if self.ewma is None:
+            self.ewma = value
+        else:
+            self.ewma += self.alpha * (value - self.ewma)
+
+    @property
+    def stddev(self):
+        if self.count < 2:
+            return 0.0
+        return (self._m2 / (self.count - 1)) ** 0.5
+
+
+# =========================
+# EXCEPTION REPORTER
+# =========================
+class ExceptionReporter:
+
+    DEFAULT_DEADBANDS = {
+        "voltage_v": 2.0,
+        "current_a": 1.0,
+        "power_factor": 0.02,
+        "frequency_hz": 0.05,
+    }
+
+    NOMINAL_VOLTAGE = 230.0
+    VOLTAGE_TOLERANCE = 0.10        # sag/swell beyond +/-10% of nominal
+    NOMINAL_FREQUENCY = 50.0
+    FREQUENCY_TOLERANCE = 0.5       # excursion beyond +/-0.5 Hz
+    OUTLIER_SIGMA = 4.0
+    WARMUP_READINGS = 10
+
+    def __init__(self, deadbands=None, heartbeat=900, alpha=0.2):
+
+        self.deadbands = dict(self.DEFAULT_DEADBANDS)
+        if deadbands:
+            self.deadbands.update(deadbands)
+
+        self.heartbeat = heartbeat
+        self.stats = {name: ChannelStats(alpha) for name in self.deadbands}
+
+        self.last_sent = None
+        self.last_sent_at = None
+
+        self.evaluated = 0
+        self.transmitted = 0
+
+    def anomalies(self, reading):
+        """Return human-readable power-quality events present in the reading"""
+
+        events = []
+
+        voltage = reading["voltage_v"]
+        low = self.NOMINAL_VOLTAGE * (1 - self.VOLTAGE_TOLERANCE)
+        high = self.NOMINAL_VOLTAGE * (1 + self.VOLTAGE_TOLERANCE)
+        if voltage < low:
+            events.append(f"voltage sag {voltage}V")
+        elif voltage > high:
+            events.append(f"voltage swell {voltage}V")
+
+        freq = reading["frequency_hz"]
+        if abs(freq - self.NOMINAL_FREQUENCY) > self.FREQUENCY_TOLERANCE:
+            events.append(f"frequency excursion {freq}Hz")
+
+        for name, stats in self.stats.items():
+            if stats.count >= self.WARMUP_READINGS and stats.stddev > 0:
+                sigma = abs(reading[name] - stats.ewma) / stats.stddev
+                if sigma > self.OUTLIER_SIGMA:
+                    events.append(f"{name} outlier {reading[name]} ({sigma:.1f} sigma)")
+
+        return events
+
+    def evaluate(self, reading, now=None):
+        """
+        Decide whether a reading should be transmitted.
+        Returns (transmit, reasons, events): reasons explains the decision
+        and events lists the power-quality anomalies among them. Deadbands
+        stay measured from the last reading passed to commit(), so call it
+        once the reading has actually been delivered.
+        """
+
+        now = time.monotonic() if now is None else now
+        self.evaluated += 1
+
+        events = self.anomalies(reading)
+        reasons = list(events)
+
+        if self.last_sent is None:
+            reasons.append("first reading")
+        else:
+            for name, band in self.deadbands.items():
+                change = abs(reading[name] - self.last_sent[name])
+                if change > band:
+                    reasons.append(f"{name} changed by {change:.2f}")
+
+            if now - self.last_sent_at >= self.heartbeat:
+                reasons.append("heartbeat")
+
+        for name, stats in self.stats.items():
+            stats.update(reading[name])
+
+        if reasons:
+            self.transmitted += 1
+
+        return bool(reasons), reasons, events
+
+    def commit(self, reading, now=None):
+        """Make a delivered reading the new deadband baseline and restart the heartbeat"""
+
+        self.last_sent = reading
+        self.last_sent_at = time.monotonic() if now is None else now
+
+    @property
+    def suppression_ratio(self):
+        if not self.evaluated:
+            return 0.0
+        return 1 - self.transmitted / self.evaluated
+
+
+def parse_deadbands(spec):
+    """Parse 'voltage_v=2,current_a=0.5' into a deadband dict"""
+
+    deadbands = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        name, _, value = item.partition("=")
+        if name.strip() not in ExceptionReporter.DEFAULT_DEADBANDS:
+            raise ValueError(f"Unknown deadband channel '{name.strip()}'")
+        deadbands[name.strip()] = float(value)
+    return deadbands
@@ -8,42 +8,163 @@ import os
 import sys
 import hashlib
 import base64
-from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import tempfile
 import shutil
+import time
+import io
+import struct
+import marshal
+import subprocess
+import importlib.util
+import argparse
+
+DEFAULT_KDF_ITERATIONS = 100000
+MIN_KDF_ITERATIONS = 50000
+
+# Chunked stream format: header, then AES-GCM chunks of chunk_size plaintext
+# bytes. Each chunk's nonce is prefix(7) + counter(4) + last-chunk flag(1),
+# so reordering, truncation and appended data all fail authentication.
+STREAM_MAGIC = b"MSTR"
+STREAM_VERSION = 1
+STREAM_HEADER = struct.Struct("<4sBI7s")
+STREAM_TAG_SIZE = 16
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Payloads larger than this go to a sidecar file instead of the wrapper source
+EMBED_LIMIT = 256 * 1024
+
+# Optional precompiled payload: header, marshalled code object, then the
+# original source as a fallback for interpreters with a different magic number
+BYTECODE_MAGIC = b"MPYC"
+BYTECODE_HEADER = struct.Struct("<4s4sII")
+PAYLOAD_FILENAME = "<encrypted meter.py>"
 
-def derive_key(password: str, salt: bytes) -> bytes:
+_COMPILE_SNIPPET = (
+    "import sys, marshal, importlib.util;"
+    "source = sys.stdin.buffer.read();"
+    "code = compile(source, sys.argv[1], 'exec');"
+    "sys.stdout.buffer.write(importlib.util.MAGIC_NUMBER + marshal.dumps(code))"
+)
+
+def derive_key(password: str, salt: bytes, iterations: int = DEFAULT_KDF_ITERATIONS) -> bytes:
     """Derive encryption key from password using PBKDF2"""
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
         length=32,
         salt=salt,
-        iterations=100000,
+        iterations=iterations,
     )
     key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
     return key
 
-def encrypt_file(file_path: str, password: str) -> tuple[bytes, bytes]:
+def calibrate_iterations(target_seconds: float, sample_iterations: int = 20000) -> int:
+    """Pick a PBKDF2 iteration count that takes ~target_seconds on this machine"""
+    salt = os.urandom(16)
+    best = None
+    for _ in range(3):
+        started = time.perf_counter()
+        derive_key("calibration", salt, sample_iterations)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    
+    iterations = int(sample_iterations * target_seconds / best)
+    iterations = max(MIN_KDF_ITERATIONS, round(iterations, -3))
+    return iterations
+
+def build_bytecode_payload(source: bytes, python: str = None) -> bytes:
+    """
+    Compile source ahead of time for the target interpreter (this one by
+    default) and pack the code object together with the source.
+    """
+    if python:
+        result = subprocess.run([python, "-c", _COMPILE_SNIPPET, PAYLOAD_FILENAME],
+                                input=source, capture_output=True, check=True)
+        pyc_magic, code = result.stdout[:4], result.stdout[4:]
+    else:
+        pyc_magic = importlib.util.MAGIC_NUMBER
+        code = marshal.dumps(compile(source, PAYLOAD_FILENAME, "exec"))
+    
+    header = BYTECODE_HEADER.pack(BYTECODE_MAGIC, pyc_magic, len(code), len(source))
+    return header + code + source
+
+def _chunk_nonce(prefix: bytes, counter: int, last: bool) -> bytes:
+    return prefix + counter.to_bytes(4, 'big') + (b"\x01" if last else b"\x00")
+
+def encrypt_stream(src, dst, key: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Encrypt file object src into dst chunk by chunk; returns bytes written"""
+    aead = AESGCM(base64.urlsafe_b64decode(key))
+    prefix = os.urandom(7)
+    written = dst.write(STREAM_HEADER.pack(STREAM_MAGIC, STREAM_VERSION, chunk_size, prefix))
+    
+    counter = 0
+    chunk = src.read(chunk_size)
+    while True:
+        # Read one chunk ahead so the final chunk can be flagged
+        following = src.read(chunk_size) if len(chunk) == chunk_size else b""
+        last = not following
+        written += dst.write(aead.encrypt(_chunk_nonce(prefix, counter, last), chunk, None))
+        if last:
+            return written
+        chunk = following
+        counter += 1
+
+def decrypt_stream(src, dst, key: bytes) -> int:
+    """Decrypt a chunked stream from src into dst; returns plaintext bytes"""
+    magic, version, chunk_size, prefix = STREAM_HEADER.unpack(src.read(STREAM_HEADER.size))
+    if magic != STREAM_MAGIC or version != STREAM_VERSION:
+        raise ValueError("Not an encrypted meter stream")
+    
+    aead = AESGCM(base64.urlsafe_b64decode(key))
+    sealed_size = chunk_size + STREAM_TAG_SIZE
+    
+    total = 0
+    counter = 0
+    chunk = src.read(sealed_size)
+    while True:
+        following = src.read(sealed_size) if len(chunk) == sealed_size else b""
+        last = not following
+        total += dst.write(aead.decrypt(_chunk_nonce(prefix, counter, last), chunk, None))
+        if last:
+            return total
+        chunk = following
+        counter += 1
+
+def encrypt_file(file_path: str, password: str,
+                 iterations: int = DEFAULT_KDF_ITERATIONS,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> tuple[bytes, bytes]:
     """Encrypt file and return (encrypted_data, salt)"""
     # Generate random salt
     salt = os.urandom(16)
     
     # Derive key from password
-    key = derive_key(password, salt)
+    key = derive_key(password, salt, iterations)
     
-    # Read and encrypt the file
+    # Stream the file through the chunked cipher
+    encrypted = io.BytesIO()
     with open(file_path, 'rb') as f:
-        file_data = f.read()
+        encrypt_stream(f, encrypted, key, chunk_size)
     
-    fernet = Fernet(key)
-    encrypted_data = fernet.encrypt(file_data)
+    return encrypted.getvalue(), salt
+
+def encrypt_file_to(file_path: str, output_path: str, password: str,
+                    iterations: int = DEFAULT_KDF_ITERATIONS,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> bytes:
+    """Encrypt file into a payload file without holding it in memory; returns salt"""
+    salt = os.urandom(16)
+    key = derive_key(password, salt, iterations)
+    
+    with open(file_path, 'rb') as src, open(output_path, 'wb') as dst:
+        encrypt_stream(src, dst, key, chunk_size)
     
-    return encrypted_data, salt
+    return salt
 
-def create_executable_wrapper(encrypted_data: bytes, salt: bytes, output_path: str):
-    """Create a self-extracting executable wrapper"""
+def create_executable_wrapper(encrypted_data: bytes, salt: bytes, output_path: str,
+                              iterations: int = DEFAULT_KDF_ITERATIONS,
+                              payload_file: str = None):
+    """Create a self-extracting executable wrapper (payload embedded or in payload_file)"""
     wrapper_code = f'''#!/usr/bin/env python3
 """
 Encrypted Python File Executor
@@ -51,72 +172,233 @@ Password protected execution of encrypted meter.py
 """
 
 import os
+import io
 import sys
+import struct
 import tempfile
 import shutil
 import base64
-from cryptography.fernet import Fernet
+import marshal
+import importlib.abc
+import importlib.util
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import subprocess
 
-# Embedded encrypted data
+# Embedded encrypted data, or the name of a payload file next to this wrapper
 ENCRYPTED_DATA = base64.b64decode("{base64.b64encode(encrypted_data).decode()}")
+PAYLOAD_FILE = {payload_file!r}
 SALT = base64.b64decode("{base64.b64encode(salt).decode()}")
+KDF_ITERATIONS = {iterations}
+
+STREAM_MAGIC = {STREAM_MAGIC!r}
+STREAM_VERSION = {STREAM_VERSION}
+STREAM_HEADER = struct.Struct("{STREAM_HEADER.format}")
+STREAM_TAG_SIZE = {STREAM_TAG_SIZE}
+
+BYTECODE_MAGIC = {BYTECODE_MAGIC!r}
+BYTECODE_HEADER = struct.Struct("{BYTECODE_HEADER.format}")
+PAYLOAD_FILENAME = "{PAYLOAD_FILENAME}"
 
-def derive_key(password: str, salt: bytes) -> bytes:
+def derive_key(password: str, salt: bytes, iterations: int = KDF_ITERATIONS) -> bytes:
     """Derive encryption key from password using PBKDF2"""
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
         length=32,
         salt=salt,
-        iterations=100000,
+        iterations=iterations,
     )
     key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
     return key
 
+def _cache_tag() -> str:
+    """Identifies the salt and KDF cost a cached key was derived with"""
+    return f"{{base64.b64encode(SALT).decode()}}:{{KDF_ITERATIONS}}"
+
+def load_cached_key():
+    """Return the derived key from METER_KEY_CACHE if it is private and current"""
+    path = os.environ.get("METER_KEY_CACHE")
+    if not path or not os.path.exists(path):
+        return None
+    
+    if os.name != 'nt' and os.stat(path).st_mode & 0o077:
+        print(f"[WARNING] Ignoring key cache {{path}}: permissions must be 0600")
+        return None
+    
+    try:
+        with open(path, 'r') as f:
+            tag, key = f.read().split()
+    except (OSError, ValueError):
+        return None
+    
+    # A cache left over from a previous encryption is stale
+    if tag != _cache_tag():
+        return None
+    return key.encode()
+
+def save_cached_key(key: bytes):
+    """Store the derived key in METER_KEY_CACHE, readable by the owner only"""
+    path = os.environ.get("METER_KEY_CACHE")
+    if not path:
+        return
+    
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(f"{{_cache_tag()}} {{key.decode()}}\\n")
+        if os.name != 'nt':
+            os.chmod(path, 0o600)
+    except OSError as e:
+        print(f"[WARNING] Could not write key cache {{path}}: {{e}}")
+
+def _chunk_nonce(prefix: bytes, counter: int, last: bool) -> bytes:
+    return prefix + counter.to_bytes(4, 'big') + (b"\\x01" if last else b"\\x00")
+
+def decrypt_stream(src, dst, key: bytes) -> int:
+    """Decrypt a chunked stream from src into dst; returns plaintext bytes"""
+    magic, version, chunk_size, prefix = STREAM_HEADER.unpack(src.read(STREAM_HEADER.size))
+    if magic != STREAM_MAGIC or version != STREAM_VERSION:
+        raise ValueError("Not an encrypted meter stream")
+    
+    aead = AESGCM(base64.urlsafe_b64decode(key))
+    sealed_size = chunk_size + STREAM_TAG_SIZE
+    
+    total = 0
+    counter = 0
+    chunk = src.read(sealed_size)
+    while True:
+        following = src.read(sealed_size) if len(chunk) == sealed_size else b""
+        last = not following
+        total += dst.write(aead.decrypt(_chunk_nonce(prefix, counter, last), chunk, None))
+        if last:
+            return total
+        chunk = following
+        counter += 1
+
+def decrypt_payload(key: bytes) -> bytes:
+    """Decrypt the embedded or sidecar payload in fixed-size chunks"""
+    plaintext = io.BytesIO()
+    if PAYLOAD_FILE:
+        payload_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), PAYLOAD_FILE)
+        with open(payload_path, 'rb') as src:
+            decrypt_stream(src, plaintext, key)
+    else:
+        decrypt_stream(io.BytesIO(ENCRYPTED_DATA), plaintext, key)
+    return plaintext.getvalue()
+
+def unpack_payload(payload: bytes):
+    """Split a decrypted payload into (code object or None, source)"""
+    if not payload.startswith(BYTECODE_MAGIC):
+        return None, payload
+    
+    _, pyc_magic, code_size, source_size = BYTECODE_HEADER.unpack_from(payload)
+    code_start = BYTECODE_HEADER.size
+    source_start = code_start + code_size
+    source = payload[source_start:source_start + source_size]
+    
+    if pyc_magic != importlib.util.MAGIC_NUMBER:
+        # Precompiled for another Python version; compile the source instead
+        return None, source
+    return marshal.loads(payload[code_start:source_start]), source
+
+class MemoryLoader(importlib.abc.Loader):
+    """Loader that runs decrypted code or source without touching disk"""
+
+    def __init__(self, source: bytes, filename: str, code=None):
+        self.source = source
+        self.filename = filename
+        self.code = code
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        code = self.code or compile(self.source, self.filename, "exec")
+        exec(code, module.__dict__)
+
+def run_in_memory(payload: bytes):
+    """Execute the decrypted script as __main__ inside this interpreter"""
+    code, source = unpack_payload(payload)
+    loader = MemoryLoader(source, PAYLOAD_FILENAME, code)
+    spec = importlib.util.spec_from_loader("__main__", loader, origin=PAYLOAD_FILENAME)
+    module = importlib.util.module_from_spec(spec)
+
+    # Sibling modules (reading_store, ...) resolve next to this wrapper
+    wrapper_dir = os.path.dirname(os.path.abspath(__file__))
+    if wrapper_dir not in sys.path:
+        sys.path.insert(0, wrapper_dir)
+
+    sys.modules["__main__"] = module
+    loader.exec_module(module)
+
+def run_in_subprocess(payload: bytes):
+    """Legacy path: write a temp file and run it in a second interpreter"""
+    _, source = unpack_payload(payload)
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
+        temp_file.write(source.decode())
+        temp_file_path = temp_file.name
+    
+    # The temp file is not next to meter.py's modules, so hand the child their directories
+    wrapper_dir = os.path.dirname(os.path.abspath(__file__))
+    common_dir = os.path.join(os.path.dirname(wrapper_dir), "common")
+    pythonpath = os.pathsep.join(filter(None, [wrapper_dir, common_dir, os.environ.get("PYTHONPATH")]))
+    
+    try:
+        # Pass command line arguments to the decrypted script
+        result = subprocess.run([sys.executable, temp_file_path] + sys.argv[1:], 
+                              capture_output=False, text=True, env=dict(os.environ, PYTHONPATH=pythonpath))
+        
+        sys.exit(result.returncode)
+        
+    finally:
+        # Clean up temporary file
+        try:
+            os.unlink(temp_file_path)
+        except:
+            pass
+
 def decrypt_and_execute():
     """Decrypt the file and execute it"""
-    # Get password from user
-    password = input("Enter password to decrypt meter.py: ").strip()
+    decrypted_data = None
     
-    if not password:
-        print("[ERROR] Password is required!")
-        sys.exit(1)
+    # A cached key lets watchdog restarts skip the prompt and the KDF
+    key = load_cached_key()
+    if key:
+        try:
+            decrypted_data = decrypt_payload(key)
+        except Exception:
+            print("[WARNING] Cached key rejected, asking for password")
     
-    try:
-        # Derive key and decrypt
-        key = derive_key(password, SALT)
-        fernet = Fernet(key)
-        decrypted_data = fernet.decrypt(ENCRYPTED_DATA)
+    if decrypted_data is None:
+        # Get password from user
+        password = input("Enter password to decrypt meter.py: ").strip()
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-            temp_file.write(decrypted_data.decode())
-            temp_file_path = temp_file.name
+        if not password:
+            print("[ERROR] Password is required!")
+            sys.exit(1)
         
         try:
-            # Execute the decrypted Python file
-            print("[SUCCESS] File decrypted successfully. Executing meter.py...")
-            print("=" * 50)
-            
-            # Pass command line arguments to the decrypted script
-            result = subprocess.run([sys.executable, temp_file_path] + sys.argv[1:], 
-                                  capture_output=False, text=True)
-            
-            sys.exit(result.returncode)
-            
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(temp_file_path)
-            except:
-                pass
-                
-    except Exception as e:
-        print(f"[ERROR] Failed to decrypt or execute: {{str(e)}}")
-        print("Please check your password and try again.")
-        sys.exit(1)
+            # Derive key and decrypt
+            key = derive_key(password, SALT)
+            decrypted_data = decrypt_payload(key)
+                    
+        except Exception as e:
+            print(f"[ERROR] Failed to decrypt or execute: {{str(e)}}")
+            print("Please check your password and try again.")
+            sys.exit(1)
+        
+        save_cached_key(key)
+    
+    # Execute the decrypted Python file
+    print("[SUCCESS] File decrypted successfully. Executing meter.py...")
+    print("=" * 50)
+    
+    # METER_EXEC_MODE=subprocess restores the temp-file launch
+    if os.environ.get("METER_EXEC_MODE", "memory").lower() == "subprocess":
+        run_in_subprocess(decrypted_data)
+    else:
+        run_in_memory(decrypted_data)
 
 if __name__ == "__main__":
     decrypt_and_execute()
@@ -132,6 +414,36 @@ if __name__ == "__main__":
 
 def main():
     """Main encryption process"""
+    parser = argparse.ArgumentParser(description="Encrypt meter.py into a password-protected executable")
+    parser.add_argument("--iterations", type=int,
+                        help=f"PBKDF2 iterations to record in the wrapper (default: {DEFAULT_KDF_ITERATIONS})")
+    parser.add_argument("--kdf-target-ms", type=int,
+                        help="Calibrate iterations so unlocking takes about this long on this machine")
+    parser.add_argument("--sidecar", action="store_true",
+                        help="Always write the payload to a separate .bin file next to the wrapper")
+    parser.add_argument("--bytecode", action="store_true",
+                        help="Precompile meter.py so launches skip compilation (source kept as fallback)")
+    parser.add_argument("--python",
+                        help="Interpreter to precompile for with --bytecode (default: this one)")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="Only print the calibrated iteration count (run this on the target hardware)")
+    args = parser.parse_args()
+    
+    iterations = args.iterations or DEFAULT_KDF_ITERATIONS
+    if args.kdf_target_ms:
+        iterations = calibrate_iterations(args.kdf_target_ms / 1000)
+        print(f"[KDF] Calibrated to {iterations} iterations for ~{args.kdf_target_ms} ms unlock")
+    elif args.calibrate:
+        iterations = calibrate_iterations(0.5)
+        print(f"[KDF] Calibrated to {iterations} iterations for ~500 ms unlock")
+    if args.calibrate:
+        print(f"Encrypt with: python encrypt_meter.py --iterations {iterations}")
+        return
+    
+    if iterations < MIN_KDF_ITERATIONS:
+        print(f"[ERROR] At least {MIN_KDF_ITERATIONS} PBKDF2 iterations are required")
+        sys.exit(1)
+    
     print("=== Python File Encryptor ===")
     print("This tool will encrypt meter.py and create a password-protected executable")
     print()
@@ -167,11 +479,31 @@ def main():
     
     try:
         # Encrypt the file
-        encrypted_data, salt = encrypt_file(meter_path, password)
-        
-        # Create executable wrapper
         output_path = "meter_encrypted.py"
-        create_executable_wrapper(encrypted_data, salt, output_path)
+        source_path = meter_path
+        
+        if args.bytecode:
+            with open(meter_path, 'rb') as f:
+                payload = build_bytecode_payload(f.read(), args.python)
+            temp_dir = tempfile.mkdtemp()
+            source_path = os.path.join(temp_dir, "meter.payload")
+            with open(source_path, 'wb') as f:
+                f.write(payload)
+            print(f"Precompiled meter.py for {args.python or sys.executable}")
+        
+        try:
+            if args.sidecar or os.path.getsize(source_path) > EMBED_LIMIT:
+                # Large payloads are streamed to a file and never held in memory
+                payload_path = "meter_encrypted.bin"
+                salt = encrypt_file_to(source_path, payload_path, password, iterations)
+                create_executable_wrapper(b"", salt, output_path, iterations, payload_file=payload_path)
+                print(f"Encrypted payload: {payload_path} (keep it next to {output_path})")
+            else:
+                encrypted_data, salt = encrypt_file(source_path, password, iterations)
+                create_executable_wrapper(encrypted_data, salt, output_path, iterations)
+        finally:
+            if args.bytecode:
+                shutil.rmtree(temp_dir, ignore_errors=True)
         
         print(f"[SUCCESS] Encryption complete!")
         print(f"Original file: {meter_path}")
@@ -184,6 +516,7 @@ def main():
         print("- Keep the password safe and secure")
         print("- Store the encrypted file in a protected location")
         print("- The original meter.py can be backed up or deleted")
+        print("- Set METER_KEY_CACHE=<path> to cache the derived key for unattended restarts")
         
     except ImportError as e:
         print(f"[ERROR] Missing required library: {str(e)}")
@@ -13,6 +13,22 @@ import socket
 import hmac
 import hashlib
 import base64
+import argparse
+
+from reading_store import ReadingStore
+from ts_codec import BlockFileSink
+from change_detect import ExceptionReporter, parse_deadbands
+
+# Shared client modules live in ../common in the source tree and are
+# packaged next to this script in the download. Encrypted launches execute
+# this module without __file__, so fall back to the launcher's path.
+_SCRIPT_PATH = globals().get("__file__", sys.argv[0])
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(_SCRIPT_PATH)), "..", "common"))
+from resilience import Resilience, CircuitOpenError
+from pipeline import Pipeline, ticker, FileSink, stdout_sink
+from memprofile import MemoryProfiler
+from udp_transport import UdpSender, parse_target, DEFAULT_MAX_DATAGRAM
+from stream_transport import StreamSender
 
 
 # =========================
@@ -48,15 +64,14 @@ def resolve_ip(protocol):
 
     exported_ip = os.getenv("DEVICE_IP")
 
-    origin_ip = get_real_device_ip()
-
     protocol = protocol.upper()
 
     if exported_ip and protocol in ["TCP", "UDP"]:
         print(f"[IP_RESOLUTION] Using exported IP for {protocol}: {exported_ip}")
         return exported_ip
 
-    return origin_ip
+    # Only look up the public address when no exported IP is used
+    return get_real_device_ip()
 
 
 # =========================
@@ -158,6 +173,14 @@ class WebAppIntegrator:
         self.protocol = protocol
 
         self.device_ip = resolve_ip(protocol)
+
+        # Module-level requests by default; a requests.Session can be swapped
+        # in to reuse pooled connections
+        self.http = requests
+
+        # Retries, backoff and circuit breakers for every server call
+        self.resilience = Resilience()
+        self.registration_rejected = False
         
         self.jwt_token = generate_jwt_token(user_id)
         if not self.jwt_token:
@@ -166,6 +189,34 @@ class WebAppIntegrator:
         # else:
         #     print(f"[WEB_INTEGRATION] JWT token generated successfully for user: {user_id}")
 
+        # PROTOCOL=UDP sends readings as datagrams to UDP_TARGET (a
+        # tools/udp_receiver.py); registration and status stay on HTTP
+        self.udp = None
+        if protocol=="UDP":
+            udp_target=os.getenv("UDP_TARGET")
+            if udp_target:
+                self.udp=UdpSender(
+                    parse_target(udp_target),
+                    {"token":self.jwt_token,"deviceName":self.device_name,"ip":self.device_ip},
+                    max_datagram=int(os.getenv("UDP_MAX_DATAGRAM",DEFAULT_MAX_DATAGRAM)),
+                    batch=int(os.getenv("UDP_BATCH","1")),
+                    redundancy=int(os.getenv("UDP_REDUNDANCY","2"))
+                )
+                print(f"[WEB_INTEGRATION] Sending readings as UDP datagrams to {udp_target}")
+            else:
+                print("[WEB_INTEGRATION] PROTOCOL=UDP without UDP_TARGET - readings are sent over HTTP")
+
+        # PROTOCOL=TCP with STREAM_TARGET keeps one framed connection to a
+        # tools/stream_receiver.py for readings and status updates
+        self.stream = None
+        if protocol=="TCP" and os.getenv("STREAM_TARGET"):
+            self.stream=StreamSender(
+                parse_target(os.getenv("STREAM_TARGET"),default_port=5141),
+                {"token":self.jwt_token,"deviceName":self.device_name,"ip":self.device_ip},
+                window=int(os.getenv("STREAM_WINDOW","64"))
+            )
+            print(f"[WEB_INTEGRATION] Streaming readings over TCP to {os.getenv('STREAM_TARGET')}")
+
 
     # =========================
     # DEVICE REGISTRATION
@@ -178,11 +229,12 @@ class WebAppIntegrator:
 
                 "token":self.jwt_token,
                 "deviceName":self.device_name,
-                "ip":get_real_device_ip()
+                "ip":self.device_ip
 
             }
 
-            r=requests.post(
+            r=self.resilience.post(
+                self.http,
                 f"{self.base_url}/api/monitor/register",
                 json=payload,
                 timeout=10
@@ -194,6 +246,11 @@ class WebAppIntegrator:
                 return True
             else:
                 print(f"[DEVICE_REGISTER] Device registration failed with status: {r.status_code}")
+                # 4xx means the server rejected us; retrying will not help
+                self.registration_rejected = r.status_code<500 and r.status_code!=429
+
+        except CircuitOpenError as e:
+            print(f"[DEVICE_REGISTER] Server unavailable, next attempt in {e.retry_after:.0f}s")
 
         except Exception as e:
             print(f"[DEVICE_REGISTER] Registration error for device '{self.device_name}': {e}")
@@ -206,6 +263,9 @@ class WebAppIntegrator:
     # =========================
     def update_status(self,status):
 
+        if self.stream:
+            return self.stream.send_status(status)
+
         try:
 
             payload={
@@ -217,22 +277,31 @@ class WebAppIntegrator:
 
             }
 
-            requests.post(
+            r=self.resilience.post(
+                self.http,
                 f"{self.base_url}/api/monitor/status",
                 json=payload,
                 timeout=5
             )
             # print(f"[DEVICE_STATUS] Status updated to '{status}' for device '{self.device_name}'")
+            return r.status_code==200
 
         except Exception as e:
             print(f"[DEVICE_STATUS] Failed to update status to '{status}' for device '{self.device_name}': {e}")
 
+        return False
+
 
     # =========================
     # SEND METER DATA
     # =========================
     def send_meter_reading(self,meter):
 
+        if self.udp:
+            return self.send_meter_datagram(meter)
+        if self.stream:
+            return self.send_meter_frame(meter)
+
         try:
 
             payload={
@@ -254,32 +323,67 @@ class WebAppIntegrator:
 
             }
 
-            r=requests.post(
+            r=self.resilience.post(
+                self.http,
                 f"{self.base_url}/api/monitor/meter",
                 json=payload,
                 timeout=10
             )
 
             if r.status_code==200 and r.json().get("success"):
-                timestamp = time.strftime("%H:%M:%S")
-                print(f"Voltage: {meter['voltage_v']}V | Current: {meter['current_a']}A | Power: {meter['active_power_kw']}kW")
-                print(f"PF: {meter['power_factor']} | Frequency: {meter['frequency_hz']}Hz | Energy: {meter['cumulative_kwh']}kWh")
-                print(f"IP : {self.device_ip}")
+                self.print_reading(meter)
                 return True
             else:
                 print(f"[METER_TRANSMISSION] Failed to send data - Status: {r.status_code}")
 
+        except CircuitOpenError as e:
+            print(f"[METER_TRANSMISSION] Server unavailable, skipping until next probe in {e.retry_after:.0f}s")
+
         except Exception as e:
             print(f"[METER_TRANSMISSION] Transmission error: {e}")
 
         return False
 
 
+    # Fire-and-forget: True means the datagram left, not that it arrived
+    def send_meter_datagram(self,meter):
+
+        if self.udp.send(meter):
+            self.print_reading(meter)
+            return True
+        return False
+
+
+    # Queued frames survive reconnects; False only means the stream is down right now
+    def send_meter_frame(self,meter):
+
+        if self.stream.send_reading(meter):
+            self.print_reading(meter)
+            return True
+        print(f"[METER_TRANSMISSION] Stream unavailable - {self.stream.pending()} readings waiting to be sent")
+        return False
+
+
+    def print_reading(self,meter):
+
+        print(f"Voltage: {meter['voltage_v']}V | Current: {meter['current_a']}A | Power: {meter['active_power_kw']}kW")
+        print(f"PF: {meter['power_factor']} | Frequency: {meter['frequency_hz']}Hz | Energy: {meter['cumulative_kwh']}kWh")
+        print(f"IP : {self.device_ip}")
+
+
 # =========================
 # MAIN PROGRAM
 # =========================
 def main():
 
+    # Settings come from the environment; the only flags are diagnostics
+    parser=argparse.ArgumentParser(description="Smart meter telemetry")
+    parser.add_argument("--profile-memory",nargs="?",const="meter-memory.log",metavar="REPORT",
+                        default=os.getenv("PROFILE_MEMORY"),
+                        help="Trace allocations and append growth reports to REPORT (or set PROFILE_MEMORY)")
+    parser.add_argument("--profile-interval",type=float,default=float(os.getenv("PROFILE_MEMORY_INTERVAL","300")))
+    args,_=parser.parse_known_args()
+
     WEB_APP_URL=os.getenv("WEB_APP_URL","http://localhost:3000")
 
     USER_ID=os.getenv(
@@ -297,6 +401,32 @@ def main():
             print(f"[DEVICE_SETUP] Using default device name: {DEVICE_NAME}")
 
     PROTOCOL=os.getenv("PROTOCOL","TCP")
+
+    # Where readings go: "http" (the web app), "stdout", "file:<path>" for
+    # JSON lines or "blocks:<path>" for a ts_codec compressed spool; all but
+    # http run offline without registering
+    TELEMETRY_SINK=os.getenv("TELEMETRY_SINK","http")
+    if TELEMETRY_SINK not in ("http","stdout") and not TELEMETRY_SINK.startswith(("file:","blocks:")):
+        print(f"[SYSTEM] Unknown TELEMETRY_SINK '{TELEMETRY_SINK}' - use http, stdout, file:<path> or blocks:<path>")
+        sys.exit(1)
+
+    # Optional local history of every generated reading
+    READING_STORE_DIR=os.getenv("READING_STORE_DIR")
+    store=ReadingStore(READING_STORE_DIR) if READING_STORE_DIR else None
+
+    # REPORT_MODE=exception only transmits readings that leave their
+    # deadbands, trip a power-quality check or are due for a heartbeat
+    REPORT_MODE=os.getenv("REPORT_MODE","interval").lower()
+    reporter=None
+    if REPORT_MODE=="exception":
+        try:
+            deadbands=parse_deadbands(os.getenv("RBE_DEADBANDS"))
+            heartbeat=int(os.getenv("RBE_HEARTBEAT","900"))
+        except ValueError as e:
+            print(f"[SYSTEM] Invalid report-by-exception settings (RBE_DEADBANDS/RBE_HEARTBEAT): {e}")
+            sys.exit(1)
+        reporter=ExceptionReporter(deadbands=deadbands,heartbeat=heartbeat)
+        print(f"[RBE] Report-by-exception enabled - deadbands: {reporter.deadbands}, heartbeat: {reporter.heartbeat}s")
     
     web=WebAppIntegrator(
         WEB_APP_URL,
@@ -307,39 +437,95 @@ def main():
 
     meter=MeterDataGenerator()
 
-    if not web.register_device():
-        print("[SYSTEM] Failed to register device - exiting")
-        sys.exit(1)
-
-    web.update_status("online")
-    # print("[SYSTEM] Device is now online and ready to transmit data")
+    if TELEMETRY_SINK=="http":
+        # Keep trying while the server is unreachable, with jittered backoff so a
+        # fleet restarting together does not reconnect in lockstep
+        attempt=0
+        while not web.register_device():
+            if web.registration_rejected:
+                print("[SYSTEM] Failed to register device - exiting")
+                sys.exit(1)
+            delay=web.resilience.reconnect_delay(attempt,"/api/monitor/register")
+            attempt+=1
+            print(f"[SYSTEM] Server unavailable - retrying registration in {delay:.0f}s")
+            time.sleep(delay)
+
+        web.update_status("online")
+        # print("[SYSTEM] Device is now online and ready to transmit data")
+        sink=web.send_meter_reading
+    elif TELEMETRY_SINK=="stdout":
+        sink=stdout_sink
+    elif TELEMETRY_SINK.startswith("blocks:"):
+        sink=BlockFileSink(TELEMETRY_SINK[len("blocks:"):],int(os.getenv("SPOOL_BLOCK_READINGS","64")))
+    else:
+        sink=FileSink(TELEMETRY_SINK[len("file:"):])
 
     cycle=0
     # print("[SYSTEM] Starting data transmission cycles (35-second intervals)")
 
-    while True:
-        try:
-            cycle+=1
-            print(f"\n === Starting Transmission #{cycle} ===")
-
-            data=meter.generate_reading()
-            print(f"Generated new meter reading at {data['timestamp']}")
+    def generate(tick):
+        nonlocal cycle
+        cycle=tick
+        print(f"\n === Starting Transmission #{cycle} ===")
+
+        data=meter.generate_reading()
+        print(f"Generated new meter reading at {data['timestamp']}")
+        return data
+
+    def report_by_exception(data):
+        transmit,reasons,events=reporter.evaluate(data)
+        for event in events:
+            print(f"[RBE] Anomaly: {event}")
+        if not transmit:
+            print(f"[RBE] Within deadbands - suppressed ({reporter.suppression_ratio:.0%} suppressed so far)")
+        return transmit
+
+    def deliver(data):
+        sent=sink(data)
+        # A failed send must not become the RBE baseline, or the change is never reported
+        if reporter and sent is not False:
+            reporter.commit(data)
+        return sent
+
+    def on_error(stage,item,e):
+        print(f"[SYSTEM] Unexpected error in cycle #{cycle}: {e}")
+        print("[SYSTEM] Continuing with next cycle...")
+
+    # One reading per 35-second tick: generate -> store -> RBE -> sink
+    pipeline=Pipeline(on_error=on_error).source("ticker",ticker(35)).map("generate",generate)
+    if store:
+        pipeline.tap("store",store.append)
+    if reporter:
+        pipeline.filter("rbe",report_by_exception)
+    pipeline.sink(TELEMETRY_SINK.split(":")[0],deliver)
+
+    profiler=None
+    if args.profile_memory:
+        profiler=MemoryProfiler(args.profile_memory,args.profile_interval,label="meter").start()
+        print(f"[SYSTEM] Memory profiling every {args.profile_interval:g}s -> {args.profile_memory}")
 
-            web.send_meter_reading(data)
-
-            time.sleep(35)
-
-        except KeyboardInterrupt:
-            print("\n[SYSTEM] Shutdown signal received")
+    try:
+        pipeline.run()
+    except KeyboardInterrupt:
+        print("\n[SYSTEM] Shutdown signal received")
+        if TELEMETRY_SINK=="http":
+            if web.udp:
+                web.udp.close()
+                print(f"[SYSTEM] UDP transport: {web.udp.stats()}")
             web.update_status("offline")
+            if web.stream:
+                web.stream.close()
+                print(f"[SYSTEM] TCP stream: {web.stream.stats()}")
             print("[SYSTEM] Device status set to offline")
-            print("[SYSTEM] Smart Meter Telemetry System stopped")
-            break
-
-        except Exception as e:
-            print(f"[SYSTEM] Unexpected error in cycle #{cycle}: {e}")
-            print("[SYSTEM] Continuing with next cycle...")
-            time.sleep(35)
+        elif isinstance(sink,(FileSink,BlockFileSink)):
+            sink.close()
+        if store:
+            store.close()
+        print(pipeline.report())
+        print("[SYSTEM] Smart Meter Telemetry System stopped")
+    finally:
+        if profiler:
+            profiler.stop()
 
 
 if __name__=="__main__":
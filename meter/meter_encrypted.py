@@ -9,6 +9,8 @@ import sys
 import tempfile
 import shutil
 import base64
+import importlib.abc
+import importlib.util
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -17,60 +19,154 @@ import subprocess
 # Embedded encrypted data
 ENCRYPTED_DATA = base64.b64decode("Z0FBQUFBQnByWEhkZW9SdXRDdkp0Zkp3RmZLbk4tRHQtOGFiUGtLTWRxN2dDWkR6YVVSWVFXVjR3eGdGc0NPbG9zNXQ0bk1wNGhZX3ExT0E5ZUpCSmcyNURkalhxV2c3SHZzTjhuTHlCRzFHU0xJVXQ2eV8zcjI3TGRJS2hyM3NPTGFaU09CNVpLM1BSTXh4SFhaZmxTeVZ6aHZFTGE4ZzhPdWVZaGw3TUtIMEtlSkhtdlhtQk90OHhtblIyemc2RnFDN0RLTnZ6YnhhdTF5MUhJMFFvQU9LMWpzR2hoaEdVZFNZMEkzZDI2a3JPS1Y2bzNPWFBhLVBONXBhVzlXblRZMHowWFZNSW5fZzh1anVJSTVVdUhhT3k2Y3BlOTcyemwwZWpXT05VUzJpVlQ0NklrTFQzejJOVXFVYURBVWtFWk5nRWxQQzR3ZWVMUVptZnJyY1F6NEx5dnhtLWZrSEN0MzI1eGplcUZKbUJkX3ZERE5XMktHRU9heFNiMk1wdVB0WmN2NkFEQ01DNHVtOWJ1YkxCYUQwRDVuUS1sM3djbHRVeS1kWjV0OFJJcGZ2a1VSVzdzdWl5Z3RPa2VzOXk5akxHM19VRmdxdHBmZW9UWTZzeXU5Zy16NWlMNzEyZ09mbUM1Y3lsY2hRNUxaUWJTdnFPQ2UzdFhkM1lncVY1clE2amh3Qy1OTk5JR3I1X1RFN2pEQjRBUjd5anRRQTRZU0RKSDRqWXBUOUYtT2FIR1d5cWlFRHU1cGxsVmJRLVdQYlZSUVF0RkZ0QV9ZQk40anR1aUgwMFZsWmFwcy1CeU5ZNnZ0dFhiaFhxSWZxNC1MWDY3aVUwYlktMVJ0eS1kWnJHNFF3ZFlMNjUxMlNWVk9GTUVNZzk1c2tpMmRLc3NSYkpleDlKZkJMVmtHLW1lWTZHeUd3Ny02bGJHVmVjTmpyOU9fWUVld3Q0c3dNSF95MzZYdjdiSmNCNUhubUlyZndTMkVTT3VRSEJMVGlKdW5rV05uTHprejdXNHR6SjAzREUwYTFTTlVvMVY4Q2F4ZGxQMTVoN0N2NUZQYy1SZlhIU0JULWF4UkI0S25lVUtnR296RWg2QzVWMW9hTEtMbjh5cHhiX2RHZWxlZE1USXc0a1ptTFUtV3QxT1pTUDdOVUVPOEpkeHdsMGlNSFRlbGt2bFRKRzZMVDlZN3lhbWhIQTNTbXFPeFlSS2ptNXctc1JpRVJacnoxaFpvMU5HUlJRZUFLOFpVQTAxeGtORGlsMjZfajg1a08xLTBxcnc1ZE5iSWp0N1ZsMVZPazlBZThLU2dqNEYtNnFKYVRYV0JsMm9oMGRQZUJic1pERUx5SWgzQlRhYjlfQ0RicjYtQzRhZ1JsTWZNaDd0cEhIM1dwN0htZk1IR3hIVDZzRHJrWlUweWI4bUZTQkhYRnplVFIxZE5vNnlxcHphZXU2RUJ5N0dWWEdlbFpZeFFDU0lLZ1VjSTlVaUQyS1RLcnRtX2xvTlpRajJwZGE4QUp2Y2VxU29reTJHZkRScFhlVk53MHo0Y1VoZjFQQjZxazZSU0dKTDNxeHQ0ZEVJaVBtOHV6dkNrVDdEbmdnS3plUFEzc2VHTVFNcE5YM3FLMTU0OXJfUE9KWi1aVEdxZ0Zpc3Uyd1Y5Q1hGc1dONlVVdGhKY3NOYmpLVGtuN2RUbDgtVThRUnFYWVJWYVpoS3NqaldyZkQydGpYQzFPVHFzNWItQVZEN2lqbkZoWDhURmd2WExQTDk0NjhaR09MckYydW4zYk1tUEhuZWZNLVQyeC0wd0FhV1g5OU5yc1ItTDl4TE9QRWZ3eTFSaS1uNEh4OC1PZWZTNWFPb3R5aFBoM29BZ2ZjbVZBOEZONThxd2hEU2x0S1ZKZC1OVW1qQ2NKcnVUeHJ4S2V5aVBuMFllR3k1djJVaXNJeVNaYUxsRFNvaU93cVlydDNrRXktRUZjU19vdVdPTVZrc21ieDM4cTZaUGJ2bFRVNURUeWdaYW1JTEp0SUZtR2kyZkcxaDNyNTQwRGIxaVU0YWF4eWVmUU5hTGs2V2t6U2FZOFM1VnVjXzBKeWJ6UWViQmVXVllzNGpCZ2VLN3FQSGhuYjV6SVB2S1N5THFUdU9ZeDJ5SVh4akR1bkk3SkphZE5YX2h4Rk5ySUpJTEFRWDktbC1DR3AzTTFTZmVwS0JJRGxYcHpsTEVfUXJ6Wm40N2Q0ZENVWndSdTRxM2JkaGZzMXYtYWstOVpUdEVrSGlRbjRIa1RuMUxGMHYzN0x5Mld1aDM0aU1SWDhRQ09hZ0hNaFNEbFpzWmMwbDZzSEQ0a0M0U1dkOFNhN2FpZ0IwaUFjNlRCTkhBQ3JJbjFaRWJid1VncTZXc3NPajJrby1TOWxFQmlyVkUwek5Wd3d4RTM3MF9CRUVKTnlpUDZmLWNnYWVlVEZBQV9JT19qTHRhcnBGb0RpSHNDc2dTZGQtVU9kWnV5dmZkR21OeExxa29NbEMzYWVXcmF2NUdrM3pfcDI2emFiaXl5ZlRoQTFqN2VaQWxIamlteE5BcWloNWlUS05qLXJwaWY5ODhBQ1FYWlBkOHZfMnVfdjJOU29aMDRIc2tRczdfejJ6cXdWVkI1UFR5NW5hbjNUNy1iX0xYdk5DSzVwLWNLUy15SWhZWXVSQ3RtbjlyME5MdFVXWFQzaVpmTmhQal80YnZnRmJ4Z041c29GbVpYTXgzblNoQkFMd0tHamdQNWdQOVVFS2dVeFk0d3Q5T0cyY1hWdjhTNTQ2dDNSVXBJYkhpSk1YazF1TC1OX0NiOWo3Y1FPMTdvZWRGSzZpczE4ZWVHWXRrYWZzYzU3NDBzcUtyX2xwSkMwS1NkRXlQQmxoWWVlSVBUSkUxNS1kV1RYQUxBRkhXTlI1OXNDMmozNE1Wc1htTmJkSXVNY0ZsRXhsczgyekJFSXM3Z0wxXy11OFdWMm9FaUhZdTl5Y1YxcGl3Wkt4bXU0aFAwdGJQU1hmaGRHVFV3RlBaV3ZzaTBaZHI5SUFZOEMtSE15dlBvTTJVR1FiQzN1RXg2MDhTTW9KYk5scWF5ekthR2RvazR0S2VJaG1FSmFzS1Axd2dwdVVuTTg3bjVOZWREY3J0YXlQOTlFcC13WW1ZdmIzSnZaYkUwSW9tdjN5NUdmX0hCcTk4d0R4WDl6ZmpWNGJoVF9NUU5vcWtUZV9kUWVjMVh0ejR5LS1rOWtGN1MtUjJSc0hydkVHUDQ3T05sYWFxVXJKT25XNl9ZWTcydWVHOFlONHV0WlhMeVBBVXJCWWJvR2FpcHZGYlhvYmRqakoyN3h5WjNpemVUNTdJMi1XX3JaZUFLS2R0MDJMMlB2TEM2dDhhWDItTGEzZFMtWlhibjNEQ2tPcC1aRnUzd09oblhGQnYwbTNVMzQ5VDJuVVg5WnBYQnNzVkhPTzhFYXBzbVMwY25Qd3pzS0VzeHd2bmJjaTNpMWRzNThfLU9lM3UxY2stNDhmQkZ2MWFzN1BrRHZHbzdXTExhNW9oUktaRFhJU0ZkSkRBN2Z4ZDgzWlduTlpsQ09KZUpUSGt0UE5memNLUm1PZC1TYVZXUGVMNk5NeTNVVE9yNTA1dFRyR2hTYURCQVRuOTIzX2UtLWkwdjFKOFVsS0FLc2swR3A0U0xyUXZPRU9Ud2tiWEJ0bWg3c3dnbjlXQUk3SC1lTzZzcjN6LXpHLVd5MUMxZHhvaHRMcU1EQjhZZUlGcXA2V3dSNnptTzhvUTBIcmZwYlcwS0xRV29qWnNqTkN0T2d5QWwzMHZHUkhvdV9SeTluMExPV0hpeFpMaWhGRExEeXVSODU2RDhEajBlajNKVmFadGJ3VlBQN3UtdWxSUlRuaWhxRURCTkloXzduS3RRcjBTTDI3ZVN3NDJtbWFObGlCRXVOR2tMbWFJdUlVN0ZpSFJucy1iRXd0ZWdXT25Jb1JGZUtGdmpjaDNOcDVoeWhkd1dRcWlhRElmblduM20xVFpKNE1GcGdYaGFadGdTWlNvZWJmWDZjWDY1RFNpUzVLZDU5ZkRBa2J5bFhiQmtYQlNqVnhFMzlTdm1LV3VFNUFiOVY2R1daVXRNY1ljbnNLWVhiZ0hSeVVmQTd6eHlYSndad3pjSFVfVm5wdHdMS0dvSFRQRXR5QVVRM1B5THVmRTNWTHd3SnMtQndpQzAwRUJ4QnF6Z1YzaE03SERPd212eVBuRDQ1TzFHMXRieUJXYWdaN2UtTWxFeXF5Y3A0bHpjZVNuSHRmSTR3aWlqLUZFc2NqN1NZbkdyUkxzR1g0Um9jbU9EMzlrZkJmdG1xTV9seW5ObkhkSWhEcThfQS05WHlTSHFqTEFsZzhOaFZsdVpkdF9SYmdBUEtLMU9qbGlUYjdvSXI5cERxMTRhVjNKSWFUQU5wdWdfYW92Y3BXcENLdzVnamtBNVZENWVGM1BMcU5FZlozM29KMnZkaFprZVItVnFzYmFHSGpkZHd4dlVnN0JQaVhNd083aVB6bkZJb0dFSTljRGZUb2daUUFrUGszWGc2NVNzYWdndElsUlRsSDRWTlRVTmJTSDJkbWxua2dmYTNJUW92WWd5X2xvSkpqYUZQTVF4dnhYWlFjay1rY21vakg3MUFsUmY1Rlk5M2hCak9LY2djLXZQMlRPR0NPMlFfZzREckJSemJDNDFmaklQVTlVMFl4U3RrNmVRSHVFWGMzQ2ZmLUJBb2dCVmlxODJsQ3RCdWRucFZwcVRyZXk5TFNuOHBxZ1BNQlFiZGFXV0JiR2JmalRCRDZ1dmNUbkJ4bnMzZlltNUowbHlXc3laSmZJZjlvV0NyVGQzMzlubWwzOHFsSERNbDlZcmFYNTZBa050dDFNMnlSMTNZX01yWWNScXdFbzgyVTIxX0lrVTJ0cWJhTG91WnFPdXVyZ2xqU1FCR2tWTjd2N3JGWTlNVXYxYUtUWEEzOE9Lc0tLUWVKSzBudmFFb1hOOHpPWmZIQV90aHZRYl9sMWM0M0ZkRlMxQUVjU3FEWFlYUkFtVk5vSW85WlVwWndMeWhUaFdiUGdhSDRQQ1cxNVlsNDlXX3A1Ty1oN3YtNzdUTTlDMmtXeGJRQW5HVUZEb24yQWhMVk9XNlJncW9TZ2NXT1VEYUpjQ2syeEdSOG1yaFFPQmFuY24xQzFYYzgxNUVCLW5uRVBQcmhmMllRMXBiSnU1cU11OUt2cG9sM3AwZXRJU1ZaUGNPUzBmU3ZTd1k1UlM1bkNnUV9VeUc4N0F0UkNKU0Q1ZkF3cTBDU2tpc3M5blBEamFhaVlLeEdtYUF2a2xSSHZGQUhLdG5pQ0hFYm1FM29yOUpTS0I5MmJNOGJiX2RSREp1WVFIS2gyNHNkY2FDX0o0M3BOSTVRUFpmeDNxTEV2M2U5WnF3TVFiaktmVEcyamRCbTg0dGhQVGpEQk1SdUtLNi1wNVd1T3c5N2l3Yk11U0dWRy1JU185VVhLWmlhenhTc0hNSmRYSHdoS0lrY0YteURrYmdTTldrSmwzZEJMeXdfWVo0czZCRlA0NGhMYU1wV2paTTVBN0RaZmN2emJyZUcwS05WclFmeDlWM0lmbUdPYXhlcGJUQTlpY1ZQbURWa0xSLWFjcWtuQmZpdHVxSlhLekxtT3luemZfcVUtNkpJVUQ0X3ZtNjRUTU1wdVgwS3VsYTFIUUlOWHFjQ0w1a2dZZDNLUC1Udndhcm9BQUppUlFYQW1oZ3J2YWtQcHhyZDdVUF96WmdjdnlKR0t0bGZUN2tNNWlhX1dzbU45YTFIZFM5RnNzTHNISXN1TUdicjNMM0JxSFk4N3pfMVRGTW5yRm02eXF6ZWNUaDZfMThKdmNEQVhHTFJaeU9MaTE4TWhaVTd2UUFwQ2xhdUYxS2RRVlA3VzlVay1TaF9IRHpIX2FTQjd5N1lHOEliaDlpZHplQ3RrZ2ltcDYxNTZMQVdsLXp5SXZYVS01aTdHZ2tucmpRLWwxdTJOZENOUklqeG1XYWlxRkdKOWUyRVlqb1BGSHZtQVVka2RCQ0VXT1RoX0hQTjRHazlCLWhuSDFRLVVZUkxDeE53YkZ4NkVhODZWX2ZYSS0xemRubjQ3YmJHZmo2Q08zc0czSm1kUEJJRFExTHprcVpocnJxUVFYZ2pFbUpzSXI3cUFwZ1BhY1VIS0ZWM1Z1d1FkVzBoQXk1blN1YTY3ZENoN2pEWmxMTmNnM0hKN3dCODNGZ09ScC1ZMTlYSVYtU0wySU5UbzR2QXE4aFNLOUhQRkxSVmN5Zm96QTRmR3g3WTV6V2doamZhRTVXT0lCb0ZKUHd5R0NzM1F3ZXZGUkVRa21mZVZPNl92VzhUSWRub2ZsTVhEUHhmVUsya1RjbXotMjVxMFpqcFZPTXdDUVVuVGFUekV1VjVTZjNsNHhRQ29BRW1HT1R0NHRsUlMwLURxMmFHMjYyc0xXMkV1dXQ4czdIUjl1LW9sT21lLUlpcGFfblY3XzNRSGxwTUZrX3VfSkg4UUw2ZHZKRHZYVDRNSGFyNVNyM1RwNkhBWTdLOFphUXdpcTBwcTRDOTRMSDVzS1pFaWtQSjR0VUN4YmlkclZCa2VJU1g1NlpqclE5eGVrOW1QM2t6a2oxZnE4VlFNNlFuczcxbUZYSHI2eW9YY2I0aERpV3BiYW9iV21oTDQ3T0dZNGZyeUlXcW91Qy00al9wZWE4VDhodUNHR1ZhMjNiUDF4dEZ1RDNQbGRlbUtYdHlJRHdRakt1NWtUbzBRcjVhYkRRVDF6NzFYWTBILTRuZ3pKMlI1TnJXRE11NVlGMkUyUDFsZzc4SUV6Q2JrRldFLXB1dTZ3V1RNU3hUQVFQanJGYkItU29hYmp3dk1rLU1fM1NBQWxJRk1ES2lsMmtFWk1IT2lOdF9qR2QyZVRzRzlFbWQxUWFmaGNKeHMtY0xiRDkwRFctMjJYSmlNdHlZQXJxRW5FbF9UeXo3NHFmTGRLMVlNNl94NjdHdnpDQUpvQVB2dUtHQ3ByTmFURE0tUlN4S3N1SHhWaURFei1EWUxtQVRYOU9xODdiZF9ESEstNTlMaEhMcDBxZ3lKWjRyQTh2NHp0a0NkWUhvNjZzZGY3dmkwNXh4NDhQVTlpLUR6d2FWMWc2bHJTcE1vcUNzU1dKRExqVjh1TzlHQkxteE56cDlDcUtCYTRyS1dBQTlua244R1d3b1RqS3BDM2hnU3hScTNDTEtKWVpwSUNZU09SMlNDWm84ZXNoOVlPbHhKZnp1bXU1MVJPTnpKb3NnY1ZSTmM4MlU5bi1iQ3Y0YU10Y0x2Y0RfUkFyNmlvWmlJQXpZOHlnRncwMmp4R3N6M29WZzdOME9FbVQ2YlVNeGFpWnIwMXpOZUtiNmMxREpOWTk3RXZuZ0NZTnhTR2pfUWtiQlRhbmhpeThXQzhRUzcwWWM2X1o4YTgwU2lubHhxRlFSS0ZpRmV1Q08tVTJQMFNvZXMyQXg0T2ltdXVZX1llV2J6eWFPUk1pMzg2Y3JVUDl1SGRDal8wZmR3SXc1ek1JQWlkVWVVczlSMW5zb0Z4QjNtTm9hZms2dVJ6OVlkMk44TkU4QzcyWUVDOFNsLTg2ZnEyWlBSUGstQURWbFItRThtVHBva0ZYakExQWw0SzZycDI3bU5adThkTllYQ01XLUFDN1lneVRRRTZQVmdkbmhEUGhLWGwycDlYai1oU2ljMUtONU1YbkpRWVV1Z1hFT0toV1pqa29sMTV4NUZnUXVqSUs3NE1UcWFJZzIxUTB0Nk5sdkl6OXBydG5wdUtLU0FXRkNaaldoVVlxUkZsdEdJRW1ndUpDZjAzTnlVV25hR0lHTnJXQjVaaTBvRVhXMXFXMTUzdW51OVV3Sm1MMkREeDhFRVByVFBHSUt5RDlMd0VQeTQ2VmVlajJOVi00ek10NzBINFplTEZVbHVZemVYQlZZTFpDeWg2QlhZVnNPa0ppVWpHVmd6SHJhbjVfdjBJMFptUk9BU1JUOUs2VHg3MVFTdFRvYXNMN3FjSUZPZmo2ZktpRzZhUnZra1FENWpocE9QU1pQNDA1MFpKcEpNWFN3S1RxN01pd2VZMHdTSnMzZ3d4R2dXbTNVb2J1R1V3SWZUeHhnXzVGQWtyQm9CcXR6VThFVmRxMHpDMHFfRmRxUnM1Mi1wWEg4QVhlNGVFaGI4UXUxT2Fzc3dNallyT2NiSWJhcHZZd3pzS2xqTkowRTlDNTFCRTBXX1k1ZmhzMmdCQnlUWVFoLW5yMG0za3lud2gzYU12YXZGT19lWjVYaEljYzJEdEtLZHpTSU5CSjFzdlE1UjBtb1lNUE1UN3N3QlFJT2o2c3JiTzVHQ3ptVjNIR1pzM2s5dExYN215NURYSjVwZVZKN29vb01NN09laEhwQTZUd2RmZjIyTDJsTjVCdzhabFJJTWVEUDl4d3U3SDJZQWJJQ1JhZWRWRjFNRUtRU2diSnQ1VE5qOVBVcjNGUnFIQUxYTFUta3ByU0MxRFUtOURYR3UtYVhJR1JLbmFmWXBfXzVrUlFjbFNTUkpCdjFITE11R2JCRVNKNlVWTmkxWWNTdWpSSjA2OEh0QzhxYUd1aThlTmNROHRjdzIzT3ZrRkVIQ0Z1QUZsSm5rN0s0dzctdE9fcFZtV0hGRUZoVHlIeWVHbjBmVkZFSmVpNXYxS1h0UHZDMmhBcVBpaHlhLWdqTExLc1J5VXNSazIxczZuWEo1eXZZb3pBcmZ1U2x5Zzhqa1VyUlNuc0k1ZnBRZ2d1YzhPSEwzN1ZUcTlNMVNwYUJjcjUyVUJNblIxbTcwTThXUTZsd1hkb2FRZlU2b2VEZ2ZnTTFKZnVzVGl5UFQxaGhxTk50UzI0TmNfTlAxbHMyNEwtUGY1SFhlLVdxcEVxRDJCWVhJOVprTW5KZ29BZkNFM2lzdGdLM0tSNGdCakxTZjU0MmtFTjJrOHRGNTlZRUlFTWk3VTV6UVlEYkU5WDhNNmhKTDVsemtodUx6V0ctemp2Tk9mdEdQMFRuZmZEdFFWWHlrSV9XcG9hUDRXMzVlWDh5elZ1TnNaTXFPYUNORkxFUUYwakNWZENZWHRabXJrUy1lcHFPcjBNMGlfUWhxeXQwWkw2d1llSUZhSDBZSlUzdGxSVVVQRDdXenpKRWJGQnlPYm5hbHQ2aUw0WDA5dGY4NVJ1V3FHZ3dSTEhka281NnF5RE1JZmstM2hQMVdWMkIxamN3SFJGREpCNVZvZkE2T193SWJNTUM5aUdaS2xmc3pIVUl1VXM0bEdMSERGZllQX3pfcTh4cXZ5Wk5LakkxbDhnelJvRTRJaUFibE5sRmhlNlh1WkQ1T1V4MTlUbjF0aGFtSktVTHBtQ2ctNzZhYmEyRDk5cE1VTXNpVGZMcTJjMEJMdmliTDVxVXlLM3VOMmFXNE5ZcFhNODByTlcxT2RYYmRGejBiUFc2NjkxWTVXRU1rRTZVbENvandiOGxZbE5TQ3N0QlNkZG5ib2JTOGRGU0ZZbUFUQ2NuOUFkMkhEMi1qNm5LQXowdjZuOUduY1ZuM0NIMXNnMlJQT3VkcVZSb0J5Z2Q5ZVd3Q3VmbmNPWDNlbTdsbS1TQVVnbWw2NDIyNUpNSVIwWTBZdUdVejlPMzN6amkzcm9DX1UwbzJrOWs0SGV5S0dIemNpZlNmZVJtaHNpZWVKUjYybzIxMVV5aVJMQTJCRUY5TFBubkpkMU1abXcyeWtFN3BORjVaakNNVDJSTHEzTXVaeUllczJBRUVDa1RjTmxMSHlPbHpfazJDV3FDUHRKOUNtMVJOMGEwMnE2M3Z4MTR3WndzeFBiSkJBYkVlR3hkU21wV3BUY1c3b2tPNUpKbFFfaVhJSGVNQ0tSY2F5TnYyU3ZyeExxZThaM2JkTmJaSXBZRDlTaUpIQlRkbWEzcUFZYkJHdzk2QWhZTGFrTVlqbkZlbThxVjlMVXRwYlA4TGZMR0ZVUmtIWmN4SVpudHFBYlVPZTB4SzMwOU1ocmROZ21CbWgwaDF6X215OElHeFRvamFrQV9LWGVXUVZfZ09GZXlqV1czZ3dRZUdmRFBWMmhPTlFVUXdvYkVEQ0dYSDcxQjh6M0FhR1g5cG1pVW5xRTk1Q09wdFJHRGdyei1JV2NOM1RoOF9wVXdVMXFfMjhNQk93VWV1YkRkS21VM1NFcWJ6THVxZ3NTS3loYUxieGo2cEJzRWtlSmdTZzhub3p0bFBaekdRNHBhMWEtNDh5cFQxQ3BTLVFQYlRZUWgwTnl4cnpuWnVVeC00elBMaXlMcl90eVJhQ2JMZkc0UW9ZN0tWSTFud25sMVp2ZlJ5TF9EeC1VZWtRRHhOa01KMm1ETnMxcW1kbHRkSmtYcXpja3FuTGVQQWhtU3FBbm90enBlaFRNWjkzUjZNcjZjelNJUUhMbWpUQ09KSkp4WjlvN1J6MTRzbjZYczF2OS1ZbmFsMVRIVjRtS1lYNEZZYzZGMkRqakl0b2ZSRmMtMjYtMmdZbW90M3BZT3R6VGdBcEV1N01wbGE2U0ZXX3BOYl9WTHdwTi14RTM0dWxOdEw3ZzJFNTlhZ0l0MjlOczdCdzhEVkhXU1JkMC1jNTBZZEQ4dUpKRy03eFppaXBOVVdrbFhCaXVoS1BLY1B0YnNzeXNsdXF6YklNQnBaZGF1SnBYQ0l1QkZhU19NTnZpXzVEaVJWMVI3QlpBQ3ZMTXYzdUVidkhRSGZHYmFrd1dmOFJpaFkzSmpFR282WWFNMVhRWXQzdWp6b1dFRG9fVENBcS1aSmpmTFBuY0ctV1RVMVpJNHd4cV81YnEwZ1ZtdnNOR0JtSDdXUk41ODA3dW96U2VKRm9mdFg3VW14YlhYV09yTUVseUtPLS15cHFuTmxkclRIT1VYbkFDbmxxYUItNkFLYnZDVU1XWS1mNFhSbGpTbmZtOVZJdUFRY1Vxa25rSjlmRVN1TFdVYzRBSnNTU3BDNXdGWTZWQ3dWZVhfX3pvNkxhREdGaGRnWkVmdGZhM1daQ1dyTWdwZENpN2ZGeXZKM3plT0dMMF9pWTFDcW9zY09iQzdPWV9LSUxRQ0lCSkhFQXRUQmcxTXI4SjF2NFpzV2RzbGMyczE3ZGlVTHg0dXF4ZFFiYndEcnpkY29rcnl3VGs4NnNmU3ZDZVVrQ21pUnFzRVpZallQVkNDNXJCQ3VKSGZfbVlFZ3gtMU5mV2JFNnE4WkNqQXpodDJBLWhzb04zWUFNY3FpUUNMc3BzUHdBVkZvWHJwemIzdENSUGRiY1ZEYTVVV0R6MGhiSU9pMnE3ZDJweTl0cEVGUVFPOTNtTS1HYnMweU1KbTJKeFZ2RE5pdUt4UE5VSERqaFZ1eHdXSDJOVzg0aENDUjF4bVpPSkdfUlNLaXJuM01UUi1uZHRiUUM5SzdzLXVPRjZoeEc1SVBpOWt2SHlsMU80dVJNVnpnblVxWkthOW1HcExwVXRpQ2MteVZrUnJRWkdsMVVBX0xoSjRmMlQ1alBMd3h3LWptTUItQUJSTnZZS2E3VE0taktMWWoxTWtKQS1ubV9zSUxlS3ctdUNsN2FqcWh6cEM4bnBaZk1uaUNRM1BOQXZGX3JCRV9wOGIwNFhfTlRCLWktcHY1SFVZbGd5RG9BSVloNzhZUXdFTWVtMm94QVNycXAtWkF1NGpwSTRxVVFxbjFuOHlCbjFRbWZHN09CdmV0QTZQbm1NQnRLZkVPbnF0MjdQVTJZdkJIUk9rYjVzdFF5YTZGWV9mbmtxSlpnN2hybE9DekZkN1ZCZEJSNlRzUFg2cDliRG9CNTZLUDd3UkxDd0RjTC1qY0d1OUJlOUNGQmVULS05M3FmVGZlUmViQUx3c2gzb2g0Y2gyV3ZUdWFjbnhGV1hHc01vc0h1a3lPLWtUOGpQSDk1ajhLNkFCeXVPVkJ5R2VhQ2F2SUFOZHZMOWhtS0xVaUFHb09wZ0diclJ5ZjF1UDJKcVEyeS1hOHBSTXdNNHdxQ2pCcFdMaHFjdlNlVUxHZTA5bGtwbGpINlM5OWVsVXVGWS1Fa3B2WjJEMkY0UVJPei0wdmd2NFBZMXI1dlVRNElZRVktTkI2VlpMTjFoRGVXSFpPYVVlTUQ3VnlITmFZSVp4eHcxbVZ5TGtmbHZjQXF0czNFZ3VXQ0NSN180WTFzU3BSQm1JNGpjU1otbTZ2Y1VmNU1reldBelMzUWQ1WUtGN0NFZnFkajBqYUhLT0R5OC11M0Yzd3lBWGd4dUl4T0l2aDQ0SGtpa3R5OGlZZ25TV0E5THo0dFhXMXRJS21tVi03Slo5M2pWUGhNUk93REpfSFlOcFdEM1cyQktDQmFFUnVkOW81dmxoS0JvWndqTlhCUW1TdGQzV3AzbjRnWGpsZlFoY3kya09iam1JelZMejVBcTEyZ0tyejZsNk9sZzM1eE5TLWNOR1dwRUxabl84UnE0azl0MV9XUVlUMVBMcmFBWUgyUTJRNXFhNEljZksxNHNFNzJ1N2VEdC1QRGNNWDNPbm14bE0xemYyUXAxemlYal9mRFZPWVZZWmZ3RVJua25Fc29ncnM2RmdxTVgtSDJTYzB3dnlmQ196R1k0d1ZTd0xLUEdlNDdMRWQ0VHlqZmNFUlZudGtpcHRyalNKbHhRNDNoTVBKblJnVFFMalVEVVdkbWRBb2NQRFlwenZ3ZDNXYUNXU000aUo1c0dZYlItQVRLTE15VGJvczcxNktCamZPR0FrMGh6WnpnZWNLYnVneHFxUDNoYmF0UDlNZnZQcGtKM3ZaNzZGNEJnSDBXU0xxTnIxbDY2YlJDc1pGS1dhZzZOOHNpWGJuQVZEejdPNmpaMktmV0Z1eXFMWGs1X3o1aFhoRnBhN3hZWExzT2ppcl9VaFh2NksyYmd3aDNUVE9USlY2VEpHazlDVFFXbk5td1NuelFBQ0J2X1E0anA4c1IwUG5CNWlnWVgwRmFSRWZhblpnYXVUTVFobjFrOTJGcjFUQ1ZnRXQwRjQ1WXZFd0EyeWptbV9tejQ5Tkc3VEFUc2VrRG5GeDZYaklUcDhtelZDQkxKYlpzNGRLY216Rmg3VlVnNk9kekhGNkJhWExQSWFrNk9QcnhOM2I1ZThWblp5Z1gzVjB1cmUwaVhNZnl0TS1WLWl4LWtWcGVBTXZiWWFFay13MVk4X0NZem40T2lvczZrZ2VoeFlEaVdQUTBxMTFTcXhaX0FKckRyemRaemhIbm55Z0FpdUx4Y292V1pNNXRuVFBKc0E5bzlHcUVNOHNDMmdiRWl6OXRwbkJFOHV1MjdaREd3c0pfRzVpUDRISTE4aGtzZDlWWnlMdjRSMW9OcW9hSjRpdVk0Y2lLOUM4bm1pTTd5dmlKUVh6ZF9selVidk02ZUhmNHYxZXFQZEFuVVdheHlaRTZrRXFveHcyRVFwbnkzUFNzQTRuRVhTTmVZaDV2UGh2STZQWFg4YnI2d0FoZEY0N1BTYWpMdlFhWXZSXzhldGRaMjd6a2dNd1hXcDRiXzFTd29MM3hLVVE3cXNzUjA2dVpfSGl6N1FIM0dHZzREZmI5eUdrSkNLaDFBVXlfRUhxemkxeFhHTTN3YXVnc095S01kdkl6ZGROQl85TFZGbnZEbzFobHNoYTdDdmt0Zjkzcm1FV0YzRGQ5QUZTSUFzZnRkY0d1ejNEYTdrYzlQbTlVZ2ZZU0JtZ2ZYSFhKcG54VnY4bW9qbV9HRnVGWjVwSlQ1SkR2NEZ5UktiVlBZWG1MOUVjelJGNzlXMkk1S2tKWWtJZ3IzS2lyWFdreWpnak9IVXVUeGRKT1RhY0E0bWZ0bU5nd2lHRWxDV2lTRFBheHlUbm1CT3ViZW45aG16UUI1TEVMN1Zfd3VPRW0yN2x0TWFTcGJJb1RFYlBIa2VyUmJhaU1wcXVTTFF3NU1QWUdvUXliYzRHS2NZVER0emVCVHdvaTktZlRDcDQ2MkRqaVM0WWFTT2JId2VPdnlyVnBvN0JscTdmbWFsT1lTY09fM0Y5ZXVwZDgzaTBwRkQ3V2w2SGhtRmRiRmMtc1R3WHBOSm40UEpqbGlhSTBPbXVJNmdMUTVhWGMwRGhfby0yc2VzVFZva0xOTDVySncwTmZXNTlCZUVjTkJQVExkYjhjWlJsSmZ3MnVhbkpDRnJza2Vqeld1RGpoam1Wb2FPMWU3eDNfX3NhZ09ITUx4N2Jud1k5dW8xUmtpbDZKUHQwY3IwU1c4TzJLTzhsQVN1eFNrZFQwN0pUWV9CU3UtWkpNeHhkcHVkcW9uX0c0ZUxTSnA2U0VpaHV5QjRmZHJzSTBCRk9IMWVINTZOcFhxTGVLY2xiZzJtWWdiNXdIQjhqeXB0V3JTVG13THQydldoSDl2TFUybGhmZW5odmlxU0o3TjFCNWJQLU1yNWdiNVlINTNEdmozZ2N3MnFySlQ2UjBJR2R0emU1ck5ZZFNTdFRMN3MyM014cnc1RVdfclh3eFIyU3BYSnR4QTlNb28tcWFoZ1FGM1h1dktCQURLSDczLXFrMWItRW1qZEM0bnV6MFp6NHRhTHpDQTNzNHRYdHJwSXUtcVNzMlVqamV0cjIwYVJ6VVY3TjVsTGViR2Vob1Q3ZWRYTVNmSWtPSHZSSzdyNEI1dW5YTVRremp0Yk9yRlVqenVQY1ZCME42aGM2UzZacVJHTXJ1WFROU295ZHRsU3hNRzF3RjhIV1YwMGpXY3pWejlOX0FIa2tKTFdKOEM3blYxOGFQUm4zSFdsYnh2UGhuN1pOWkJSaXB2OGtEcXExc0xwU3E0ZUp4cUdDVWM2TXBfdUNFRVV0T1N6N19RdGt1SF9WREo5cWlkUjI2emVZdV9tMnFFZ1BvS28wTXEweENacXY0RTg2SUN3TVYtNnVETjB4S2o2NmhzdVFvT3pwYnZraWtITXljWXpCMmJ6SHdrTGljc19RSF9SeGtBdFFKQmZVb055ZjRad3lrd3I3T21ETzZSQzVlR0IzNlJlRFpmN0V5R2FrZXFSeF8yRkF6UDVrT1laMXJwbnQ0enlPcHgwU0RMNXNmNHRTV01jN2NTRjdwM1M0OWlMNTV0ZE1rcmZJc2dzcUl1QlB4SHozTmFrdFJnQkhROTQyeTdBZWhBcklOSDZEV3hkc2ZSSm95X1MxNTZnaDExbWk0UU5RQUx1SVJDY0ZBQ2docUxaYWtFdHFva3MxS3dQZVpfdzJQN1NROF9NOUI5MnJWMWxoUDVqNHlURlhNeGo3YlJPSmZVSVRZR1hIMG8wNXVVdmtPVmMwMTAwb0hTaHg3TGp2ZlozSGdFMThzVXllN0dEcEY3ZnpvZXJsb0ZBZUVheC1lRjUwcVJlUDNmWXFrcWJqdDVhSmhDNGdiVjBITHAtUGRUNUFuZ3VUeEM3ajEzaURfWU5KVV9hdlNjWTZiNVN5QmVfeVJXN3QyNV9MY3BOTXhleWp5bjd4YmNadlk1ZWhHWjRVdmU5XzNrZ0QwUlFleVBvWV92V1dVS1ZRNlpQa1U0UXpIOWRJRndyeGtydDdrRmtNdDRTaGJzV3ZKeElWeUw2TlRCUGVjbWNqWlAwdmkxRnA1anZTdnRjcGdhSUU5NTNiR1ZiVGxhejNPR0dmZjRHaTdyWWF1Qmd0NDNVMGxjeVg1cmw5aG5lSDF1TFAtUFRLckFmcjE1VXFMb3lUejYyZmpNbkgxcjNzYURyWW5feFhodmIwNl8zVy1zOFZOOUpxR3J2QS1PS3F1clRIU1ktUDkwNFoyckZRbVRVWHFURV9leERkQzU2bmhsSWJMSFhUUnA4Q1Y2cWotZlVhWGJjOUlTOGdMTlplMkhSU2daUUZzZWYyUmx2aXI5d3p5STBQSjM4c0VKcVJxOS1hR3hSdkNJUGdqamg4MlZKLWZvSTNvSGhseU9QMXRWelhiZnl1NlpDZTZBWldVMVB1ZzF4ZmxsTDE5S2JXaHRqOXZuSjM1X0tjUjkzcGhtQzg3TExKVTdkV2VNU1VhN1pDVWRvZnpDaDZGVUxQdVdJWjg2c2g0SGJUU0lPbDFTNkdXN3FEZVBkenJiME1zZnBKNVM5NjlIbWNFR21jeFNDZ2QxSGp1N3E2ZkVOTWNKR0ZSemZKZjRaODdUalpudFJhck1aY3V6RzVVTnd0UWRPYjZiRXdmY0JvWDZBb0g0eFJQWjF5TnhKaUp6dkVkTDhlYzNMTF9WVmZzRnR1c2lBMDB0ajhEYlZ6SUNwNUVaSUdNNE0zWGtnWWhkNDU2d3ViWUNNSzZPNmd3QTdUckxIbzNpcWZIQzdXdUc3bjFBUFdDd19NR04tOVNPdWZjSFYxeFhPVUdfbWQwcXlyazVWWFNCc21MNVhhOEtUOFBnNjNMX24xeEVVZjRwNmNUZkhsYUxwZ04tVHFYNXJwdExfbWFKV2d5ZF9DZVE5N2ZkZElVZExmRmJyUDNSM19YcTh0Q1JhaUFHUlNqd3RkVkRUanV2cGhrRGJ2ZV9hdjhxWU1XWGFjWGI0dXYzYWUzaHpBVjY2T1dPZUIwbVViN2lYbTA5U3lKdVdZZWlFMldrRllBZXdVRnV6RGcxbDBqbU5wR2owbkFiZ2dqOXRvcFZvVUM2WDdlTDRYUUdCSGVRdnQ1ME1FZEtnYloyWEFwWndDVzE4QXMwY2lSUExSRW90c0thb1o5MHVubXVPRGQ5UFQ2blVFcU5USHVadmJYVzFNUm5kcmR1U2kzYTlnUThmTGdzYlo5RkFlck1PRTd3c0trV3hodjVWZ3MtbVR4d3pBSUdmSXRuRUlqbWtpT1VQRlBVU0xMS3JhcmwtbkFLYkpLU3ZsZkVTQmdYOXhTejBnb2JBTldQQ0czOUdpRktWNHBncHVkSDBFTnFsSnFkTEFtUU02MjNJQU9xb2Y2SnVHejJBYUhYcXY3UDNUNDB3UTdVOVBSMGR5UFNoSFhFbDMtcmhxazdZV2U4dzhudHBQOEZBdmpjaXZzNUJpMnJFNE9WR2kxZ2hEZlhLQThXUHNqcTF1dHRzeGowdXVUY1pMUzdJakRCUDFabjB6ZE5fMW80Y2duT2pDamJDV1JwdEQ3RFFHWEdETzAxb1BKMVVwOEJaRlJrTVJONk1jY1drMkRTclJwNDBLeEx2VjJTUjVvM3BIMzYtRU9xbGh4NUk2UUFGaFBsNEl5cFAzX2o5V2RIMWo0VmlwcHJUWlJETC0tRW80akI5YjZfUkdWNzNUVkdmRVZRVk92eE1wTndMaXF2Tm5wcjVTN3hFN3lTUnJOcjBTUURUNk5kUEJHb2dVV0gzWGhOdTh4Yk9kN201NTBJVzlfNTAwaS02X1RvNXVseEpFMVRjMHpnQ0Y3TTB0ZVNWRWY4XzI0djAtd2JZUmdmNlNIZ01nT1R3MnFEcVZod0JYNF8yVHFKMHM5Qkxvem1SQTgxTXJabHE1OER1b05zdVRTTDFaYnd3YUhneW02YXBVN2FhRi1oTmxoaXZqUjFOeDk3d2F2bzFhajlWa2Z0d190ODFwWkFra0REc1MyS25JNWhhbFU2R2FITFZIMnd0cWJMWlVualVYN2lDdWtfOEZyZUs1VWpVVVpkSVd1Tm1SSFltVWVoU3lSUjZfa3NnUlViSEdvSXVYOEJrLVpBZnlrWDhFT2x2Uy1ZU0JhWm1IcjZrU1h3Znl3dVIzOGRHNXBQemE5RUVHaUVoZk5DeFZuUE5LTlBfb2k2TFdscnlCVHRoLXQ3YTlFdUlHcDRYcmRFWS1NcFFmNnBkSTF5QWdFel9tTENwWkVVRndVMWhVeVRwaTd4M2pYX0tyV1ZQRTRYTzB2UktjUXhrdGxNb1ZnaGd3dF8yQWdmdTdLMHFWbmE1TlpqaHZrOHh1ck1Mc3Utd3NSbEtKckp1dFBFM2lIVG9hVjBmVnl6WmkxbHg0ek5CUWR0MlpjYlp2MldQclBLejFTUzhNWkcxRUxHTmhvYnZETUJxN19QTTBRc2U4LXVnU1dtNzkwZDJadjFhZHZzWHptSUZ1dGZrMWRXaElWOWFQUElYVk5MRGdtZFk1SUNlZDk2TF93OG44SGxfWU1Bc3lrVzZ6cmJnNFNrNDE4OUVpZ0pSOFp2ajh4Y3paZHd3N3NNX0piZHBLSnMtak8yZmhvYllmajNoWGZzWFNXbmE0THY1ZG1FdEl4S0k1YTRwNjNrbEhuN1VOQUhSUEp2Z056OXlMLVJpOURoTnVFSFltVXNqR24wSDIzSmdaSFVqUDBNbHNsNEpIMFdIc2VjeWZmZXM3UzZZVEVKdmhjSnY5TXNOanVkd0JkYnlpV2dsNnZuVWsxMVlLb1VZX0ZpdFNxV2M1VTIwdVJpWmxrUUswMzVtRmpNdnJaejhJcVBoNFo3TElkQU5oVzBodk1vRk9nREdyYzFxQWQ1dHRGdm82UnJWamJRcms5UXhyNWhUNndHMXRKU3F6WlNvR0k0ellFbXdjMHh6UVhiMllYbTZranZIQ2lWajYyMDdqNXVBTTFTTkdaakFmeUJTOHRTSjdQRkI4MzYxa3dVM3p0ZjdBaC01cmNwZzBrZC0xT29IbC1iMnp1VnBjM2Rxbm1iMF9IekJEVjl6NlNWMTNJcVJlR1BIQTlKbU1kWWFQSDZJNnJYSTR2UGJCM1M4SVdiby12NUgwRnFfV3VBYi1UVEg1MmpyeE1yY25QM1BrOWNNNVJMM1ZPNDFEMlo1MWMybzQtYVVzQlk5OHBJelZmbXdhYXVJV0RyamFaZGo3VE9FdFJ4Z3psN3pYVE1LcEFCVDV6TFlWUE1mMUk4bm5mWG9tUy1tWEotWHo2c0hNeWhsTTlSVVd6bEQxdTlJQXBlRzd6WWJGUUdBSkNQa3ctM2t1cnBmM1dGUzJGTVZnWkV4SkJFTnhNS0JCSHRnLUY2aGVmTWYwWEVST3RFUzhVVktRby1xdURfeWhqdGVCRzBfODR1SW9TeDJ0M2VDbjZJbHNzRHpqZC1Db0p1c2RkdEVTZENLaWhhblhONU5Dc0lmZ0VseW83THZjN2RoNG9XVmJubXRoV3l2RHBHS1I4U25xSFQxQTNPd0tuRGRZU2h6Nm4yRm03VFNybGVod0pkYTJjYjZZbUJuZFFvY2lVbTdFR2NzUG9MZ1BRMXNack9vSWctOWVwT1NDVldxd3R0Yy1GUXNFLW9rTDhMZXBSbk5EX2N5d0p4bkxaTXF1ODV2c3NTVHhrc3cwNjVwdTBBZzFDTTFOZnM3R1hvRmxvY0Q3SzFHd1RCRjRQMkVJOHVlQU1VSzJvdGFOYm1scWJWRUJkVzFkS1ZfSGpsTDkxUHVHNlJkZEhfaXY4LUV2eVFiOWdtdEJzNWsyeGZ4OVBSXzZ2WUNxWklxNUJxWlp6UTBOcW54a3VHcGgxVFFZcW1xdU1PaXZWbmVPVkZYQjA1UnNGYS1ScFVIbnlsSy1BR0RobHJzSnh3SGhJUEVBbHh2X1dHYWVmbDFJUlRHNy1VbWVKMG5Fc01ZSElFOFhyN01PWk5IMDI3ajNOWGlsSDYyTWFvS2tVeWNFSzdNaWxILXN4bzMwajh4WjFxTUJDY2szaFVDdGRZTExMdW5QWERoVXB0ekJGSnJBMjhHUjBLMzY0X2pvcDhTY2l4MkNPeTFGclE4ZDI3eTViRmgtc3c2Q0JUWEJTcjhEYnZINnFHcFN3VDAzYlZLRVFaUE13ZVd3dTVyN0M3WGNsbk1wYzZwN3dyVzNTWm5UeEE1ZnJoa0tVenltLW9OSmxZSHdBMjh5eUFIVlhfRzZKeWdZc0ppV0t1c2FIS25HVW5PLXliQzhVMVNETW1aNWhjUTR3R1JUQV82VFQyckRsUHdzOWpvYXh3SzFMWFJfWUYyXzBXb2IycmxsMlJuT2FFMjBPYkhlZmczbEdOUG9lcFpiOTd4c0xkSWc0TXh3dmh0WFN0ZUtSSUtLcWt0M0NkUjJMOVdiV1N4UmxDN2JUT1BMR1ZiYnRBQnpRbGJVZ3NFZFY3VUxJMGlaZ0x5SnFLU0hjNFZfX0FQNE1xV3pJakZ3QlViVk9WVjJNT3JhN1hnZXVaczhBcEtERGpwRXg1UTRobUFYRV9RcHRFRWNiWDZDcy1qY1FUR2RORXVhZlRQNFlTQTVLTzR5MnRZWldUTnBrNE9rMS13OGNUS0J3d3lraDVzTnRVWFNxQVBwVTl0dmdwUEJRRGdwa2wzQmNfRy0tNTRhWC10TV9EVEdjQlpEcHk5U1NpUE9WYkdEbVpmeTFzSUJwSU12RFVBczB6Q2g0dmxkTXV2OW5Qd3ZGMU9lSlVySXNWZlpoVUdsYi11U2pWVmJfZmVzZ205Y0xFMDY0US1pQk15RUZQOVllUDJTRmZRWnM2aGpDbF9nRVdIUEU2dk1YSkduSlhEekpFeDNPU2JOcEpqTVBfczJxdy0tZjYzMmpIUjRtTk03Z3ZzT1pLTkxTQ2p3ZXJWNDliU1VKVGtrMWRJSXgwN0JtNWp6aFYwTkkxaFdXelNwbG40WnhFUlZNWFcyVG9oRHNtUll0TndONzZvZXVOUVdrQkVvOE04alNqRWlQdzJLQk5xZ1Nuc0M1bV9WRm5FQXFzTjhOOXYtUWVid3hyMmc4eFVlUnBoVW04MEhQODhBSm10WExqYm9tUEd6SzRnZFQ5SWltYUc0d01HV2twZmZCVVNtUTFWMDFRbV9HdVg1X3IyV1BlMUU2bVRxNjVZYzhRYjJYLVdrVUFXOGlOYWRNTFhrU0ZYcVpJeHNZVkJjT0VpQ3pkdld4bmhBNmRoZHJYblV6R1dlZkEycWtPd3Rnam1nemxLWFFKR3hoNVJGbUFhbDBjak1ZVTc1SGFFQV9qdHBJVnhpWXVYcDJTZmZkS0I1YXBiQVNaaTZqVzQ0b24xVnpXZHVRd2ExLUVRV1RnSF9pcHoyYmFGM0dhbWZIbnkydzUyRDRxbl9Fd2JJendBLUtVX09zbFRLb1ZmSE01ODBvY0FmcnFOZDNXSDRscS1CNXpkUVNCR0V2V2Fza240blF4R2NJSU16ampwd0VkSzJKVkNwdUFRVlRFeG1Ub3lHbWppQkpoR0xFcnpoc1ZMdTlrWUI4eGc1aEVDZHpxRnZxRXdBTmRiWjAxM1B2VVJQa2FuTkNyNWtoNWZFcW9venh5NTlOMVRmUGNpdVM5YWlFeTIzbTlicUhXdkpzUHJLcUNzRjNyQU9XamwtcU9yWUlmZUhNSnF0MDFrOTBfOVk0bGRUMTgwY1d1b2tWV01fZUhULWdHMmxMRUJ3WEIycTN4d1JLQ29MWlF2TFNEcHlzM3lVazR5UlM4ZDZ6STRKQVlMNDhmcENxNWRoRGM0cFRWbGE4NnBZbVk5ZURlenpyclBPRlVHUjJnam5OdndrNElQN1cydVhUTFMwc2lSX1JIVmNmOER3UXp1VVlvcktwTEpTUWFKZlZ1QWRpdFJLMHA5WXg4YW9SNm1oN1pLelpwV0RQRXBfa21QOGhLRnljSTBzM1F2REYweFJDS1dOcjVvaDE5c0JTMTQ4b0h3QXJvb3NISVdYVGQwY0QzbTAxcWFuZUNSLUlUM1RzeWVjQ0Z4akc1VjJNQ1ZGNkN1RmNvaFM0MThPME1xRXBCRWEzUEtIV1hlRnVGdzlfQjhDSldSQlV1cW5lM3E3LXBrWFF3NWVDMVktS01KSFJmUk13VmJXMkJJc2dtVVVfWlZsMGRxYXFSc3NyMm5URG9HZU1oSjZ1VVRBOHZRdi02UnQ2Rm5mMWpfa0FyWk9vS1J6WmJJUV9wZFVyNHJMM0NVOFpRTWZ0NmhLeG5DX21CbDlKcUNuazlXVFNqZXMwUXZZYUhvNHNBS2xjdFN2eXpUekhLX1VPN3RnXzd4ZEVBQzB4M0pOLU9UVl92M0NUZVJjN0l2Z0dNaVdqcTcwSUl2ME5WVExZLTcybEVzWlVCQ1NiXzJXSUN6R0ZhUnU5ZEE1aDlRd1FkSlVWci1oS0FpbFZ5eFJPMlZZb051azdHZVNCV1JTMlRVVmcwX0ZPZmt5eC1vVjJpVnBqVmRTQU1TT2wxV3FSOWJaT1otVE1VSEhpalpJNHJrdEEwMW9zRFAzeUpIcW5mMER4dFEwOFFTR3lpc2VEWlBJN0hydzNobGc2ZUdEUTRSNnF5LWZ1SlE3c3k1cFRlbWtqMUgtRXhpN1hOSXVhdGtwbWNwcVlma1hVa3BhUFFESkxrZnJrNWpNTmF0ZXd3WHNxV0QtdVZ2Nm1yTUFubDkxT1RibUlhMWJhZ2RiYlU2NnlRZzRKNkFwQkZFNGNGRUItUTlqVWhTdTZPMjdGbmdrVV9RVDFlT041QUY1UmVwWGpFZnBqbDd4bmpNZGJpOXJHRzFwaVl1Smc1U2NLV3BGYlpCWDVkeHUtZDJRQUY2TkNCS0k1Z2lOTU92SjNVYWNIZ2dOc0tsUHBkc0FUeWhPX1p1TTFRcVlIekY3bk9LNTJlTEdBcHNnRmFhZ2o4V01YX0EtcTJLaWJhd0JORTVlVk9UV0pLS0w2VmppTnpFR3pQZ1lmVzI0WnpqRkY5THZjNFREQmx1QUw2X25GUnFwUVJTeWphNTBZbXRpQzBPdUxhd2J1UEItcjlvRHQyLWVUUVFGc25neW9jTnc3TG4zZk51dExqX0VnVVFXWlpUSV9CQXBLQVlZdF9IV1lxMC1zYl82alFnclF5WEdiN216ak9ORG80UkJQc2Z4ZjFmYmJkazlicEo4ZGZOckVxTFUxRGZPUWtwdFF2bS1td1huU29rTUNQS2dNS1M0UTd1RW5qN2lBTTZkRURrM0cyYWtITmNraUVteTJFRzB1NE5ocU1ERnBTX2JtUWVLWnNLMjlnUUZXbXdYSnJURXZpY3Zfa2VDa1hTM0lHc1ZMWC1SS0hTdURLVVpwVGlmUk52c21LZHRHeVROcWxYaTBDNmRHVkNDc0JSOF9pSFZnMEhjWXJZcXZicWltaTZNaTBOSmFKSEViZFhjZzR6czFualJQbE5mNWdwMDdFR3BSWVljek9ReFFhMEJsQlNESU5kQTh3anVXM3VMeDlod0hxektsNVo4dS1KbHNWV21pZ3JObVVpOERGNmZVRlpaclhLckF6QkRNTExFZTZVQWI4NkZqRHgwdWxRcXp4dkwtaUJ5M2hWQkJjZkJGb01iUGZONzA3alhybEhBNzZQWHQ0Rk00Z2lNNERwNk5uQnBlYWxPZkNHVk9fa0RhVFJfNnBOdU40V1owblhTUXgxa09FdWZmUnFzYnBYd3NmSVByQkRrck13dGxUdHYydUxFZkZxYTBaWkd4MVZTNnc5eGJ6cF9wbW1xUWtVYk9DbVpmWXdiekZUMmZmbTRUcGc0NjhXUGpMNEpSUXN4aEtTUlJjcGs1OWh6WWlPbkFKUmM5dnhqT2ZCN1Ridmo2VE5oUmxnRkYtdFNvYXBWejZuQno0RDBZOWZybDB1cUp0ejhySGl6TEVBemtjYTR5eEFlTldzQm5XcGl4dEJSOXpBOUNfQXMwSGlBdU4xb3J3THROaU5TMDdBNGUwU1hGckhIcEFSM0ZCeHFIYUJaVWJlUS05LUpLQ3JkVUdvSnRWNnZkenV4TVBBbEVybFZsc19lR0M5WUt0MVgycHBycGVzX1MtRWZyQmp4ekQyNGkyTVh4Tk4yclprMW1Dc09nNVozSFJmWVIxRGxTbmdDNVMtR212VlNoWDhvVFd3aGhVU0d5T01wWFdnU1FLZkZHMFc4RGNhOW91Mm1yZF9hQ1djTzY2V0dKcDU0ZFlMaUgyYkRoUkJ2ZEJpYmdqaHZ0NE1EcGxsaWlPUDZzNzRtRDFBcV9fbGM5bDZBZWRPbmpmX2VvWkdra29yd0MxY1prUTVXc3FBa1NyajZFOEw3UkxFQjVtYTc5LXJ1WFFId25YQTlGeEFkZ2ZlZVV3dnB2UEdxM2d6VnU5U3JKLVJSYVhWS01TOFpxSWxvUTZDZUwzeVlvcmVzd3dZRGhzYllGZWtHNVNOMHJkSzV5SkRqYkFyTEpsdlhoNXdGSlI3Nzc4cFVhZFY4RkZYVUxXOXJ1d3FVeC1DOTF6RlFmd1dmSGo4N19NUXBVRXVVeXlfbHhZTTFCOXF5bGtZMVQ5cnNDTlRvbVpicnJjYWpHUER4M0RHR2tjR0N1UEZVS3pJRERucHlMMlNUY3ZXdDZ4dmdDNHcxeGsxbG01NnJxVU9Oa0RGa1NDSG1ib1lWQXJuYTVLNV9rNWFwcWxWdlAzWDN2anJuandDUk5iTXhRNnJuY0Y4NDRVWl94c2ZsTS1FbFJ3aFBaZy1MQUdqbUhvY19QVklvay1fWHRJZGZNck16UXUyTlllSmk0dDdJRlJlTEVOX3dsUFZpT01qRk54QVAweklGdVVkOGNQUjdjZ1VYM3RGWnJQQ21hWmdDcW5OWnJ3NEIxQ1VvdFk0WV9SSW14VFBrMi1tcHlCMldJeDBjUVR1X1JXZm0waGp3eTFuakdRTEh3Y3lNcDBqWGlZSTZ5NDE4NkxNVnppSkt4VG0yMHRsYkJqTmozMGZmaElINUtmNXhyYlRHZmxTREM1MlVvdjllS2JoWGlhMzhOZXNndHNwdWhtUkhFUUp4VlBMbEdjQjB5ZTJIOE1BajZrSVM5M0w0T1g4U0xGdzdCS2lXTFo0ZThfVy05b0hrMkZNRGpYMF8tendiNTg2ZnQzOXNCajd3dXFON3ZBdzU0b3d5Ym41TFp1UFFDVHNEeGVWbURFRGJKal9sRUtBbEVxQzVmMnhpZjZrTTBkZkMtTkR3RHhqVnRpNXFmSzI4UnZpUndRZTJNY01Gcmp4TjRPYVNSaGxGM3Ayb2VnWHhaRE5zYk1ENmx0ZlJOU0lOSXlGRHZUVjBDNGM1dkkzeDVsSWdDMHNhWUlBbV9ucjdRS0p1bmtMTTRLSDVsNDFZQW9QVl9HZG1PTnYyUXFMMXFYamJyRDE1Z2c4bVp0OWVHN2R0UlJwbEtRWnpQQVUwVmpaTU9kenpGQ05OUFpGSTdhRTJSTFJ1OGFZYXI0eW9Cbzhndmk4WEVldlZXakRoMTlhdjBUQ3VxTDZKdi1qM2hDdlZld0JhTVd0c05oamMtb1BzbjZUMXpfeXEzZF8wUEE2M3NHQjJsdy1YaFV2ZEUwZEFnMzdTaGdvN2g3MFoxXzU4N210YTZDQVdPNllDWGt2bHV5Z2NQVnYwdWlReWdydDdUTk5QV0hXSGF2SE9uaVd4MS02dlJ3ZVFtUEFyaUNNWHM5blcxaWp3ekxUdWNEVEtZNThpRFB1aThrcXV4eHFUdzZFRGI3T0pZeWhBemltWF9SdVVSaHNibndkbUFkOVgyc3ZCTWM4ZE1KWFA1Ym5mMUppSkJnSTJ0Ml96UnQ5MkhaWmc5QWZEeGJLa2dHNG0wa1FmU2xQRHdISWhfLWFQSmZfWHdaRWh6cXFWUHhKQk9vZTh5Yl96ZTRLM2tzb1dQZkFDcXpyUVpMaExIaEJBcWhuRFpyWm5tSDdTczZ0QmpLMU4yQmhNZHlSZmkydXNWdmg5WTZZWXEtTXFFWWxHeE1iQ3FWYkJOS3FHazNqN3p4a0JVOUg2Z2dNQ3hUdEJJODN4UkwteDQwamgwclNKZ2hqaTBRTGZjYngxSlNSOUxZY1BhSXFzcnJKcVRGVElxcUQ4bmRvNUNnd3JuWU1aRjdfd0ZFNHZyOWduN0N5V1JHV25ibXNqSTBXdmRqMExoRmNqTkdBNnV1b1kzd3VzWmJFTWY5SjFpeTRoa0J2cUJLLUJXWS1nYWU3aXNEUEIxeElaTUhJMTE2MWkzM09PY0V3SUluNVZjcm1mZXBYVlpLR21IODE1bFFnTERlQzhLWXhwMWdVLXFtRWQzd3F6WDg0WkhlY01oczF3YW5oVzhyZlNIODdmMm9kWDNDSTJ1QzRkUUtobFM0b2QxR2JVZUE1VFU0VGlOQWdfWmRUQk5IQXltWm5xaVJBZ2RKdndlWXhicS1vY1RzY094eGpQZHIyeGswX0JVRXVsS3NPQ3RmdVowelV4b1Z3ZVl6dHlmX1JmOGdNbG5Nd25qZXowcHMtdWVvdllXMW1rQkhDOWlseWVyNEkxYlBmSXNyLUFMSHhNenJHMVZHb3JObkpUNXpRR1c0YllzOEdqb3E0T3c3YzFtT2F3LWk4RlM2RVVKUjhMQnlpS291cnBOcmpxeDlNbVE5UnI4SGFUZXNLcmFpRDRjQndYSlgtZGh2bDRGMlpEVUFEeGtnWHpGS29yRWYzVGh0dXowV2ZpajJUMVVIQ2lsZWU2SmFFczhFUTdHWEdlbHBqNW9TRkRNNmdDb0tFRVIzRUZsTkw3aUpwTldVUENIZ0gyX1FDUW9kOERYVmRfWVhDeS1rQm5tYTI4UWhjaS1SNE5QZG50WlN2UDlWM1ZHMnF6eGtPdzdnZXF2ZzdHNHljYUM3a1Vxa2JQNXE2X1R4d01XT1NrUERBaldrU0wxUFJPdGVKemdPWENGc1lMeEtaSjFLc1Y5VWdBR0RleTJLVWIzb0JobnpJZ3A3THFjQ2ZHT0U1R1lhVHRzVmlWMlNnMVJwYjRpeFd2UUFzNmI5RngtdVZXU3JSbnladTRnYVB4T1FaalRJb3I0WEMydG9Db2trdXZwcnVONWxXREs3MVZ1d1huLUN3cUdtUVVfM193ZW5pYVJodEl6aG5Sd3dpLXZueWZ2TTJYdXF2a0NmaV9xQkNaWDllMll3b1NRdmg3UmFpQ1cwcmRvM2V6NERMelF6bktYbklQWmZ2SVF4UG9RZnF5TlJYQWZKNGs2OXEzaVNTSVVxZ2NXN1hTNHpKVnVhV0tSS1hveTB0RXd6bER6WHhzVVBrMHZucEFWMWdKYTlURHpmVnZwT0dfdFpfQ09YSHVLNVk5ZFFyVFpDSWN0LVR6TE5rVkJFMFBXQ19lMEdLamJack1ETjZYTkdpLWlWRDZMQWQwZEVXTnROYlJqRndrU2Q0QlZTOXJJbHlTOXBNZHQweWRMX2M0cWY5Mlg0dUE4QV8zcHRNalRxRkNUNi1IRWZkVzZJTUQ3bjdWRFNTaHZMTTdnMFZJcllyLVdkc2ZOMGZoSjY2OUYwVDdaTWsxVjY1R2d2YkFFRzdweHBkU0d0YzF1RV9RSjNvZjF0RElZc2ZVU3pIdzQzLVA4d0g1QU05ZUlOM0kwQnNuUC16bFE0akRLTWV0RWxfN1JselV6bEtPX2gtMWpobXRMVHhXdTAtUGNrbTRuc0pDSTVvRlpMWT0=")
 SALT = base64.b64decode("7PjH39GRUafCK/E+OwxZvw==")
+KDF_ITERATIONS = 100000
 
-def derive_key(password: str, salt: bytes) -> bytes:
+def derive_key(password: str, salt: bytes, iterations: int = KDF_ITERATIONS) -> bytes:
     """Derive encryption key from password using PBKDF2"""
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
         length=32,
         salt=salt,
-        iterations=100000,
+        iterations=iterations,
     )
     key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
     return key
 
+def _cache_tag() -> str:
+    """Identifies the salt and KDF cost a cached key was derived with"""
+    return f"{base64.b64encode(SALT).decode()}:{KDF_ITERATIONS}"
+
+def load_cached_key():
+    """Return the derived key from METER_KEY_CACHE if it is private and current"""
+    path = os.environ.get("METER_KEY_CACHE")
+    if not path or not os.path.exists(path):
+        return None
+    
+    if os.name != 'nt' and os.stat(path).st_mode & 0o077:
+        print(f"[WARNING] Ignoring key cache {path}: permissions must be 0600")
+        return None
+    
+    try:
+        with open(path, 'r') as f:
+            tag, key = f.read().split()
+    except (OSError, ValueError):
+        return None
+    
+    # A cache left over from a previous encryption is stale
+    if tag != _cache_tag():
+        return None
+    return key.encode()
+
+def save_cached_key(key: bytes):
+    """Store the derived key in METER_KEY_CACHE, readable by the owner only"""
+    path = os.environ.get("METER_KEY_CACHE")
+    if not path:
+        return
+    
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(f"{_cache_tag()} {key.decode()}\n")
+        if os.name != 'nt':
+            os.chmod(path, 0o600)
+    except OSError as e:
+        print(f"[WARNING] Could not write key cache {path}: {e}")
+
+class MemoryLoader(importlib.abc.Loader):
+    """Loader that compiles and runs decrypted source without touching disk"""
+
+    def __init__(self, source: bytes, filename: str):
+        self.source = source
+        self.filename = filename
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        code = compile(self.source, self.filename, "exec")
+        exec(code, module.__dict__)
+
+def run_in_memory(source: bytes):
+    """Execute the decrypted script as __main__ inside this interpreter"""
+    loader = MemoryLoader(source, "<encrypted meter.py>")
+    spec = importlib.util.spec_from_loader("__main__", loader, origin="<encrypted meter.py>")
+    module = importlib.util.module_from_spec(spec)
+
+    # Sibling modules (reading_store, ...) resolve next to this wrapper
+    wrapper_dir = os.path.dirname(os.path.abspath(__file__))
+    if wrapper_dir not in sys.path:
+        sys.path.insert(0, wrapper_dir)
+
+    sys.modules["__main__"] = module
+    loader.exec_module(module)
+
+def run_in_subprocess(source: bytes):
+    """Legacy path: write a temp file and run it in a second interpreter"""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
+        temp_file.write(source.decode())
+        temp_file_path = temp_file.name
+    
+    # The temp file is not next to meter.py's modules, so hand the child their directories
+    wrapper_dir = os.path.dirname(os.path.abspath(__file__))
+    common_dir = os.path.join(os.path.dirname(wrapper_dir), "common")
+    pythonpath = os.pathsep.join(filter(None, [wrapper_dir, common_dir, os.environ.get("PYTHONPATH")]))
+    
+    try:
+        # Pass command line arguments to the decrypted script
+        result = subprocess.run([sys.executable, temp_file_path] + sys.argv[1:], 
+                              capture_output=False, text=True, env=dict(os.environ, PYTHONPATH=pythonpath))
+        
+        sys.exit(result.returncode)
+        
+    finally:
+        # Clean up temporary file
+        try:
+            os.unlink(temp_file_path)
+        except:
+            pass
+
 def decrypt_and_execute():
     """Decrypt the file and execute it"""
-    # Get password from user
-    password = input("Enter password to decrypt meter.py: ").strip()
+    decrypted_data = None
     
-    if not password:
-        print("[ERROR] Password is required!")
-        sys.exit(1)
+    # A cached key lets watchdog restarts skip the prompt and the KDF
+    key = load_cached_key()
+    if key:
+        try:
+            decrypted_data = Fernet(key).decrypt(ENCRYPTED_DATA)
+        except Exception:
+            print("[WARNING] Cached key rejected, asking for password")
     
-    try:
-        # Derive key and decrypt
-        key = derive_key(password, SALT)
-        fernet = Fernet(key)
-        decrypted_data = fernet.decrypt(ENCRYPTED_DATA)
+    if decrypted_data is None:
+        # Get password from user
+        password = input("Enter password to decrypt meter.py: ").strip()
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-            temp_file.write(decrypted_data.decode())
-            temp_file_path = temp_file.name
+        if not password:
+            print("[ERROR] Password is required!")
+            sys.exit(1)
         
         try:
-            # Execute the decrypted Python file
-            print("[SUCCESS] File decrypted successfully. Executing meter.py...")
-            print("=" * 50)
-            
-            # Pass command line arguments to the decrypted script
-            result = subprocess.run([sys.executable, temp_file_path] + sys.argv[1:], 
-                                  capture_output=False, text=True)
-            
-            sys.exit(result.returncode)
-            
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(temp_file_path)
-            except:
-                pass
-                
-    except Exception as e:
-        print(f"[ERROR] Failed to decrypt or execute: {str(e)}")
-        print("Please check your password and try again.")
-        sys.exit(1)
+            # Derive key and decrypt
+            key = derive_key(password, SALT)
+            fernet = Fernet(key)
+            decrypted_data = fernet.decrypt(ENCRYPTED_DATA)
+                    
+        except Exception as e:
+            print(f"[ERROR] Failed to decrypt or execute: {str(e)}")
+            print("Please check your password and try again.")
+            sys.exit(1)
+        
+        save_cached_key(key)
+    
+    # Execute the decrypted Python file
+    print("[SUCCESS] File decrypted successfully. Executing meter.py...")
+    print("=" * 50)
+    
+    # METER_EXEC_MODE=subprocess restores the temp-file launch
+    if os.environ.get("METER_EXEC_MODE", "memory").lower() == "subprocess":
+        run_in_subprocess(decrypted_data)
+    else:
+        run_in_memory(decrypted_data)
 
 if __name__ == "__main__":
     decrypt_and_execute()
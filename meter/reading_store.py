@@ -0,0 +1,264 @@
+"""
+Columnar On-Device Reading Store
+Append-only fixed-width column files for MeterDataGenerator readings
+"""
+
+import os
+import sys
+import csv
+import time
+import mmap
+import array
+import bisect
+import argparse
+
+
+# =========================
+# COLUMN LAYOUT
+# =========================
+# (field, array typecode, export decimals) - decimals match the rounding
+# applied by MeterDataGenerator.generate_reading so exports round-trip.
+READING_COLUMNS = (
+    ("voltage_v", "f", 1),
+    ("current_a", "f", 2),
+    ("active_power_kw", "f", 2),
+    ("reactive_power_kvar", "f", 2),
+    ("apparent_power_kva", "f", 2),
+    ("power_factor", "f", 2),
+    ("frequency_hz", "f", 1),
+    ("cumulative_kwh", "d", 1),
+)
+
+READING_FIELDS = tuple(name for name, _, _ in READING_COLUMNS)
+
+TIMESTAMP_COLUMN = ("timestamp", "q")
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def reading_epoch(reading):
+    """Convert a reading's local timestamp string to epoch seconds"""
+    return int(time.mktime(time.strptime(reading["timestamp"], TIMESTAMP_FORMAT)))
+
+
+def format_epoch(epoch):
+    """Format epoch seconds the same way generate_reading does"""
+    return time.strftime(TIMESTAMP_FORMAT, time.localtime(epoch))
+
+
+def _column_file(path, name, typecode):
+    return os.path.join(path, f"{name}.{typecode}col")
+
+
+# =========================
+# READING STORE (WRITER)
+# =========================
+class ReadingStore:
+    """
+    One file per column holding native-endian fixed-width values.
+    Rows are appended in time order so the timestamp column stays sorted.
+    """
+
+    def __init__(self, path):
+
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        self._columns = [TIMESTAMP_COLUMN] + [(n, t) for n, t, _ in READING_COLUMNS]
+        self._repair()
+
+        self._files = {
+            name: open(_column_file(path, name, typecode), "ab")
+            for name, typecode in self._columns
+        }
+
+    def _repair(self):
+        # A crash between column writes can leave columns of unequal length;
+        # truncate everything back to the last complete row.
+        rows = None
+        for name, typecode in self._columns:
+            file_path = _column_file(self.path, name, typecode)
+            size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+            count = size // array.array(typecode).itemsize
+            rows = count if rows is None else min(rows, count)
+
+        for name, typecode in self._columns:
+            file_path = _column_file(self.path, name, typecode)
+            expected = rows * array.array(typecode).itemsize
+            if os.path.exists(file_path) and os.path.getsize(file_path) != expected:
+                print(f"[READING_STORE] Truncating partial column '{name}' to {rows} rows")
+                with open(file_path, "r+b") as f:
+                    f.truncate(expected)
+
+        self.rows = rows or 0
+
+    def append(self, reading):
+        self.extend([reading])
+
+    def extend(self, readings):
+
+        columns = {name: array.array(typecode) for name, typecode in self._columns}
+
+        for reading in readings:
+            columns["timestamp"].append(reading_epoch(reading))
+            for name in READING_FIELDS:
+                columns[name].append(reading[name])
+
+        for name, _ in self._columns:
+            columns[name].tofile(self._files[name])
+            self._files[name].flush()
+
+        self.rows += len(columns["timestamp"])
+
+    def reader(self):
+        return StoreReader(self.path)
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# =========================
+# STORE READER (MMAP)
+# =========================
+class StoreReader:
+    """
+    Read-only view over a ReadingStore directory. Columns are mmap'd and
+    exposed as typed memoryviews, so slicing a range never copies data.
+    """
+
+    def __init__(self, path):
+
+        self.path = path
+        self._maps = []
+        self.columns = {}
+
+        layout = [TIMESTAMP_COLUMN] + [(n, t) for n, t, _ in READING_COLUMNS]
+        for name, typecode in layout:
+            self.columns[name] = self._map(_column_file(path, name, typecode), typecode)
+
+        # Ignore any trailing partial row a concurrent writer has not finished
+        self.rows = min(len(view) for view in self.columns.values())
+
+    def _map(self, file_path, typecode):
+
+        if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+            return memoryview(array.array(typecode))
+
+        with open(file_path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._maps.append(mapped)
+        usable = len(mapped) - len(mapped) % array.array(typecode).itemsize
+        return memoryview(mapped)[:usable].cast(typecode)
+
+    def row_range(self, start=None, end=None):
+        """Return the [lo, hi) row indices whose timestamps fall in [start, end)"""
+        timestamps = self.columns["timestamp"][:self.rows]
+        lo = 0 if start is None else bisect.bisect_left(timestamps, start)
+        hi = self.rows if end is None else bisect.bisect_left(timestamps, end)
+        return lo, max(lo, hi)
+
+    def column(self, name, start=None, end=None):
+        """Zero-copy slice of a single column for the time range; release() it when done"""
+        lo, hi = self.row_range(start, end)
+        return self.columns[name][lo:hi]
+
+    def iter_readings(self, start=None, end=None):
+        """Yield readings as generate_reading-style dicts, one row at a time"""
+        lo, hi = self.row_range(start, end)
+        timestamps = self.columns["timestamp"]
+
+        for i in range(lo, hi):
+            reading = {"timestamp": format_epoch(timestamps[i])}
+            for name, _, decimals in READING_COLUMNS:
+                reading[name] = round(self.columns[name][i], decimals)
+            yield reading
+
+    def export_csv(self, out, start=None, end=None):
+        """Write the range as CSV in the generate_reading field layout"""
+        writer = csv.writer(out)
+        writer.writerow(("timestamp",) + READING_FIELDS)
+
+        count = 0
+        for reading in self.iter_readings(start, end):
+            writer.writerow([reading["timestamp"]] + [reading[name] for name in READING_FIELDS])
+            count += 1
+
+        return count
+
+    def close(self):
+        """
+        Release the column views and unmap the files. A column() slice the
+        caller still holds keeps its file mapped, and readable, until the
+        slice itself is released or garbage collected.
+        """
+        for view in self.columns.values():
+            view.release()
+        self.columns = {}
+        for mapped in self._maps:
+            try:
+                mapped.close()
+            except BufferError:
+                # Still exported to a live slice; the map goes with its last view
+                pass
+        self._maps = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# =========================
+# COMMAND LINE
+# =========================
+def _parse_time(value):
+    if value is None:
+        return None
+    if value.isdigit():
+        return int(value)
+    return int(time.mktime(time.strptime(value, TIMESTAMP_FORMAT)))
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Inspect or export a local meter reading store")
+    parser.add_argument("command", choices=["info", "export"])
+    parser.add_argument("store", help="Reading store directory")
+    parser.add_argument("--start", help="Range start (epoch seconds or 'YYYY-MM-DD HH:MM:SS')")
+    parser.add_argument("--end", help="Range end, exclusive")
+    parser.add_argument("-o", "--output", help="CSV output file (default: stdout)")
+
+    args = parser.parse_args()
+
+    with StoreReader(args.store) as reader:
+
+        start, end = _parse_time(args.start), _parse_time(args.end)
+
+        if args.command == "info":
+            lo, hi = reader.row_range(start, end)
+            print(f"Rows: {hi - lo}")
+            if hi > lo:
+                timestamps = reader.columns["timestamp"]
+                print(f"First: {format_epoch(timestamps[lo])}")
+                print(f"Last:  {format_epoch(timestamps[hi - 1])}")
+            return
+
+        if args.output:
+            with open(args.output, "w", newline="") as out:
+                count = reader.export_csv(out, start, end)
+            print(f"[READING_STORE] Exported {count} readings to {args.output}")
+        else:
+            reader.export_csv(sys.stdout, start, end)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Recorded Meter CSV Replay
+Streams exported readings through WebAppIntegrator for regression and load tests
+"""
+
+import os
+import sys
+import csv
+import gzip
+import time
+import argparse
+
+from meter import WebAppIntegrator
+from reading_store import READING_FIELDS, reading_epoch
+
+
+# =========================
+# CSV SOURCE
+# =========================
+def open_csv(path):
+    """Open a plain or gzip CSV ('-' for stdin) as a text stream"""
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", newline="")
+    return open(path, newline="")
+
+
+def iter_csv_readings(stream):
+    """Yield generate_reading-style dicts one row at a time"""
+
+    reader = csv.DictReader(stream)
+
+    missing = [name for name in ("timestamp",) + READING_FIELDS if name not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError(f"CSV is missing columns: {', '.join(missing)}")
+
+    for line, row in enumerate(reader, start=2):
+        try:
+            reading = {"timestamp": row["timestamp"]}
+            for name in READING_FIELDS:
+                reading[name] = float(row[name])
+        except (TypeError, ValueError):
+            print(f"[REPLAY] Skipping malformed row at line {line}")
+            continue
+        yield reading
+
+
+class ReplaySource:
+    """
+    Iterates readings from a recorded CSV, sleeping so that the gaps between
+    recorded timestamps are reproduced at `speed` times real time.
+    A speed of 0 replays as fast as the sink accepts readings.
+    """
+
+    def __init__(self, path, speed=1.0):
+        self.path = path
+        self.speed = speed
+
+    def __iter__(self):
+
+        stream = open_csv(self.path)
+        try:
+            first_epoch = None
+            wall_start = time.monotonic()
+
+            for reading in iter_csv_readings(stream):
+
+                if self.speed > 0:
+                    try:
+                        epoch = reading_epoch(reading)
+                    except ValueError:
+                        epoch = None
+
+                    if epoch is not None:
+                        if first_epoch is None:
+                            first_epoch = epoch
+                        due = wall_start + (epoch - first_epoch) / self.speed
+                        delay = due - time.monotonic()
+                        if delay > 0:
+                            time.sleep(delay)
+
+                yield reading
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+# =========================
+# MAIN PROGRAM
+# =========================
+def main():
+
+    parser = argparse.ArgumentParser(description="Replay recorded meter CSVs through the telemetry send path")
+    parser.add_argument("csv", help="CSV or CSV.gz in the generate_reading layout ('-' for stdin)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Time compression factor, e.g. 100 for 100x; 0 for no pacing")
+    parser.add_argument("--limit", type=int, help="Stop after this many readings")
+    parser.add_argument("--server", default=os.getenv("WEB_APP_URL", "http://localhost:3000"))
+    parser.add_argument("--user-id", default=os.getenv("USER_ID", "54043afc-de58-49db-9be3-23e81493b4dd"))
+    parser.add_argument("--device", default=os.getenv("DEVICE_NAME", "Replay Meter"))
+    parser.add_argument("--protocol", default=os.getenv("PROTOCOL", "TCP"))
+
+    args = parser.parse_args()
+
+    web = WebAppIntegrator(args.server, args.user_id, args.device, args.protocol)
+
+    if not web.register_device():
+        print("[SYSTEM] Failed to register device - exiting")
+        sys.exit(1)
+
+    web.update_status("online")
+
+    sent = failed = 0
+    started = time.monotonic()
+
+    try:
+        for reading in ReplaySource(args.csv, args.speed):
+
+            if web.send_meter_reading(reading):
+                sent += 1
+            else:
+                failed += 1
+
+            if args.limit and sent + failed >= args.limit:
+                break
+
+    except KeyboardInterrupt:
+        print("\n[SYSTEM] Shutdown signal received")
+
+    finally:
+        web.update_status("offline")
+        elapsed = time.monotonic() - started
+        rate = (sent + failed) / elapsed if elapsed > 0 else 0.0
+        print(f"[REPLAY] Sent {sent}, failed {failed} in {elapsed:.1f}s ({rate:.1f} readings/s)")
+
+
+if __name__ == "__main__":
+    main()
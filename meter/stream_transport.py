@@ -0,0 +1,276 @@
+"""
+TCP Stream Transport
+One long-lived connection per meter carrying length-prefixed reading and status frames,
+with cumulative acknowledgements and a window of unacknowledged frames
+"""
+
+import json
+import time
+import random
+import select
+import socket
+import struct
+from collections import deque
+
+from resilience import RetryPolicy
+from udp_transport import encode_reading, decode_reading, READING
+
+# Frame kinds
+HELLO = 1     # meter -> receiver: JSON identity, session and the first sequence number it still holds
+WELCOME = 2   # receiver -> meter: JSON window and the highest sequence number already delivered
+READING_FRAME = 3
+STATUS = 4
+ACK = 5       # receiver -> meter: every frame up to and including seq has been delivered upstream
+
+# length of what follows (kind + body), kind
+FRAME_HEADER = struct.Struct("!IB")
+SEQ = struct.Struct("!Q")
+MAX_FRAME = 64 * 1024
+
+
+def encode_frame(kind: int, body: bytes = b"") -> bytes:
+    return FRAME_HEADER.pack(len(body) + 1, kind) + body
+
+
+def encode_json(kind: int, payload: dict) -> bytes:
+    return encode_frame(kind, json.dumps(payload, separators=(",", ":")).encode())
+
+
+def encode_reading_frame(seq: int, reading: dict) -> bytes:
+    return encode_frame(READING_FRAME, SEQ.pack(seq) + encode_reading(reading))
+
+
+def encode_status_frame(seq: int, status: str) -> bytes:
+    return encode_frame(STATUS, SEQ.pack(seq) + status.encode())
+
+
+def encode_ack(seq: int) -> bytes:
+    return encode_frame(ACK, SEQ.pack(seq))
+
+
+def decode_body(kind: int, body: bytes):
+    """(seq, payload) for sequenced frames, (None, dict) for HELLO/WELCOME; ValueError if malformed"""
+    if kind in (HELLO, WELCOME):
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise ValueError("handshake body is not JSON")
+        if not isinstance(payload, dict):
+            raise ValueError("handshake body is not an object")
+        return None, payload
+    if len(body) < SEQ.size:
+        raise ValueError("frame too short for a sequence number")
+    (seq,) = SEQ.unpack_from(body)
+    if kind == READING_FRAME:
+        if len(body) != SEQ.size + READING.size:
+            raise ValueError("reading frame has the wrong size")
+        return seq, decode_reading(body, SEQ.size)
+    if kind == STATUS:
+        return seq, body[SEQ.size:].decode("utf-8", "replace")
+    if kind == ACK:
+        return seq, None
+    raise ValueError(f"unknown frame kind {kind}")
+
+
+class FrameBuffer:
+    """Splits a byte stream into (kind, body) frames"""
+
+    def __init__(self, max_frame: int = MAX_FRAME):
+        self.max_frame = max_frame
+        self._data = bytearray()
+
+    def feed(self, data: bytes) -> list:
+        self._data += data
+        frames = []
+        while len(self._data) >= FRAME_HEADER.size:
+            length, kind = FRAME_HEADER.unpack_from(self._data)
+            if not 1 <= length <= self.max_frame:
+                raise ValueError(f"bad frame length {length}")
+            end = FRAME_HEADER.size - 1 + length
+            if len(self._data) < end:
+                break
+            frames.append((kind, bytes(self._data[FRAME_HEADER.size:end])))
+            del self._data[:end]
+        return frames
+
+
+# =========================
+# SENDER
+# =========================
+class StreamSender:
+    """
+    Blocking sender for a single-threaded client. Frames are numbered when
+    they go on the wire and kept until the receiver acknowledges them; at
+    most `window` may be unacknowledged, the rest wait in a queue bounded by
+    `max_queue` (oldest dropped). The receiver acks only after forwarding, so
+    a slow server fills the window and holds readings on the meter instead
+    of in the receiver.
+
+    A broken connection is re-opened on a later send with jittered backoff;
+    the HELLO/WELCOME exchange tells the meter which frames the receiver
+    already delivered and everything after that is sent again.
+    """
+
+    def __init__(self, address: tuple, info: dict, window: int = 64, max_queue: int = 10000,
+                 timeout: float = 5.0, policy: RetryPolicy = None):
+        self.address = address
+        self.info = info
+        self.window = window
+        self.timeout = timeout
+        self.policy = policy or RetryPolicy(base_delay=0.5, max_delay=60.0)
+        self.session = f"{random.getrandbits(64):016x}"
+        self.next_seq = 1
+
+        self.sock = None
+        self._frames = FrameBuffer()
+        self._window = window
+        self._unacked = deque()
+        self._queue = deque()
+        self.max_queue = max_queue
+        self._failures = 0
+        self._retry_at = 0.0
+
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.acked = 0
+        self.resent = 0
+        self.dropped = 0
+        self.connects = 0
+
+    # ----- public -----
+    def send_reading(self, reading: dict) -> bool:
+        """Queue a reading; True once it is on the wire or waiting for window space on a live connection"""
+        return self._enqueue(READING_FRAME, reading)
+
+    def send_status(self, status: str) -> bool:
+        return self._enqueue(STATUS, status)
+
+    def pending(self) -> int:
+        return len(self._unacked) + len(self._queue)
+
+    def close(self, drain_timeout: float = 5.0):
+        """Wait up to drain_timeout for outstanding frames to be acknowledged, then disconnect"""
+        deadline = time.monotonic() + drain_timeout
+        while self.pending() and time.monotonic() < deadline:
+            if not self._pump():
+                break
+            try:
+                self._read_acks(min(0.2, max(0.0, deadline - time.monotonic())))
+            except (OSError, ValueError):
+                break
+        self._disconnect()
+
+    def stats(self) -> dict:
+        return {
+            "session": self.session,
+            "connected": self.sock is not None,
+            "frames_sent": self.frames_sent,
+            "bytes_sent": self.bytes_sent,
+            "acked": self.acked,
+            "resent": self.resent,
+            "unacked": len(self._unacked),
+            "queued": len(self._queue),
+            "dropped": self.dropped,
+            "connects": self.connects,
+        }
+
+    # ----- internals -----
+    def _enqueue(self, kind: int, payload) -> bool:
+        if len(self._queue) >= self.max_queue:
+            self._queue.popleft()
+            self.dropped += 1
+        self._queue.append((kind, payload))
+        return self._pump()
+
+    def _pump(self) -> bool:
+        if self.sock is None and not self._connect():
+            return False
+        try:
+            self._read_acks(0)
+            while self._queue and len(self._unacked) < self._window:
+                kind, payload = self._queue.popleft()
+                seq = self.next_seq
+                self.next_seq += 1
+                frame = encode_reading_frame(seq, payload) if kind == READING_FRAME else encode_status_frame(seq, payload)
+                self._unacked.append((seq, kind, payload))
+                self._write(frame)
+        except (OSError, ValueError) as e:
+            print(f"[STREAM_TRANSPORT] Connection lost: {e}")
+            self._connection_failed()
+            return False
+        return True
+
+    def _write(self, frame: bytes):
+        self.sock.sendall(frame)
+        self.frames_sent += 1
+        self.bytes_sent += len(frame)
+
+    def _read_acks(self, timeout: float):
+        if self.sock is None:
+            return
+        readable, _, _ = select.select([self.sock], [], [], timeout)
+        if not readable:
+            return
+        data = self.sock.recv(65536)
+        if not data:
+            raise ConnectionResetError("receiver closed the stream")
+        for kind, body in self._frames.feed(data):
+            if kind == ACK:
+                seq, _ = decode_body(kind, body)
+                self._release(seq)
+
+    def _release(self, seq: int):
+        while self._unacked and self._unacked[0][0] <= seq:
+            self._unacked.popleft()
+            self.acked += 1
+
+    def _connect(self) -> bool:
+        if time.monotonic() < self._retry_at:
+            return False
+        try:
+            self.sock = socket.create_connection(self.address, timeout=self.timeout)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._frames = FrameBuffer()
+            first = self._unacked[0][0] if self._unacked else self.next_seq
+            self._write(encode_json(HELLO, {**self.info, "session": self.session, "first_seq": first,
+                                            "window": self.window}))
+            welcome = self._read_welcome()
+            self._window = max(1, min(self.window, int(welcome.get("window", self.window))))
+            self._release(int(welcome.get("acked", 0)))
+            # Everything still unacknowledged goes out again on the new connection
+            for seq, kind, payload in self._unacked:
+                frame = encode_reading_frame(seq, payload) if kind == READING_FRAME else encode_status_frame(seq, payload)
+                self._write(frame)
+                self.resent += 1
+        except (OSError, ValueError) as e:
+            print(f"[STREAM_TRANSPORT] Connect to {self.address[0]}:{self.address[1]} failed: {e}")
+            self._connection_failed()
+            return False
+        self.connects += 1
+        self._failures = 0
+        return True
+
+    def _read_welcome(self) -> dict:
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            data = self.sock.recv(65536)
+            if not data:
+                raise ConnectionResetError("receiver closed the stream during handshake")
+            for kind, body in self._frames.feed(data):
+                if kind == WELCOME:
+                    return decode_body(kind, body)[1]
+        raise TimeoutError("no WELCOME from receiver")
+
+    def _connection_failed(self):
+        self._disconnect()
+        self._retry_at = time.monotonic() + self.policy.backoff(self._failures)
+        self._failures += 1
+
+    def _disconnect(self):
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
@@ -0,0 +1,406 @@
+"""
+Gorilla-style Time-Series Codec for Meter Readings
+Delta-of-delta timestamps and XOR-compressed float channels
+"""
+
+import sys
+import csv
+import json
+import time
+import struct
+import argparse
+
+from reading_store import READING_FIELDS, StoreReader, reading_epoch, format_epoch
+
+
+MAGIC = b"MGZ"
+VERSION = 1
+HEADER = struct.Struct("<3sBI")
+
+_DOUBLE = struct.Struct(">d")
+_UINT64 = struct.Struct(">Q")
+
+# (control bits, control width, value width) for delta-of-delta buckets
+_DOD_BUCKETS = (
+    (0b10, 2, 7),
+    (0b110, 3, 9),
+    (0b1110, 4, 12),
+)
+
+
+def _float_bits(value):
+    return _UINT64.unpack(_DOUBLE.pack(value))[0]
+
+
+def _bits_float(bits):
+    return _DOUBLE.unpack(_UINT64.pack(bits))[0]
+
+
+def _leading_zeros(value):
+    return 64 - value.bit_length()
+
+
+def _trailing_zeros(value):
+    return (value & -value).bit_length() - 1
+
+
+# =========================
+# BIT STREAMS
+# =========================
+class BitWriter:
+
+    def __init__(self):
+        self.buf = bytearray()
+        self._acc = 0
+        self._bits = 0
+
+    def write(self, value, width):
+        self._acc = (self._acc << width) | value
+        self._bits += width
+        while self._bits >= 8:
+            self._bits -= 8
+            self.buf.append((self._acc >> self._bits) & 0xFF)
+        self._acc &= (1 << self._bits) - 1
+
+    def getvalue(self):
+        if self._bits:
+            return bytes(self.buf) + bytes([(self._acc << (8 - self._bits)) & 0xFF])
+        return bytes(self.buf)
+
+
+class BitReader:
+
+    def __init__(self, data, offset=0):
+        self.data = data
+        self._pos = offset
+        self._acc = 0
+        self._bits = 0
+
+    def read(self, width):
+        while self._bits < width:
+            self._acc = (self._acc << 8) | self.data[self._pos]
+            self._pos += 1
+            self._bits += 8
+        self._bits -= width
+        value = self._acc >> self._bits
+        self._acc &= (1 << self._bits) - 1
+        return value
+
+
+# =========================
+# CHANNEL ENCODERS
+# =========================
+class _TimestampChannel:
+
+    def __init__(self):
+        self.prev = None
+        self.prev_delta = None
+
+    def encode(self, out, ts):
+
+        if self.prev is None:
+            out.write(ts & 0xFFFFFFFFFFFFFFFF, 64)
+        elif self.prev_delta is None:
+            self.prev_delta = ts - self.prev
+            out.write(self.prev_delta & 0xFFFFFFFF, 32)
+        else:
+            delta = ts - self.prev
+            dod = delta - self.prev_delta
+            self.prev_delta = delta
+
+            if dod == 0:
+                out.write(0, 1)
+            else:
+                for control, control_width, width in _DOD_BUCKETS:
+                    low = -(1 << (width - 1)) + 1
+                    if low <= dod <= (1 << (width - 1)):
+                        out.write(control, control_width)
+                        out.write(dod - low, width)
+                        break
+                else:
+                    out.write(0b1111, 4)
+                    out.write(dod & 0xFFFFFFFF, 32)
+
+        self.prev = ts
+
+    def decode(self, src):
+
+        if self.prev is None:
+            ts = src.read(64)
+            if ts >= 1 << 63:
+                ts -= 1 << 64
+        elif self.prev_delta is None:
+            self.prev_delta = _signed32(src.read(32))
+            ts = self.prev + self.prev_delta
+        else:
+            if src.read(1) == 0:
+                dod = 0
+            else:
+                for _, _, width in _DOD_BUCKETS:
+                    if src.read(1) == 0:
+                        dod = src.read(width) - (1 << (width - 1)) + 1
+                        break
+                else:
+                    dod = _signed32(src.read(32))
+            self.prev_delta += dod
+            ts = self.prev + self.prev_delta
+
+        self.prev = ts
+        return ts
+
+
+def _signed32(value):
+    return value - (1 << 32) if value >= 1 << 31 else value
+
+
+class _FloatChannel:
+
+    def __init__(self):
+        self.prev = None
+        self.leading = None
+        self.trailing = None
+
+    def encode(self, out, value):
+
+        bits = _float_bits(value)
+
+        if self.prev is None:
+            out.write(bits, 64)
+            self.prev = bits
+            return
+
+        xor = bits ^ self.prev
+        self.prev = bits
+
+        if xor == 0:
+            out.write(0, 1)
+            return
+
+        leading = min(_leading_zeros(xor), 31)
+        trailing = _trailing_zeros(xor)
+
+        if self.leading is not None and leading >= self.leading and trailing >= self.trailing:
+            # Meaningful bits fit inside the previous window
+            out.write(0b10, 2)
+            out.write(xor >> self.trailing, 64 - self.leading - self.trailing)
+            return
+
+        significant = 64 - leading - trailing
+        out.write(0b11, 2)
+        out.write(leading, 5)
+        out.write(significant & 0x3F, 6)
+        out.write(xor >> trailing, significant)
+
+        self.leading = leading
+        self.trailing = trailing
+
+    def decode(self, src):
+
+        if self.prev is None:
+            self.prev = src.read(64)
+            return _bits_float(self.prev)
+
+        if src.read(1) == 0:
+            return _bits_float(self.prev)
+
+        if src.read(1) == 1:
+            self.leading = src.read(5)
+            significant = src.read(6) or 64
+            self.trailing = 64 - self.leading - significant
+
+        significant = 64 - self.leading - self.trailing
+        self.prev ^= src.read(significant) << self.trailing
+        return _bits_float(self.prev)
+
+
+# =========================
+# READING ENCODER / DECODER
+# =========================
+class ReadingEncoder:
+    """
+    Incrementally encodes readings into one block. Each reading writes its
+    timestamp followed by every channel in READING_FIELDS order.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._out = BitWriter()
+        self._timestamps = _TimestampChannel()
+        self._channels = [_FloatChannel() for _ in READING_FIELDS]
+
+    def add(self, reading):
+        self._timestamps.encode(self._out, reading_epoch(reading))
+        for channel, name in zip(self._channels, READING_FIELDS):
+            channel.encode(self._out, float(reading[name]))
+        self.count += 1
+
+    def finish(self):
+        return HEADER.pack(MAGIC, VERSION, self.count) + self._out.getvalue()
+
+
+def encode_readings(readings):
+    """Encode an iterable of generate_reading dicts into one compressed block"""
+    encoder = ReadingEncoder()
+    for reading in readings:
+        encoder.add(reading)
+    return encoder.finish()
+
+
+def decode_readings(data):
+    """Lazily yield generate_reading-style dicts from a compressed block"""
+
+    magic, version, count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a meter reading block (magic={magic!r}, version={version})")
+
+    src = BitReader(data, HEADER.size)
+    timestamps = _TimestampChannel()
+    channels = [_FloatChannel() for _ in READING_FIELDS]
+
+    for _ in range(count):
+        reading = {"timestamp": format_epoch(timestamps.decode(src))}
+        for channel, name in zip(channels, READING_FIELDS):
+            reading[name] = channel.decode(src)
+        yield reading
+
+
+# =========================
+# BLOCK SPOOL FILES
+# =========================
+_FRAME = struct.Struct("<I")
+
+
+class BlockFileSink:
+    """
+    Pipeline sink that spools readings to a file of compressed blocks, each
+    prefixed with its length. A block is written every block_size readings
+    and on close(), so a crash loses at most the readings of one block.
+    """
+
+    def __init__(self, path, block_size=64):
+        self.path = path
+        self.block_size = block_size
+        self._file = open(path, "ab")
+        self._encoder = ReadingEncoder()
+
+    def __call__(self, reading):
+        self._encoder.add(reading)
+        if self._encoder.count >= self.block_size:
+            self.flush()
+
+    def flush(self):
+        if not self._encoder.count:
+            return
+        block = self._encoder.finish()
+        self._file.write(_FRAME.pack(len(block)) + block)
+        self._file.flush()
+        self._encoder = ReadingEncoder()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+def read_block_file(data):
+    """Yield readings from a BlockFileSink spool, or from one block written by `pack`"""
+
+    if data[:len(MAGIC)] == MAGIC:
+        yield from decode_readings(data)
+        return
+
+    offset = 0
+    while offset + _FRAME.size <= len(data):
+        length, = _FRAME.unpack_from(data, offset)
+        offset += _FRAME.size
+        if offset + length > len(data):
+            # Torn final write
+            break
+        yield from decode_readings(data[offset:offset + length])
+        offset += length
+
+
+# =========================
+# BENCHMARK
+# =========================
+def benchmark(count=10000):
+
+    from meter import MeterDataGenerator
+
+    generator = MeterDataGenerator()
+    start = int(time.time()) - count * 35
+    readings = []
+    for i in range(count):
+        reading = generator.generate_reading()
+        reading["timestamp"] = format_epoch(start + i * 35)
+        readings.append(reading)
+
+    json_size = len(json.dumps(readings).encode())
+    raw_size = count * 8 * (len(READING_FIELDS) + 1)
+
+    t0 = time.perf_counter()
+    block = encode_readings(readings)
+    encode_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    decoded = list(decode_readings(block))
+    decode_time = time.perf_counter() - t0
+
+    assert decoded == readings, "round trip mismatch"
+
+    print(f"Readings:        {count}")
+    print(f"JSON size:       {json_size} bytes")
+    print(f"Raw binary size: {raw_size} bytes")
+    print(f"Encoded size:    {len(block)} bytes ({len(block) / count:.1f} bytes/reading)")
+    print(f"Ratio vs JSON:   {json_size / len(block):.1f}x")
+    print(f"Ratio vs raw:    {raw_size / len(block):.1f}x")
+    print(f"Encode:          {count / encode_time:,.0f} readings/s")
+    print(f"Decode:          {count / decode_time:,.0f} readings/s")
+
+
+# =========================
+# COMMAND LINE
+# =========================
+def main():
+
+    parser = argparse.ArgumentParser(description="Compress meter readings for spooling and upload")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    pack = sub.add_parser("pack", help="Compress a reading store into a block file")
+    pack.add_argument("store", help="Reading store directory")
+    pack.add_argument("-o", "--output", required=True)
+
+    unpack = sub.add_parser("unpack", help="Decompress a packed block or a blocks: spool file to CSV")
+    unpack.add_argument("block", help="Compressed block file")
+    unpack.add_argument("-o", "--output", help="CSV output file (default: stdout)")
+
+    bench = sub.add_parser("bench", help="Measure ratio and throughput on generated data")
+    bench.add_argument("--count", type=int, default=10000)
+
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        benchmark(args.count)
+
+    elif args.command == "pack":
+        with StoreReader(args.store) as reader:
+            block = encode_readings(reader.iter_readings())
+        with open(args.output, "wb") as f:
+            f.write(block)
+        print(f"[CODEC] Packed {HEADER.unpack_from(block)[2]} readings into {len(block)} bytes")
+
+    elif args.command == "unpack":
+        with open(args.block, "rb") as f:
+            block = f.read()
+        out = open(args.output, "w", newline="") if args.output else sys.stdout
+        try:
+            writer = csv.writer(out)
+            writer.writerow(("timestamp",) + READING_FIELDS)
+            for reading in read_block_file(block):
+                writer.writerow([reading["timestamp"]] + [reading[name] for name in READING_FIELDS])
+        finally:
+            if args.output:
+                out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+UDP Meter Transport
+Compact, sequence-numbered datagrams carrying one or more meter readings for PROTOCOL=UDP
+"""
+
+import json
+import time
+import random
+import socket
+import struct
+from collections import deque
+
+MAGIC = b"MR"
+VERSION = 1
+
+# Datagram kinds
+HELLO = 1           # sender -> receiver: device identity (token, name, ip) as JSON
+DATA = 2            # sender -> receiver: `count` readings numbered first_seq, first_seq + 1, ...
+HELLO_REQUEST = 3   # receiver -> sender: unknown session, please send HELLO again
+
+# magic, version, kind, session, first seq, count
+HEADER = struct.Struct("!2sBBIIB")
+
+# Readings travel as integers scaled to the generator's precision (see
+# MeterDataGenerator.generate_reading), after a unix-seconds timestamp
+READING_FIELDS = (
+    ("voltage_v", 10),
+    ("current_a", 100),
+    ("active_power_kw", 100),
+    ("reactive_power_kvar", 100),
+    ("apparent_power_kva", 100),
+    ("power_factor", 100),
+    ("frequency_hz", 10),
+    ("cumulative_kwh", 10),
+)
+READING = struct.Struct("!I" + "i" * (len(READING_FIELDS) - 1) + "q")
+
+# Fits the common 1280-byte IPv6 minimum MTU with room for IP/UDP headers
+DEFAULT_MAX_DATAGRAM = 1200
+
+
+def readings_per_datagram(max_datagram: int = DEFAULT_MAX_DATAGRAM) -> int:
+    return min(255, (max_datagram - HEADER.size) // READING.size)
+
+
+# =========================
+# ENCODING
+# =========================
+def _timestamp(reading: dict) -> int:
+    stamp = reading.get("timestamp")
+    if isinstance(stamp, str):
+        try:
+            return int(time.mktime(time.strptime(stamp, "%Y-%m-%d %H:%M:%S")))
+        except ValueError:
+            pass
+    return int(time.time())
+
+
+def encode_reading(reading: dict) -> bytes:
+    return READING.pack(_timestamp(reading), *(round(reading[name] * scale) for name, scale in READING_FIELDS))
+
+
+def decode_reading(data: bytes, offset: int = 0) -> dict:
+    stamp, *values = READING.unpack_from(data, offset)
+    reading = {"timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(stamp))}
+    for (name, scale), value in zip(READING_FIELDS, values):
+        reading[name] = value / scale
+    return reading
+
+
+def encode_data(session: int, first_seq: int, readings: list) -> bytes:
+    parts = [HEADER.pack(MAGIC, VERSION, DATA, session, first_seq & 0xFFFFFFFF, len(readings))]
+    parts.extend(encode_reading(reading) for reading in readings)
+    return b"".join(parts)
+
+
+def encode_hello(session: int, next_seq: int, info: dict) -> bytes:
+    body = json.dumps(info, separators=(",", ":")).encode()
+    return HEADER.pack(MAGIC, VERSION, HELLO, session, next_seq & 0xFFFFFFFF, 0) + body
+
+
+def encode_hello_request(session: int) -> bytes:
+    return HEADER.pack(MAGIC, VERSION, HELLO_REQUEST, session, 0, 0)
+
+
+def decode(datagram: bytes):
+    """(kind, session, first_seq, body) where body is a reading list, a dict or None; ValueError if malformed"""
+    if len(datagram) < HEADER.size:
+        raise ValueError("datagram shorter than header")
+    magic, version, kind, session, first_seq, count = HEADER.unpack_from(datagram)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a meter datagram")
+
+    if kind == DATA:
+        if len(datagram) != HEADER.size + count * READING.size:
+            raise ValueError(f"expected {count} readings, got {len(datagram) - HEADER.size} bytes")
+        readings = [decode_reading(datagram, HEADER.size + i * READING.size) for i in range(count)]
+        return kind, session, first_seq, readings
+    if kind == HELLO:
+        try:
+            info = json.loads(datagram[HEADER.size:])
+        except ValueError:
+            raise ValueError("HELLO body is not JSON")
+        if not isinstance(info, dict):
+            raise ValueError("HELLO body is not an object")
+        return kind, session, first_seq, info
+    if kind == HELLO_REQUEST:
+        return kind, session, first_seq, None
+    raise ValueError(f"unknown datagram kind {kind}")
+
+
+# =========================
+# SENDER
+# =========================
+class UdpSender:
+    """
+    Fire-and-forget sender. Every reading gets the next sequence number and
+    readings are packed `batch` at a time; each datagram also repeats up to
+    `redundancy` of the readings sent just before it, so an isolated lost
+    datagram is repaired by the next one without any acknowledgements.
+
+    Device identity goes out in a HELLO when the sender starts, every
+    `hello_interval` seconds and whenever the receiver asks for it (after a
+    receiver restart), which keeps the token out of the data datagrams.
+    """
+
+    def __init__(self, address: tuple, info: dict, max_datagram: int = DEFAULT_MAX_DATAGRAM, batch: int = 1,
+                 redundancy: int = 2, hello_interval: float = 300.0):
+        self.address = address
+        self.info = info
+        self.capacity = readings_per_datagram(max_datagram)
+        if self.capacity < 1:
+            raise ValueError(f"max_datagram {max_datagram} cannot hold a reading")
+        self.batch = max(1, min(batch, self.capacity))
+        self.redundancy = redundancy
+        self.hello_interval = hello_interval
+        self.session = random.getrandbits(32)
+        self.next_seq = 0
+
+        family, kind, proto, _, sockaddr = socket.getaddrinfo(address[0], address[1], type=socket.SOCK_DGRAM)[0]
+        self.sock = socket.socket(family, kind, proto)
+        # Connected so the receiver's HELLO_REQUESTs (and ICMP errors) come back to us
+        self.sock.connect(sockaddr)
+        self.sock.setblocking(False)
+
+        self._pending = []
+        self._recent = deque(maxlen=redundancy)
+        self._hello_due = 0.0
+
+        self.datagrams = 0
+        self.bytes = 0
+        self.readings = 0
+        self.hellos = 0
+        self.errors = 0
+
+    def send(self, reading: dict) -> bool:
+        """Queue a reading; sends once `batch` readings are waiting. False if the socket reported an error"""
+        self._pending.append(reading)
+        if len(self._pending) >= self.batch:
+            return self.flush()
+        return True
+
+    def flush(self) -> bool:
+        self._poll()
+        ok = True
+        if time.monotonic() >= self._hello_due:
+            ok = self._hello()
+
+        while self._pending:
+            chunk = self._pending[:self.capacity]
+            del self._pending[:len(chunk)]
+            repeat = list(self._recent)[-(self.capacity - len(chunk)):] if self.redundancy and len(chunk) < self.capacity else []
+            first_seq = self.next_seq - len(repeat)
+            ok = self._send(encode_data(self.session, first_seq, repeat + chunk)) and ok
+            self.next_seq += len(chunk)
+            self.readings += len(chunk)
+            self._recent.extend(chunk)
+        return ok
+
+    def close(self):
+        self.flush()
+        self.sock.close()
+
+    def _hello(self) -> bool:
+        self._hello_due = time.monotonic() + self.hello_interval
+        self.hellos += 1
+        return self._send(encode_hello(self.session, self.next_seq, self.info))
+
+    def _send(self, datagram: bytes) -> bool:
+        try:
+            self.sock.send(datagram)
+        except OSError as e:
+            # Typically ECONNREFUSED from an ICMP port unreachable: nobody is listening yet
+            self.errors += 1
+            print(f"[UDP_TRANSPORT] Send to {self.address[0]}:{self.address[1]} failed: {e}")
+            return False
+        self.datagrams += 1
+        self.bytes += len(datagram)
+        return True
+
+    def _poll(self):
+        for _ in range(64):
+            try:
+                datagram = self.sock.recv(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # A pending error from an earlier refused datagram; reading clears it
+                continue
+            try:
+                kind, session, _, _ = decode(datagram)
+            except ValueError:
+                continue
+            if kind == HELLO_REQUEST and session == self.session:
+                self._hello_due = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "session": f"{self.session:08x}",
+            "readings": self.readings,
+            "datagrams": self.datagrams,
+            "hellos": self.hellos,
+            "bytes": self.bytes,
+            "errors": self.errors,
+        }
+
+
+def parse_target(target: str, default_port: int = 5140) -> tuple:
+    """'host', 'host:port' or '[v6]:port' -> (host, port)"""
+    if target.startswith("["):
+        host, _, rest = target[1:].partition("]")
+        return host, int(rest.lstrip(":") or default_port)
+    if target.count(":") == 1:
+        host, port = target.split(":")
+        return host, int(port)
+    return target, default_port
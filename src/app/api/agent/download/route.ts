@@ -5,6 +5,7 @@ import archiver from 'archiver'
 export async function GET() {
   try {
     const agentDir = path.join(process.cwd(), 'agent')
+    const commonDir = path.join(process.cwd(), 'common')
 
     const archive = archiver('zip', { zlib: { level: 9 } })
     const pass = new stream.PassThrough()
@@ -16,6 +17,8 @@ export async function GET() {
     archive.pipe(pass)
     // include the agent folder contents under a top-level `agent/` folder in the zip
     archive.directory(agentDir, 'agent')
+    // shared client modules (retry/backoff etc.) sit next to the scripts
+    archive.directory(commonDir, 'agent')
     archive.finalize()
 
     return new Response(pass as any, {
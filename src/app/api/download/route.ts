@@ -5,6 +5,7 @@ import archiver from 'archiver'
 export async function GET() {
   try {
     const meterDir = path.join(process.cwd(), 'meter')
+    const commonDir = path.join(process.cwd(), 'common')
 
     const archive = archiver('zip', { zlib: { level: 9 } })
     const pass = new stream.PassThrough()
@@ -16,6 +17,8 @@ export async function GET() {
     archive.pipe(pass)
     // include the meter folder contents under a top-level `meter/` folder in the zip
     archive.directory(meterDir, 'meter')
+    // shared client modules (retry/backoff etc.) sit next to the scripts
+    archive.directory(commonDir, 'meter')
     archive.finalize()
 
     return new Response(pass as any, {
@@ -0,0 +1,64 @@
+// app/api/monitor/batch/route.ts
+import { NextRequest, NextResponse } from 'next/server';
+import { gunzipSync } from 'zlib';
+import { POST as register } from '../register/route';
+import { POST as connections } from '../connections/route';
+import { POST as status } from '../status/route';
+import { POST as meter } from '../meter/route';
+
+// Relays forward many device requests in one (optionally gzipped) body;
+// each item is run through the same handler as its individual endpoint
+const HANDLERS: Record<string, (request: NextRequest) => Promise<Response>> = {
+  '/api/monitor/register': register,
+  '/api/monitor/connections': connections,
+  '/api/monitor/status': status,
+  '/api/monitor/meter': meter,
+};
+
+const MAX_ITEMS = 5000;
+
+export async function POST(request: NextRequest) {
+  try {
+    let raw = Buffer.from(await request.arrayBuffer());
+    if (request.headers.get('content-encoding') === 'gzip') {
+      raw = gunzipSync(raw);
+    }
+    const { items } = JSON.parse(raw.toString('utf8'));
+
+    if (!Array.isArray(items) || items.length > MAX_ITEMS) {
+      return NextResponse.json(
+        { error: `items must be an array of at most ${MAX_ITEMS} requests` },
+        { status: 400 }
+      );
+    }
+
+    const results: { status: number; error?: string }[] = [];
+    for (const item of items) {
+      const handler = item && HANDLERS[item.path];
+      if (!handler) {
+        results.push({ status: 404, error: 'Unknown path' });
+        continue;
+      }
+
+      const response = await handler(new NextRequest(new URL(item.path, request.url), {
+        method: 'POST',
+        headers: { 'content-type': 'application/json' },
+        body: JSON.stringify(item.body ?? {}),
+      }));
+
+      if (response.status === 200) {
+        results.push({ status: 200 });
+      } else {
+        const body = await response.json().catch(() => ({}));
+        results.push({ status: response.status, error: body.error });
+      }
+    }
+
+    return NextResponse.json({ success: true, results });
+  } catch (error) {
+    return NextResponse.json(
+      { error: 'Internal server error' },
+      { status: 500 }
+    );
+  }
+}
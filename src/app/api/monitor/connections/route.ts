@@ -8,6 +8,7 @@ export async function POST(request: NextRequest) {
     // Support both 'token' (old) and 'userId' (new) field names for backward compatibility
     const userId = body.userId || body.token;
     const { sourceIp, sourcePort, destIp, destPort, protocol } = body;
+    const { namespace, container, destScope, destSite, destCountry, destAsn, destOrg } = body;
 
     if (!userId) {
       return NextResponse.json(
@@ -42,7 +43,8 @@ export async function POST(request: NextRequest) {
       sourcePort || 0,
       destIp,
       destPort || 0,
-      protocol.toUpperCase() as 'TCP' | 'UDP'
+      protocol.toUpperCase() as 'TCP' | 'UDP',
+      { namespace, container, destScope, destSite, destCountry, destAsn, destOrg }
     );
 
     return NextResponse.json({
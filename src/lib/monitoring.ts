@@ -28,6 +28,16 @@ export interface NetworkConnection {
   packetsIn: number;
   packetsOut: number;
   state: string;
+  // Set by agents scanning container network namespaces
+  namespace?: string;
+  container?: string;
+  // Scope of destIp (public, private, loopback, ...) and the operator site it falls in
+  destScope?: string;
+  destSite?: string;
+  // From the agent's offline GeoIP/ASN database, for public destinations
+  destCountry?: string;
+  destAsn?: number;
+  destOrg?: string;
   timestamp: Date;
   lastUpdated: Date;
 }
@@ -149,7 +159,16 @@ export function addNetworkConnection(
   sourcePort: number,
   destIp: string,
   destPort: number,
-  protocol: 'TCP' | 'UDP'
+  protocol: 'TCP' | 'UDP',
+  tags?: {
+    namespace?: string;
+    container?: string;
+    destScope?: string;
+    destSite?: string;
+    destCountry?: string;
+    destAsn?: number;
+    destOrg?: string;
+  }
 ): NetworkConnection {
   const connection: NetworkConnection = {
     id: `${userId}-${Date.now()}-${Math.random().toString(36).substr(2, 9)}`,
@@ -164,6 +183,13 @@ export function addNetworkConnection(
     packetsIn: 0,
     packetsOut: 0,
     state: 'ESTABLISHED',
+    ...(tags?.namespace ? { namespace: tags.namespace } : {}),
+    ...(tags?.container ? { container: tags.container } : {}),
+    ...(tags?.destScope ? { destScope: tags.destScope } : {}),
+    ...(tags?.destSite ? { destSite: tags.destSite } : {}),
+    ...(tags?.destCountry ? { destCountry: tags.destCountry } : {}),
+    ...(tags?.destAsn ? { destAsn: tags.destAsn } : {}),
+    ...(tags?.destOrg ? { destOrg: tags.destOrg } : {}),
     timestamp: new Date(),
     lastUpdated: new Date()
   };
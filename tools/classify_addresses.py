@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Address Classifier
+Tags IP addresses with their scope (private, loopback, link-local, ...) and operator site,
+the way the agent does with --sites
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(REPO_ROOT, "common"))
+
+from addresses import AddressClassifier, load_sites, parse_address
+
+
+def synthetic_addresses(count: int, rng: random.Random) -> list:
+    """A mix like a busy host's table: mostly IPv4, some private, some IPv6"""
+    addresses = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.3:
+            addresses.append(f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}")
+        elif roll < 0.8:
+            addresses.append(".".join(str(rng.randrange(1, 224)) for _ in range(4)))
+        else:
+            addresses.append(f"2001:db8:{rng.randrange(65536):x}::{rng.randrange(1, 65536):x}")
+    return addresses
+
+
+def benchmark(distinct: int, lookups: int, sites: int):
+    rng = random.Random(1)
+    site_list = [(f"{rng.randrange(1, 224)}.{rng.randrange(256)}.{rng.randrange(256)}.0/24", f"site-{i}")
+                 for i in range(sites)]
+    started = time.perf_counter()
+    classifier = AddressClassifier(site_list)
+    print(f"Loaded {len(site_list):,} site ranges in {time.perf_counter() - started:.2f}s")
+
+    addresses = synthetic_addresses(distinct, rng)
+    stream = [addresses[rng.randrange(distinct)] for _ in range(lookups)]
+    parsed = [parse_address(ip) for ip in stream]
+    scopes, site_tries = classifier._scopes, classifier._sites
+
+    def timed(label, run):
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        print(f"{label:<34}{lookups / elapsed:>14,.0f}")
+
+    def trie_only():
+        for version, value in parsed:
+            scopes[version].lookup(value)
+            site_tries[version].lookup(value)
+
+    def uncached():
+        parse = parse_address.__wrapped__
+        for ip in stream:
+            version, value = parse(ip)
+            scopes[version].lookup(value)
+            site_tries[version].lookup(value)
+
+    def cached():
+        classify = classifier.classify
+        for ip in stream:
+            classify(ip)
+
+    print(f"{'':<34}{'lookups/s':>14}")
+    timed("trie lookups (pre-parsed)", trie_only)
+    timed("parse + trie lookups", uncached)
+    classifier.classify.cache_clear()
+    timed(f"classify, {distinct:,} distinct addresses", cached)
+    info = classifier.classify.cache_info()
+    print(f"Cache hit rate {info.hits / max(1, info.hits + info.misses):.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify IP addresses or benchmark the classifier")
+    parser.add_argument("addresses", nargs="*", help="Addresses to classify (default: read stdin)")
+    parser.add_argument("--sites", help="Operator site list: `CIDR [label]` per line")
+    parser.add_argument("--bench", action="store_true", help="Benchmark parsing, trie lookups and the cache")
+    parser.add_argument("--distinct", type=int, default=5000, help="Distinct addresses in the benchmark")
+    parser.add_argument("--lookups", type=int, default=1000000, help="Lookups in the benchmark")
+    parser.add_argument("--site-ranges", type=int, default=10000, help="Synthetic site ranges in the benchmark")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.distinct, args.lookups, args.site_ranges)
+        return
+
+    classifier = AddressClassifier(load_sites(args.sites) if args.sites else ())
+    failed = False
+    for ip in args.addresses or (line.strip() for line in sys.stdin if line.strip()):
+        address = classifier.classify(ip)
+        if address is None:
+            failed = True
+            print(f"{ip}\tinvalid")
+        else:
+            print(f"{ip}\tIPv{address.version}\t{address.scope}\t{address.site or '-'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
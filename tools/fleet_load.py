@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Fleet Load Generator
+Drives simulated agents and meters through the real client classes against a target server
+"""
+
+import os
+import sys
+import math
+import heapq
+import json
+import time
+import queue
+import random
+import argparse
+import threading
+import importlib.util
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "agent"))
+sys.path.insert(0, os.path.join(REPO_ROOT, "meter"))
+sys.path.insert(0, os.path.join(REPO_ROOT, "common"))
+
+from generate_token import TokenMinter
+from meter import WebAppIntegrator, MeterDataGenerator
+from resilience import Resilience, RetryPolicy, CircuitBreaker
+
+KINDS = ("register", "status", "connection", "meter")
+COMMON_PORTS = (443, 443, 443, 80, 53, 123, 8883, 5228)
+
+
+def load_agent_module():
+    """Import agent/monitor-agent.py, whose file name is not a valid module name"""
+    spec = importlib.util.spec_from_file_location("monitor_agent", os.path.join(REPO_ROOT, "agent", "monitor-agent.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# =========================
+# LATENCY RECORDING
+# =========================
+class LatencyHistogram:
+    """Log-bucketed latencies (~2.5% resolution) that merge across processes"""
+
+    MIN_SECONDS = 1e-4
+    GROWTH = 1.05
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float, ok: bool = True):
+        index = 0 if seconds <= self.MIN_SECONDS else int(math.log(seconds / self.MIN_SECONDS, self.GROWTH)) + 1
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.errors += not ok
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.errors += other.errors
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile, in seconds"""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.MIN_SECONDS * self.GROWTH ** index, self.max)
+        return self.max
+
+
+class Recorder:
+    """Thread-safe per-kind histograms, drained by the shard at each report"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self.lag = LatencyHistogram()
+
+    def record(self, kind: str, seconds: float, ok: bool):
+        with self._lock:
+            histogram = self._histograms.get(kind)
+            if histogram is None:
+                histogram = self._histograms[kind] = LatencyHistogram()
+            histogram.record(seconds, ok)
+
+    def record_lag(self, seconds: float):
+        with self._lock:
+            self.lag.record(seconds)
+
+    def drain(self):
+        with self._lock:
+            histograms, lag = self._histograms, self.lag
+            self._histograms, self.lag = {}, LatencyHistogram()
+        return histograms, lag
+
+
+def timed(recorder: Recorder, kind: str, call, *args):
+    started = time.perf_counter()
+    try:
+        ok = bool(call(*args))
+    except Exception:
+        ok = False
+    recorder.record(kind, time.perf_counter() - started, ok)
+    return ok
+
+
+# =========================
+# SIMULATED DEVICES
+# =========================
+def synthetic_ip(index: int, prefix: int = 10) -> str:
+    return f"{prefix}.{(index >> 16) & 255}.{(index >> 8) & 255}.{index & 255}"
+
+
+class SimulatedAgent:
+    """NetworkMonitor whose connection table is synthetic churn"""
+
+    def __init__(self, monitor, index: int, interval: float, churn: float, rng: random.Random):
+        self.monitor = monitor
+        self.interval = interval
+        self.churn = churn
+        self.local_ip = synthetic_ip(index)
+        self.rng = rng
+
+    def new_connections(self):
+        count = int(self.churn) + (self.rng.random() < self.churn % 1)
+        connections = []
+        for _ in range(count):
+            dest_port = self.rng.choice(COMMON_PORTS)
+            connections.append({
+                'sourceIp': self.local_ip,
+                'sourcePort': self.rng.randint(32768, 60999),
+                'destIp': f"{self.rng.randint(1, 223)}.{self.rng.randint(0, 255)}.{self.rng.randint(0, 255)}.{self.rng.randint(1, 254)}",
+                'destPort': dest_port,
+                'protocol': 'UDP' if dest_port in (53, 123) else 'TCP'
+            })
+        return connections
+
+    def step(self, recorder: Recorder):
+        if not self.monitor.registered:
+            timed(recorder, "register", self.monitor.register_device)
+            return
+        for connection in self.new_connections():
+            timed(recorder, "connection", self.monitor.send_connection, connection)
+
+
+class SimulatedMeter:
+    """WebAppIntegrator fed by its own MeterDataGenerator"""
+
+    def __init__(self, web, interval: float):
+        self.web = web
+        self.interval = interval
+        self.generator = MeterDataGenerator()
+        self.registered = False
+
+    def step(self, recorder: Recorder):
+        if not self.registered:
+            self.registered = timed(recorder, "register", self.web.register_device)
+            if self.registered:
+                timed(recorder, "status", self.web.update_status, "online")
+            return
+        timed(recorder, "meter", self.web.send_meter_reading, self.generator.generate_reading())
+
+
+def passthrough_resilience() -> Resilience:
+    """
+    One attempt per call and breakers that never open, so every timed call is
+    exactly one request: client retries would hide errors and stretch latencies,
+    and an open breaker would quietly stop the load.
+    """
+    return Resilience(RetryPolicy(max_attempts=1),
+                      breaker_factory=lambda: CircuitBreaker(failure_threshold=float("inf")))
+
+
+def build_fleet(args, shard: int, session):
+    """Construct this shard's devices; returns [(start offset, device)]"""
+    agent_module = load_agent_module()
+    agent_module.REFRESH_INTERVAL = args.agent_interval
+    minter = TokenMinter()
+    rng = random.Random(args.seed * 1000003 + shard if args.seed is not None else None)
+
+    fleet = []
+    for i in range(shard, args.agents, args.shards):
+        monitor = agent_module.NetworkMonitor(args.server, minter.mint(f"load-agent-{i}", f"load-agent-{i}"),
+                                              f"load-agent-{i}")
+        monitor.http = session
+        monitor.resilience = passthrough_resilience()
+        offset = args.ramp_up * i / args.agents
+        fleet.append((offset, SimulatedAgent(monitor, i, args.agent_interval, args.churn, rng)))
+
+    for i in range(shard, args.meters, args.shards):
+        # resolve_ip honours DEVICE_IP, which keeps construction offline
+        os.environ["DEVICE_IP"] = synthetic_ip(i, 100)
+        web = WebAppIntegrator(args.server, f"load-meter-{i}", f"load-meter-{i}", args.protocol)
+        web.http = session
+        web.resilience = passthrough_resilience()
+        offset = args.ramp_up * i / args.meters
+        fleet.append((offset, SimulatedMeter(web, args.meter_interval)))
+
+    return fleet
+
+
+def make_session(pool_size: int):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# =========================
+# SHARD PROCESS
+# =========================
+def run_shard(args, shard: int, results, start_event):
+    # The client classes print on every send; keep the shard quiet
+    sys.stdout = open(os.devnull, "w")
+
+    session = make_session(args.concurrency)
+    fleet = build_fleet(args, shard, session)
+    recorder = Recorder()
+    finished = queue.SimpleQueue()
+    results.put(("ready", shard, len(fleet)))
+    start_event.wait()
+
+    started = time.monotonic()
+    deadline = started + args.duration
+    schedule = [(started + offset, seq, device) for seq, (offset, device) in enumerate(fleet)]
+    heapq.heapify(schedule)
+    launched = set()
+    active = 0
+    in_flight = 0
+    next_report = started + args.report_interval
+
+    def run(device, due, seq):
+        recorder.record_lag(time.monotonic() - due)
+        try:
+            device.step(recorder)
+        finally:
+            # Each device runs one step at a time, like the real client loops
+            finished.put((max(due + device.interval, time.monotonic()), seq, device))
+
+    def report(kind):
+        histograms, lag = recorder.drain()
+        results.put((kind, shard, active, histograms, lag))
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        while True:
+            now = time.monotonic()
+            while True:
+                try:
+                    heapq.heappush(schedule, finished.get_nowait())
+                    in_flight -= 1
+                except queue.Empty:
+                    break
+
+            while schedule and schedule[0][0] <= now < deadline:
+                due, seq, device = heapq.heappop(schedule)
+                if seq not in launched:
+                    launched.add(seq)
+                    active += 1
+                pool.submit(run, device, due, seq)
+                in_flight += 1
+
+            if now >= next_report:
+                report("tick")
+                next_report += args.report_interval
+            if now >= deadline and not in_flight:
+                break
+
+            wake = min(next_report, schedule[0][0] if schedule and now < deadline else next_report)
+            try:
+                item = finished.get(timeout=max(0.0, min(wake - time.monotonic(), 0.05)))
+                heapq.heappush(schedule, item)
+                in_flight -= 1
+            except queue.Empty:
+                pass
+
+    report("done")
+
+
+# =========================
+# COORDINATOR
+# =========================
+def print_table(histograms: dict, elapsed: float):
+    print(f"\n{'kind':<12}{'requests':>10}{'errors':>9}{'err %':>8}{'req/s':>9}"
+          f"{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'p99.9 ms':>10}{'max ms':>9}")
+    for kind in KINDS:
+        h = histograms.get(kind)
+        if not h or not h.count:
+            continue
+        print(f"{kind:<12}{h.count:>10}{h.errors:>9}{h.errors / h.count:>8.2%}{h.count / elapsed:>9.1f}"
+              f"{h.percentile(50) * 1000:>9.1f}{h.percentile(90) * 1000:>9.1f}{h.percentile(99) * 1000:>9.1f}"
+              f"{h.percentile(99.9) * 1000:>10.1f}{h.max * 1000:>9.1f}")
+
+
+def summarize(histograms: dict, lag: LatencyHistogram, elapsed: float) -> dict:
+    def describe(h):
+        return {
+            "requests": h.count,
+            "errors": h.errors,
+            "requests_per_sec": round(h.count / elapsed, 1),
+            **{f"p{q:g}_ms": round(h.percentile(q) * 1000, 2) for q in (50, 90, 99, 99.9)},
+            "max_ms": round(h.max * 1000, 2),
+        }
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "kinds": {kind: describe(h) for kind, h in histograms.items()},
+        "schedule_lag": describe(lag),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a fleet of agents and meters against a monitor server")
+    parser.add_argument("--server", default="http://localhost:3000")
+    parser.add_argument("--agents", type=int, default=0, help="Simulated monitor agents")
+    parser.add_argument("--meters", type=int, default=0, help="Simulated smart meters")
+    parser.add_argument("--agent-interval", type=float, default=10.0, help="Agent scan interval in seconds")
+    parser.add_argument("--meter-interval", type=float, default=35.0, help="Meter reading interval in seconds")
+    parser.add_argument("--churn", type=float, default=2.0, help="Mean new connections per agent scan")
+    parser.add_argument("--protocol", default="TCP", choices=["TCP", "UDP"], help="Meter PROTOCOL value")
+    parser.add_argument("--duration", type=float, default=120.0, help="Seconds to generate load for")
+    parser.add_argument("--ramp-up", type=float, default=30.0,
+                        help="Seconds over which devices start (0 starts every device at once)")
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--concurrency", type=int, default=64,
+                        help="Concurrent requests (and pooled connections) per shard")
+    parser.add_argument("--report-interval", type=float, default=5.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", help="Write the final summary to this file")
+    args = parser.parse_args()
+
+    if args.agents + args.meters == 0:
+        parser.error("give --agents and/or --meters")
+    args.shards = max(1, min(args.shards, args.agents + args.meters))
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    start_event = context.Event()
+    shards = [context.Process(target=run_shard, args=(args, shard, results, start_event), daemon=True)
+              for shard in range(args.shards)]
+    for process in shards:
+        process.start()
+
+    devices = 0
+    for _ in shards:
+        _, _, count = results.get()
+        devices += count
+    print(f"[*] {devices} devices ({args.agents} agents, {args.meters} meters) on {args.shards} shards "
+          f"-> {args.server}")
+    start_event.set()
+    started = time.monotonic()
+
+    totals = {}
+    total_lag = LatencyHistogram()
+    window = {}
+    active = {}
+    done = 0
+    last_print = started
+    try:
+        while done < len(shards):
+            kind, shard, shard_active, histograms, lag = results.get()
+            active[shard] = shard_active
+            total_lag.merge(lag)
+            for name, h in histograms.items():
+                totals.setdefault(name, LatencyHistogram()).merge(h)
+                window.setdefault(name, LatencyHistogram()).merge(h)
+            done += kind == "done"
+
+            now = time.monotonic()
+            if now - last_print >= args.report_interval * 0.9 or done == len(shards):
+                merged = LatencyHistogram()
+                for h in window.values():
+                    merged.merge(h)
+                if merged.count:
+                    print(f"[{now - started:6.0f}s] active {sum(active.values()):>7}  "
+                          f"{merged.count / (now - last_print):>8,.0f} req/s  "
+                          f"err {merged.errors / merged.count:6.2%}  "
+                          f"p50 {merged.percentile(50) * 1000:7.1f} ms  p99 {merged.percentile(99) * 1000:7.1f} ms",
+                          flush=True)
+                window, last_print = {}, now
+    except KeyboardInterrupt:
+        print("\n[*] Interrupted - partial results")
+        for process in shards:
+            process.terminate()
+
+    elapsed = time.monotonic() - started
+    print_table(totals, elapsed)
+    print(f"\nSchedule lag p99 {total_lag.percentile(99) * 1000:.1f} ms, max {total_lag.max * 1000:.1f} ms"
+          " (high lag means the generator, not the server, is the bottleneck)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summarize(totals, total_lag, elapsed), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
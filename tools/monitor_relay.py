@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+"""
+Site Relay
+Accepts /api/monitor/* from local agents and meters and forwards them upstream in
+deduplicated, compressed batches over a few persistent connections, spooling to disk during outages
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import zlib
+import signal
+import asyncio
+import argparse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(REPO_ROOT, "common"))
+
+from resilience import Resilience, RetryPolicy, CircuitOpenError, RETRYABLE_STATUS
+from standin_server import (
+    HttpError, read_request, render_response, now_iso, record_id, to_number,
+    METER_FIELDS, BATCH_PATH, MAX_BATCH_ITEMS,
+)
+
+REGISTER = "/api/monitor/register"
+CONNECTIONS = "/api/monitor/connections"
+STATUS = "/api/monitor/status"
+METER = "/api/monitor/meter"
+PATHS = (REGISTER, CONNECTIONS, STATUS, METER)
+
+
+# =========================
+# LOCAL HANDLING
+# =========================
+def validate(path: str, body: dict):
+    """The upstream routes' stateless 400 checks; returns the error message or None"""
+    user_id = body.get("userId") or body.get("token")
+    if path == REGISTER:
+        if not user_id:
+            return "Token and device name required"
+        if not body.get("deviceName"):
+            return "Device name is required"
+    elif path == CONNECTIONS:
+        if not user_id:
+            return "User ID required"
+        if not body.get("sourceIp") or not body.get("destIp") or not body.get("protocol"):
+            return "Missing connection data"
+        if str(body["protocol"]).upper() not in ("TCP", "UDP"):
+            return "Only TCP and UDP protocols are supported"
+    elif path == STATUS:
+        if body.get("status") not in ("online", "offline"):
+            return "Valid status required"
+    elif path == METER:
+        if not user_id and not body.get("deviceName"):
+            return "User ID required"
+        if any(field not in body for field in METER_FIELDS):
+            return "Missing meter reading data"
+        if body.get("protocol") and body["protocol"] not in ("TCP", "UDP"):
+            return "Only TCP and UDP protocols are supported"
+    return None
+
+
+def local_ack(path: str, body: dict) -> dict:
+    """The success body the upstream route would return, built without its state"""
+    user_id = body.get("userId") or body.get("token") or ""
+    now = now_iso()
+    if path == REGISTER:
+        return {"success": True, "reused": False, "data": {
+            "id": user_id, "username": "Device User", "deviceName": body["deviceName"], "status": "online",
+            "connections": [], "meterReadings": [], "lastSeen": now, "registeredAt": now,
+        }}
+    if path == CONNECTIONS:
+        return {"success": True, "data": {
+            "id": record_id(user_id), "userId": user_id,
+            "sourceIp": body["sourceIp"], "sourcePort": body.get("sourcePort") or 0,
+            "destIp": body["destIp"], "destPort": body.get("destPort") or 0,
+            "protocol": body["protocol"].upper(), "bytesIn": 0, "bytesOut": 0, "packetsIn": 0, "packetsOut": 0,
+            "state": "ESTABLISHED", "timestamp": now, "lastUpdated": now,
+        }}
+    if path == METER:
+        reading = {"id": record_id(user_id), "userId": user_id, "timestamp": now}
+        reading.update({field: to_number(body[field]) for field in METER_FIELDS})
+        reading["ip"] = body.get("ip") or "unknown"
+        reading["protocol"] = body.get("protocol") if body.get("protocol") in ("TCP", "UDP") else "TCP"
+        return {"success": True, "data": reading}
+    return {"success": True}
+
+
+def _key_part(value):
+    """value as a hashable key component; validate() only checks presence, so lists and objects get here"""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def dedupe_key(path: str, body: dict):
+    """
+    Requests with equal keys collapse while buffered. Status and registration
+    keep the latest request; connections keep the first (later copies are
+    client retries of the same report). Meter readings carry no timestamp or
+    sequence, so two equal ones may be two real readings of a quiet meter:
+    they get None and are never collapsed.
+    """
+    user_id = _key_part(body.get("userId") or body.get("token"))
+    if path == REGISTER:
+        return (path, user_id, _key_part(body.get("deviceName")))
+    if path == STATUS:
+        return (path, user_id or _key_part(body.get("deviceName")))
+    if path == CONNECTIONS:
+        fields = ("sourceIp", "sourcePort", "destIp", "destPort")
+        return (path, user_id, str(body.get("protocol")).upper()) + tuple(_key_part(body.get(f)) for f in fields)
+    return None
+
+
+class RelayBuffer:
+    """Pending upstream requests in arrival order, deduplicated by dedupe_key"""
+
+    LATEST_WINS = (REGISTER, STATUS)
+
+    def __init__(self):
+        self._items = OrderedDict()
+        self.deduplicated = 0
+        self._unique = 0
+
+    def add(self, path: str, body: dict):
+        key = dedupe_key(path, body)
+        if key is None:
+            self._unique += 1
+            key = ("unique", self._unique)
+        elif key in self._items:
+            self.deduplicated += 1
+            if path not in self.LATEST_WINS:
+                return
+            del self._items[key]
+        self._items[key] = {"path": path, "body": body}
+
+    def take(self, count: int) -> list:
+        return [self._items.popitem(last=False)[1] for _ in range(min(count, len(self._items)))]
+
+    def __len__(self):
+        return len(self._items)
+
+
+# =========================
+# DISK SPOOL
+# =========================
+class Spool:
+    """
+    Undelivered batches as gzip JSON files named <ns>-<count>.json.gz, so
+    they replay oldest first and survive a relay restart. Past max_bytes the
+    oldest batches are dropped; unreadable ones are renamed to *.corrupt and
+    skipped.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self.quarantined = 0
+        os.makedirs(directory, exist_ok=True)
+        self._files = sorted(name for name in os.listdir(directory) if name.endswith(".json.gz"))
+        self.bytes = sum(os.path.getsize(os.path.join(directory, name)) for name in self._files)
+
+    @staticmethod
+    def _count(name: str) -> int:
+        return int(name.split("-", 1)[1].split(".", 1)[0])
+
+    def pending_items(self) -> int:
+        return sum(self._count(name) for name in self._files)
+
+    def _write(self, stamp: int, items: list) -> str:
+        name = f"{stamp:020d}-{len(items)}.json.gz"
+        path = os.path.join(self.directory, name)
+        data = gzip.compress(json.dumps(items).encode(), 6)
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+        self.bytes += len(data)
+        return name
+
+    def push(self, items: list):
+        self._files.append(self._write(time.time_ns(), items))
+
+        while self.bytes > self.max_bytes and len(self._files) > 1:
+            oldest = self._files.pop(0)
+            self.dropped += self._count(oldest)
+            self._remove(oldest)
+
+    def peek(self):
+        """(name, items) of the oldest readable batch, or None"""
+        while self._files:
+            name = self._files[0]
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, "rb") as f:
+                    items = json.loads(gzip.decompress(f.read()))
+                if isinstance(items, list) and all(isinstance(item, dict) for item in items):
+                    return name, items
+            except (EOFError, ValueError, gzip.BadGzipFile, zlib.error):
+                pass
+            # Keep it for inspection, out of the replay order
+            print(f"[RELAY] Unreadable spool file {name} moved aside", file=sys.stderr)
+            self._files.pop(0)
+            self.bytes -= os.path.getsize(path)
+            os.replace(path, path + ".corrupt")
+            self.quarantined += 1
+        return None
+
+    def pop(self, name: str):
+        self._files.remove(name)
+        self._remove(name)
+
+    def requeue(self, name: str, items: list):
+        """Replace a partly delivered batch with its remainder, keeping its place"""
+        if len(items) == self._count(name):
+            return
+        index = self._files.index(name)
+        self._files[index] = self._write(int(name.split("-", 1)[0]), items)
+        self._remove(name)
+
+    def _remove(self, name: str):
+        path = os.path.join(self.directory, name)
+        self.bytes -= os.path.getsize(path)
+        os.unlink(path)
+
+    def __len__(self):
+        return len(self._files)
+
+
+# =========================
+# UPSTREAM
+# =========================
+class Upstream:
+    """Blocking upstream client; runs on the relay's worker threads"""
+
+    def __init__(self, base_url: str, connections: int = 2, timeout: float = 15.0, compress_level: int = 6):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.compress_level = compress_level
+        self.connections = connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=connections, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.resilience = Resilience(RetryPolicy(max_attempts=3, base_delay=0.25, max_delay=4.0))
+        # None until the first batch shows whether the server has /api/monitor/batch
+        self.batch_supported = None
+
+        self.batches = 0
+        self.forwarded = 0
+        self.rejected = 0
+        self.bytes_raw = 0
+        self.bytes_sent = 0
+
+    def register(self, body: dict):
+        """Forward a registration synchronously; (status, payload) or None if upstream is unavailable"""
+        try:
+            r = self.resilience.post(self.session, self.base_url + REGISTER, json=body, timeout=self.timeout)
+        except (requests.exceptions.RequestException, CircuitOpenError):
+            return None
+        if r.status_code in RETRYABLE_STATUS:
+            return None
+        try:
+            return r.status_code, r.json()
+        except ValueError:
+            return None
+
+    def send(self, items: list) -> int:
+        """Deliver items in order; returns how many were delivered before upstream became unavailable"""
+        if self.batch_supported is not False:
+            delivered = self._send_batch(items)
+            if delivered is not None:
+                return delivered
+        return self._send_each(items)
+
+    def _send_batch(self, items: list):
+        raw = json.dumps({"items": items}).encode()
+        body = gzip.compress(raw, self.compress_level)
+        try:
+            r = self.resilience.post(self.session, self.base_url + BATCH_PATH, data=body, timeout=self.timeout,
+                                     headers={"Content-Type": "application/json", "Content-Encoding": "gzip"})
+        except (requests.exceptions.RequestException, CircuitOpenError):
+            return 0
+        if r.status_code == 404 and self.batch_supported is None:
+            print("[RELAY] Upstream has no batch endpoint - forwarding requests individually")
+            self.batch_supported = False
+            return None
+        if r.status_code != 200:
+            return 0
+        try:
+            results = r.json()["results"]
+            if not isinstance(results, list):
+                raise ValueError("results is not a list")
+        except (ValueError, KeyError, TypeError):
+            # Not a batch reply (a proxy page, a truncated body): keep the batch for a retry
+            return 0
+
+        self.batch_supported = True
+        self.batches += 1
+        self.bytes_raw += len(raw)
+        self.bytes_sent += len(body)
+        # Items the server could not process right now (a handler's 500, a 503)
+        # are retried like _post_one would, from the first one on, to keep order
+        delivered = min(len(results), len(items))
+        for index, result in enumerate(results[:delivered]):
+            status = result.get("status") if isinstance(result, dict) else None
+            if status in RETRYABLE_STATUS:
+                delivered = index
+                break
+            self.rejected += status != 200
+        self.forwarded += delivered
+        return delivered
+
+    def _post_one(self, item: dict) -> bool:
+        try:
+            r = self.resilience.post(self.session, self.base_url + item["path"], json=item["body"], timeout=self.timeout)
+        except (requests.exceptions.RequestException, CircuitOpenError):
+            return False
+        if r.status_code in RETRYABLE_STATUS:
+            return False
+        self.rejected += r.status_code != 200
+        return True
+
+    def _send_each(self, items: list) -> int:
+        # Strictly in order and stopping at the first failure: the caller
+        # re-sends everything after the delivered prefix, so nothing past a
+        # failure may already have been posted
+        delivered = 0
+        for item in items:
+            if not self._post_one(item):
+                break
+            delivered += 1
+        self.forwarded += delivered
+        return delivered
+
+
+# =========================
+# RELAY
+# =========================
+class Relay:
+    def __init__(self, upstream: Upstream, spool: Spool, batch_size: int = 500, flush_interval: float = 1.0,
+                 max_body: int = 1 << 20):
+        self.upstream = upstream
+        self.spool = spool
+        self.batch_size = min(batch_size, MAX_BATCH_ITEMS)
+        self.flush_interval = flush_interval
+        self.max_body = max_body
+        self.buffer = RelayBuffer()
+        # One thread for batches keeps upstream order; registrations get their own
+        self._batch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="relay-batch")
+        self._register_executor = ThreadPoolExecutor(max_workers=upstream.connections, thread_name_prefix="relay-register")
+        self._flush_event = asyncio.Event()
+        self._failures = 0
+        self._retry_at = 0.0
+
+        self.received = {path: 0 for path in PATHS}
+        self.registered_locally = 0
+        self.started = time.monotonic()
+
+    # ----- local side -----
+    async def handle(self, path: str, body: dict):
+        error = validate(path, body)
+        if error:
+            return 400, {"error": error}
+        self.received[path] += 1
+
+        if path == REGISTER and time.monotonic() >= self._retry_at:
+            # Pass registration through while upstream is reachable so token
+            # rejections reach the device
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._register_executor, self.upstream.register, body)
+            if result is not None:
+                return result
+            self._upstream_failed()
+
+        if path == REGISTER:
+            self.registered_locally += 1
+        self.buffer.add(path, body)
+        if len(self.buffer) >= self.batch_size:
+            self._flush_event.set()
+        return 200, local_ack(path, body)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader, self.max_body)
+                except HttpError as e:
+                    writer.write(render_response(e.status, {"error": str(e)}, False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                method, path, _, body, _, keep_alive = request
+                if method == "GET" and path == "/__relay":
+                    status, payload = 200, self.summary()
+                elif path not in PATHS:
+                    status, payload = 404, {"error": "Not found"}
+                elif method != "POST":
+                    status, payload = 405, {"error": "Method not allowed"}
+                else:
+                    try:
+                        payload = json.loads(body)
+                        if not isinstance(payload, dict):
+                            raise ValueError("body is not an object")
+                    except ValueError:
+                        status, payload = 500, {"error": "Internal server error"}
+                    else:
+                        try:
+                            status, payload = await self.handle(path, payload)
+                        except Exception as e:
+                            print(f"[RELAY] {path} failed: {type(e).__name__}: {e}", file=sys.stderr)
+                            status, payload = 500, {"error": "Internal server error"}
+
+                writer.write(render_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if not writer.transport.is_closing():
+                writer.close()
+
+    # ----- upstream side -----
+    def _upstream_failed(self):
+        delay = self.upstream.resilience.reconnect_delay(self._failures)
+        self._failures += 1
+        self._retry_at = time.monotonic() + min(delay, 60.0)
+
+    async def _send(self, items: list) -> int:
+        loop = asyncio.get_running_loop()
+        delivered = await loop.run_in_executor(self._batch_executor, self.upstream.send, items)
+        if delivered < len(items):
+            self._upstream_failed()
+        else:
+            self._failures = 0
+            self._retry_at = 0.0
+        return delivered
+
+    async def flush(self, final: bool = False):
+        # Spooled batches are older than anything buffered, so they go first
+        while len(self.spool) and (final or time.monotonic() >= self._retry_at):
+            batch = self.spool.peek()
+            if batch is None:
+                break
+            name, items = batch
+            delivered = await self._send(items)
+            if delivered < len(items):
+                self.spool.requeue(name, items[delivered:])
+                break
+            self.spool.pop(name)
+
+        while len(self.buffer):
+            if len(self.spool) or time.monotonic() < self._retry_at:
+                # Upstream is down: spool full batches (memory stays bounded by
+                # one batch) and keep deduplicating the partial one
+                if not final and len(self.buffer) < self.batch_size:
+                    break
+                self.spool.push(self.buffer.take(self.batch_size))
+                continue
+            items = self.buffer.take(self.batch_size)
+            delivered = await self._send(items)
+            if delivered < len(items):
+                self.spool.push(items[delivered:])
+
+    async def flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+            try:
+                await self.flush()
+            except OSError as e:
+                print(f"[RELAY] Spool error: {e}", file=sys.stderr)
+            except Exception as e:
+                # Whatever went wrong, the next cycle must still run or the relay only ever acks
+                print(f"[RELAY] Flush failed: {type(e).__name__}: {e}", file=sys.stderr)
+
+    def summary(self) -> dict:
+        up = self.upstream
+        return {
+            "uptime_s": round(time.monotonic() - self.started, 1),
+            "received": dict(self.received),
+            "deduplicated": self.buffer.deduplicated,
+            "registered_locally": self.registered_locally,
+            "buffered": len(self.buffer),
+            "forwarded": up.forwarded,
+            "rejected_upstream": up.rejected,
+            "batches": up.batches,
+            "compression_ratio": round(up.bytes_raw / up.bytes_sent, 2) if up.bytes_sent else None,
+            "spooled_batches": len(self.spool),
+            "spooled_items": self.spool.pending_items(),
+            "spool_bytes": self.spool.bytes,
+            "dropped": self.spool.dropped,
+            "spool_quarantined": self.spool.quarantined,
+            "upstream_available": time.monotonic() >= self._retry_at,
+        }
+
+    async def report(self, interval: float):
+        last_received, last_forwarded = 0, 0
+        while True:
+            await asyncio.sleep(interval)
+            received, forwarded = sum(self.received.values()), self.upstream.forwarded
+            summary = self.summary()
+            print(f"[RELAY] in {(received - last_received) / interval:,.0f}/s  "
+                  f"out {(forwarded - last_forwarded) / interval:,.0f}/s  "
+                  f"dedup {summary['deduplicated']}  buffered {summary['buffered']}  "
+                  f"spooled {summary['spooled_items']}  "
+                  f"upstream {'up' if summary['upstream_available'] else 'DOWN'}", flush=True)
+            last_received, last_forwarded = received, forwarded
+
+
+async def serve(args, relay: Relay):
+    listener = await asyncio.start_server(relay.handle_connection, args.host, args.port, backlog=args.backlog)
+    print(f"[✓] Relay listening on http://{args.host}:{args.port} -> {args.upstream}", flush=True)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    tasks = [asyncio.ensure_future(relay.flush_loop())]
+    if args.report_interval > 0:
+        tasks.append(asyncio.ensure_future(relay.report(args.report_interval)))
+    async with listener:
+        await stop.wait()
+    for task in tasks:
+        task.cancel()
+
+    # Whatever upstream does not take now stays in the spool for next start
+    print("[RELAY] Flushing before exit...")
+    await relay.flush(final=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Relay local agent and meter traffic to the monitoring server")
+    parser.add_argument("--upstream", required=True, help="Dashboard base URL, e.g. https://monitor.example.com")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--batch-size", type=int, default=500, help=f"Requests per upstream batch (max {MAX_BATCH_ITEMS})")
+    parser.add_argument("--flush-interval", type=float, default=1.0, help="Seconds between upstream flushes")
+    parser.add_argument("--upstream-connections", type=int, default=2, help="Persistent upstream connections")
+    parser.add_argument("--compress-level", type=int, default=6, help="gzip level for batches")
+    parser.add_argument("--spool-dir", default="relay-spool")
+    parser.add_argument("--spool-max-mb", type=float, default=512)
+    parser.add_argument("--report-interval", type=float, default=10.0)
+    args = parser.parse_args()
+
+    upstream = Upstream(args.upstream, args.upstream_connections, compress_level=args.compress_level)
+    spool = Spool(args.spool_dir, int(args.spool_max_mb * (1 << 20)))
+    if len(spool):
+        print(f"[RELAY] Resuming {spool.pending_items()} spooled requests from {args.spool_dir}")
+    relay = Relay(upstream, spool, args.batch_size, args.flush_interval)
+
+    try:
+        asyncio.run(serve(args, relay))
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(relay.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
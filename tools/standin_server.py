@@ -0,0 +1,621 @@
+#!/usr/bin/env python3
+"""
+Stand-in Ingestion Server
+Serves /api/monitor/* with the Next.js response shapes, plus latency and failure injection
+"""
+
+import sys
+import gzip
+import json
+import time
+import random
+import socket
+import signal
+import struct
+import string
+import asyncio
+import argparse
+from collections import deque
+from datetime import datetime, timezone
+
+from token_verifier import TokenVerifier
+
+# Per-device history is capped the same way as src/lib/monitoring.ts
+HISTORY_LIMIT = 100
+MAX_HEADER_LINES = 100
+# Same cap as src/app/api/monitor/batch/route.ts
+MAX_BATCH_ITEMS = 5000
+BATCH_PATH = "/api/monitor/batch"
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+METER_FIELDS = (
+    "voltage_v",
+    "current_a",
+    "active_power_kw",
+    "reactive_power_kvar",
+    "apparent_power_kva",
+    "power_factor",
+    "frequency_hz",
+    "cumulative_kwh",
+)
+# Optional agent-supplied connection fields, kept when present
+CONNECTION_TAGS = ("namespace", "container", "destScope", "destSite", "destCountry", "destAsn", "destOrg")
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def now_iso() -> str:
+    # Same rendering as a JavaScript Date in NextResponse.json
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _base36(length: int) -> str:
+    return "".join(random.choices(string.ascii_lowercase + string.digits, k=length))
+
+
+def record_id(user_id: str) -> str:
+    return f"{user_id}-{int(time.time() * 1000)}-{_base36(9)}"
+
+
+# =========================
+# MONITORING STATE
+# =========================
+class MonitorState:
+    """In-memory port of src/lib/monitoring.ts"""
+
+    def __init__(self):
+        self.users = {}
+
+    def _snapshot(self, user: dict) -> dict:
+        return dict(user, connections=list(user["connections"]), meterReadings=list(user["meterReadings"]))
+
+    def register(self, user_id: str, username: str, device_name: str):
+        user = self.users.get(user_id)
+        if user:
+            user.update(username=username, deviceName=device_name, lastSeen=now_iso(), status="online")
+            return user, False
+
+        for existing in self.users.values():
+            if existing["deviceName"] == device_name and existing["username"] == username:
+                # Token refresh: the device keeps its history under the new id
+                del self.users[existing["id"]]
+                existing.update(id=user_id, lastSeen=now_iso(), status="online")
+                self.users[user_id] = existing
+                return existing, False
+
+        now = now_iso()
+        user = {
+            "id": user_id,
+            "username": username,
+            "deviceName": device_name,
+            "status": "online",
+            "connections": deque(maxlen=HISTORY_LIMIT),
+            "meterReadings": deque(maxlen=HISTORY_LIMIT),
+            "lastSeen": now,
+            "registeredAt": now,
+        }
+        self.users[user_id] = user
+        return user, True
+
+    def update_status(self, user_id: str, status: str):
+        user = self.users.get(user_id)
+        if user:
+            user.update(status=status, lastSeen=now_iso())
+
+    def mark_status(self, user_id, device_name, status: str) -> bool:
+        if user_id and user_id in self.users:
+            self.update_status(user_id, status)
+            return True
+        if device_name:
+            found = self.find_by_device(device_name)
+            if found:
+                self.update_status(found[0]["id"], status)
+                return True
+        return False
+
+    def find_by_device(self, device_name: str) -> list:
+        return [user for user in self.users.values() if user["deviceName"] == device_name]
+
+    def add_connection(self, user_id, source_ip, source_port, dest_ip, dest_port, protocol, tags=None) -> dict:
+        now = now_iso()
+        connection = {
+            "id": record_id(user_id),
+            "userId": user_id,
+            "sourceIp": source_ip,
+            "sourcePort": source_port,
+            "destIp": dest_ip,
+            "destPort": dest_port,
+            "protocol": protocol,
+            "bytesIn": 0,
+            "bytesOut": 0,
+            "packetsIn": 0,
+            "packetsOut": 0,
+            "state": "ESTABLISHED",
+            **{key: value for key, value in (tags or {}).items() if value},
+            "timestamp": now,
+            "lastUpdated": now,
+        }
+        user = self.users.get(user_id)
+        if user:
+            user["connections"].append(connection)
+        return connection
+
+    def add_reading(self, user_id: str, values: dict) -> dict:
+        user = self.users[user_id]
+        reading = {"id": record_id(user_id), "userId": user_id, "timestamp": now_iso()}
+        reading.update(values)
+        user["meterReadings"].append(reading)
+        user.update(lastSeen=now_iso(), status="online")
+        return reading
+
+
+# =========================
+# ROUTES
+# =========================
+def to_number(value):
+    # Number(x) in the route handlers; NaN serializes as null there
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def handle_register(state: MonitorState, body: dict):
+    user_id = body.get("userId") or body.get("token")
+    device_name = body.get("deviceName")
+    if not user_id:
+        return 400, {"error": "Token and device name required"}
+    if not device_name:
+        return 400, {"error": "Device name is required"}
+
+    user, is_new = state.register(user_id, "Device User", device_name)
+    return 200, {"success": True, "data": state._snapshot(user), "reused": not is_new}
+
+
+def handle_connections(state: MonitorState, body: dict):
+    user_id = body.get("userId") or body.get("token")
+    if not user_id:
+        return 400, {"error": "User ID required"}
+
+    source_ip, dest_ip, protocol = body.get("sourceIp"), body.get("destIp"), body.get("protocol")
+    if not source_ip or not dest_ip or not protocol:
+        return 400, {"error": "Missing connection data"}
+    if str(protocol).upper() not in ("TCP", "UDP"):
+        return 400, {"error": "Only TCP and UDP protocols are supported"}
+
+    state.update_status(user_id, "online")
+    connection = state.add_connection(
+        user_id, source_ip, body.get("sourcePort") or 0, dest_ip, body.get("destPort") or 0, protocol.upper(),
+        {key: body.get(key) for key in CONNECTION_TAGS},
+    )
+    return 200, {"success": True, "data": connection}
+
+
+def handle_status(state: MonitorState, body: dict):
+    user_id = body.get("userId") or body.get("token")
+    status = body.get("status")
+    if status not in ("online", "offline"):
+        return 400, {"error": "Valid status required"}
+    if not state.mark_status(user_id, body.get("deviceName"), status):
+        return 404, {"error": "User or device not found"}
+    return 200, {"success": True}
+
+
+def handle_meter(state: MonitorState, body: dict):
+    user_id = body.get("userId") or body.get("token")
+    device_name = body.get("deviceName")
+    real_user_id = user_id
+
+    if real_user_id not in state.users and device_name:
+        candidates = state.find_by_device(device_name)
+        if candidates:
+            # ISO timestamps sort chronologically, so max() is the most recent
+            real_user_id = max(candidates, key=lambda user: user["lastSeen"])["id"]
+
+    if not real_user_id and device_name:
+        auto_id = user_id or f"auto-{int(time.time() * 1000)}-{_base36(5)}"
+        real_user_id = state.register(auto_id, "Auto device", device_name)[0]["id"]
+
+    if not real_user_id:
+        return 400, {"error": "User ID required"}
+    if any(field not in body for field in METER_FIELDS):
+        return 400, {"error": "Missing meter reading data"}
+
+    protocol = body.get("protocol")
+    if protocol and protocol not in ("TCP", "UDP"):
+        return 400, {"error": "Only TCP and UDP protocols are supported"}
+    if real_user_id not in state.users:
+        return 404, {"error": "User not found after ID resolution"}
+
+    values = {field: to_number(body[field]) for field in METER_FIELDS}
+    values["ip"] = body.get("ip") or "unknown"
+    values["protocol"] = protocol if protocol in ("TCP", "UDP") else "TCP"
+    return 200, {"success": True, "data": state.add_reading(real_user_id, values)}
+
+
+ROUTES = {
+    "/api/monitor/register": handle_register,
+    "/api/monitor/connections": handle_connections,
+    "/api/monitor/status": handle_status,
+    "/api/monitor/meter": handle_meter,
+}
+
+
+# =========================
+# FAULTS AND STATS
+# =========================
+class FaultInjector:
+    """Decides per request how long to stall and whether to fail or reset"""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, reset_rate=0.0, seed=None):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.reset_rate = reset_rate
+        self._random = random.Random(seed)
+
+    async def delay(self):
+        if self.latency or self.jitter:
+            await asyncio.sleep(max(0.0, self._random.gauss(self.latency, self.jitter) if self.jitter else self.latency))
+
+    def should_reset(self) -> bool:
+        return self.reset_rate > 0 and self._random.random() < self.reset_rate
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and self._random.random() < self.error_rate
+
+
+class RouteStats:
+    def __init__(self):
+        self.requests = 0
+        self.batched = 0
+        self.statuses = {}
+        self.resets = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.min_in = None
+        self.max_in = 0
+
+    def record(self, status: int, size_in: int, size_out: int):
+        self.requests += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.bytes_in += size_in
+        self.bytes_out += size_out
+        self.min_in = size_in if self.min_in is None else min(self.min_in, size_in)
+        self.max_in = max(self.max_in, size_in)
+
+    def record_batched(self, status: int):
+        """An item that arrived inside a /api/monitor/batch request"""
+        self.batched += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def summary(self) -> dict:
+        return {
+            "requests": self.requests,
+            "batched": self.batched,
+            "statuses": {str(code): count for code, count in sorted(self.statuses.items())},
+            "resets": self.resets,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "request_bytes": {
+                "min": self.min_in or 0,
+                "mean": round(self.bytes_in / self.requests, 1) if self.requests else 0,
+                "max": self.max_in,
+            },
+            "mean_response_bytes": round(self.bytes_out / self.requests, 1) if self.requests else 0,
+        }
+
+
+class ServerStats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.routes = {}
+        self.connections = 0
+        self._window_start = self.started
+        self._window_requests = 0
+
+    def route(self, path: str) -> RouteStats:
+        stats = self.routes.get(path)
+        if stats is None:
+            stats = self.routes[path] = RouteStats()
+        return stats
+
+    def record(self, path: str, status: int, size_in: int, size_out: int):
+        self.route(path).record(status, size_in, size_out)
+        self._window_requests += 1
+
+    def take_window(self):
+        """Return (requests, seconds) since the previous call"""
+        now = time.monotonic()
+        window = (self._window_requests, now - self._window_start)
+        self._window_start, self._window_requests = now, 0
+        return window
+
+    def summary(self) -> dict:
+        elapsed = time.monotonic() - self.started
+        total = sum(stats.requests for stats in self.routes.values())
+        return {
+            "uptime_s": round(elapsed, 3),
+            "connections": self.connections,
+            "requests": total,
+            "requests_per_sec": round(total / elapsed, 1) if elapsed > 0 else 0.0,
+            "routes": {path: stats.summary() for path, stats in sorted(self.routes.items())},
+        }
+
+
+# =========================
+# HTTP
+# =========================
+async def read_request(reader: asyncio.StreamReader, max_body: int):
+    """Read one HTTP/1.x request; returns None when the client closes between requests"""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    size = len(request_line)
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "Malformed request line")
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        size += len(line)
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HttpError(400, "Too many headers")
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        body = bytearray()
+        while True:
+            line = await reader.readline()
+            try:
+                chunk_size = int(line.split(b";")[0], 16)
+            except ValueError:
+                chunk_size = -1
+            if chunk_size < 0:
+                raise HttpError(400, "Bad chunk size")
+            if chunk_size == 0:
+                await reader.readline()
+                break
+            if len(body) + chunk_size > max_body:
+                raise HttpError(413, "Request body too large")
+            body += await reader.readexactly(chunk_size)
+            await reader.readexactly(2)
+        body = bytes(body)
+    elif "content-length" in headers:
+        try:
+            length = int(headers["content-length"])
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HttpError(400, "Bad Content-Length")
+        if length > max_body:
+            raise HttpError(413, "Request body too large")
+        body = await reader.readexactly(length)
+    elif method in ("POST", "PUT"):
+        raise HttpError(411, "Content-Length required")
+    else:
+        body = b""
+
+    keep_alive = headers.get("connection", "").lower() != "close"
+    if version == "HTTP/1.0":
+        keep_alive = headers.get("connection", "").lower() == "keep-alive"
+
+    return method, target.split("?", 1)[0], headers, body, size + len(body), keep_alive
+
+
+def render_response(status: int, payload: dict, keep_alive: bool) -> bytes:
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def _reset(writer: asyncio.StreamWriter):
+    """Drop the connection with a TCP RST instead of an orderly FIN"""
+    sock = writer.get_extra_info("socket")
+    if sock is not None:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        except OSError:
+            pass
+    writer.transport.abort()
+
+
+class StandinServer:
+    def __init__(self, faults: FaultInjector = None, verifier: TokenVerifier = None,
+                 max_body: int = 1 << 20, quiet: bool = False):
+        self.state = MonitorState()
+        self.faults = faults or FaultInjector()
+        self.verifier = verifier
+        self.max_body = max_body
+        self.quiet = quiet
+        self.stats = ServerStats()
+
+    def dispatch(self, method: str, path: str, headers: dict, body: bytes):
+        if method == "GET" and path == "/__stats":
+            return 200, self.stats.summary()
+
+        if path != BATCH_PATH and path not in ROUTES:
+            return 404, {"error": "Not found"}
+        if method != "POST":
+            return 405, {"error": "Method not allowed"}
+
+        try:
+            if headers.get("content-encoding") == "gzip":
+                body = gzip.decompress(body)
+            payload = json.loads(body)
+            if not isinstance(payload, dict):
+                raise ValueError("body is not an object")
+        except (ValueError, OSError, EOFError):
+            # request.json() throws inside the route's try block
+            return 500, {"error": "Internal server error"}
+
+        if self.faults.should_fail():
+            return 500, {"error": "Internal server error"}
+        if path == BATCH_PATH:
+            return self.dispatch_batch(payload)
+        return self.handle(path, payload)
+
+    def dispatch_batch(self, payload: dict):
+        items = payload.get("items")
+        if not isinstance(items, list) or len(items) > MAX_BATCH_ITEMS:
+            return 400, {"error": f"items must be an array of at most {MAX_BATCH_ITEMS} requests"}
+
+        results = []
+        for item in items:
+            path = item.get("path") if isinstance(item, dict) else None
+            if path not in ROUTES:
+                results.append({"status": 404, "error": "Unknown path"})
+                continue
+            body = item.get("body")
+            status, response = self.handle(path, body if isinstance(body, dict) else {})
+            self.stats.route(path).record_batched(status)
+            results.append({"status": status} if status == 200 else {"status": status, "error": response.get("error")})
+        return 200, {"success": True, "results": results}
+
+    def handle(self, path: str, payload: dict):
+        try:
+            if self.verifier is not None:
+                credential = payload.get("userId") or payload.get("token")
+                if credential and self.verifier.verify(credential) is None:
+                    return 401, {"error": "Invalid token"}
+            return ROUTES[path](self.state, payload)
+        except Exception:
+            # Wrong-typed fields (a list token, say) blow up inside the route's try block
+            return 500, {"error": "Internal server error"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats.connections += 1
+        try:
+            while True:
+                try:
+                    request = await read_request(reader, self.max_body)
+                except HttpError as e:
+                    writer.write(render_response(e.status, {"error": str(e)}, False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                method, path, headers, body, size_in, keep_alive = request
+                if path != "/__stats":
+                    if self.faults.should_reset():
+                        self.stats.route(path).resets += 1
+                        _reset(writer)
+                        return
+                    await self.faults.delay()
+
+                status, payload = self.dispatch(method, path, headers, body)
+                response = render_response(status, payload, keep_alive)
+                if path != "/__stats":
+                    self.stats.record(path, status, size_in, len(response))
+                writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if not writer.transport.is_closing():
+                writer.close()
+
+    async def report(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            requests, elapsed = self.stats.take_window()
+            if not self.quiet:
+                print(f"[STATS] {requests / elapsed:,.0f} req/s, {len(self.state.users)} devices, "
+                      f"{self.stats.connections} connections total", flush=True)
+
+
+async def serve(args, server: StandinServer):
+    listener = await asyncio.start_server(server.handle_connection, args.host, args.port, backlog=args.backlog)
+    print(f"[✓] Stand-in server listening on http://{args.host}:{args.port}/api/monitor/", flush=True)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: Ctrl+C surfaces as KeyboardInterrupt instead
+
+    reporter = asyncio.ensure_future(server.report(args.report_interval)) if args.report_interval > 0 else None
+    async with listener:
+        if args.duration:
+            await asyncio.wait([asyncio.ensure_future(stop.wait())], timeout=args.duration)
+        else:
+            await stop.wait()
+    if reporter:
+        reporter.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stand-in for the /api/monitor/* ingestion routes")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--backlog", type=int, default=1024)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean delay before each response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Standard deviation of the delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--reset-rate", type=float, default=0.0,
+                        help="Fraction of requests whose connection is reset without a response")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible fault injection")
+    parser.add_argument("--verify-tokens", action="store_true",
+                        help="Reject requests whose userId/token is not a valid signed token (401)")
+    parser.add_argument("--max-body", type=int, default=1 << 20)
+    parser.add_argument("--report-interval", type=float, default=5.0, help="Seconds between rate lines (0 disables)")
+    parser.add_argument("--duration", type=float, help="Stop after this many seconds")
+    parser.add_argument("--stats-json", help="Write the final statistics to this file")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args()
+
+    for name in ("error_rate", "reset_rate"):
+        if not 0.0 <= getattr(args, name) <= 1.0:
+            print(f"[ERROR] --{name.replace('_', '-')} must be between 0 and 1")
+            sys.exit(1)
+
+    faults = FaultInjector(args.latency_ms, args.jitter_ms, args.error_rate, args.reset_rate, args.seed)
+    server = StandinServer(faults, TokenVerifier() if args.verify_tokens else None, args.max_body, args.quiet)
+
+    try:
+        asyncio.run(serve(args, server))
+    except KeyboardInterrupt:
+        pass
+
+    summary = server.stats.summary()
+    if server.verifier is not None:
+        summary["token_cache"] = server.verifier.stats()
+    print(json.dumps(summary, indent=2))
+    if args.stats_json:
+        with open(args.stats_json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+TCP Stream Receiver
+Terminates long-lived meter streams (PROTOCOL=TCP with STREAM_TARGET), forwards readings
+and status updates to /api/monitor/* in batches and acknowledges them once delivered
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import asyncio
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(REPO_ROOT, "meter"))
+
+from monitor_relay import Upstream, METER, STATUS as STATUS_PATH
+from standin_server import MAX_BATCH_ITEMS
+from stream_transport import (
+    FRAME_HEADER, MAX_FRAME, HELLO, WELCOME, READING_FRAME, STATUS,
+    decode_body, encode_json, encode_ack,
+)
+
+
+class StreamSession:
+    """Delivery state for one meter session; survives reconnects"""
+
+    def __init__(self, session: str, info: dict):
+        self.session = session
+        self.info = info
+        self.writer = None
+        # Highest sequence number accepted from the stream and highest delivered upstream
+        self.received = 0
+        self.acked = 0
+        self.last_seen = time.monotonic()
+
+
+class StreamReceiver:
+    """
+    Each meter keeps at most `window` frames unacknowledged and frames are
+    acked only once upstream has taken them, so while the server is slow or
+    down the backlog here stays bounded by connected meters x window and the
+    rest waits on the meters.
+    """
+
+    def __init__(self, upstream: Upstream, window: int = 64, batch_size: int = 500, flush_interval: float = 0.5,
+                 session_timeout: float = 3600.0, handshake_timeout: float = 10.0):
+        self.upstream = upstream
+        self.window = window
+        self.batch_size = min(batch_size, MAX_BATCH_ITEMS)
+        self.flush_interval = flush_interval
+        self.session_timeout = session_timeout
+        self.handshake_timeout = handshake_timeout
+        self.sessions = {}
+        # (session, seq, item) in arrival order
+        self.outbox = deque()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-forward")
+        self._flush_event = asyncio.Event()
+        self._handlers = set()
+        self._failures = 0
+        self._retry_at = 0.0
+
+        self.connections = 0
+        self.frames = {READING_FRAME: 0, STATUS: 0}
+        self.duplicates = 0
+        self.protocol_errors = 0
+        self.expired_sessions = 0
+        self.started = time.monotonic()
+
+    # ----- streams -----
+    async def read_frame(self, reader: asyncio.StreamReader):
+        header = await reader.readexactly(FRAME_HEADER.size)
+        length, kind = FRAME_HEADER.unpack(header)
+        if not 1 <= length <= MAX_FRAME:
+            raise ValueError(f"bad frame length {length}")
+        return kind, await reader.readexactly(length - 1)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self.connections += 1
+        self._handlers.add(asyncio.current_task())
+        session = None
+        try:
+            kind, body = await asyncio.wait_for(self.read_frame(reader), self.handshake_timeout)
+            if kind != HELLO:
+                raise ValueError("stream must start with HELLO")
+            session = self._hello(decode_body(kind, body)[1])
+            if session.writer is not None and not session.writer.transport.is_closing():
+                # The meter reconnected before noticing its old connection was gone
+                session.writer.close()
+            session.writer = writer
+            writer.write(encode_json(WELCOME, {"window": self.window, "acked": session.acked}))
+            await writer.drain()
+
+            while True:
+                kind, body = await self.read_frame(reader)
+                seq, payload = decode_body(kind, body)
+                if kind not in self.frames:
+                    raise ValueError(f"unexpected frame kind {kind}")
+                session.last_seen = time.monotonic()
+                if seq <= session.received:
+                    # Resent after a reconnect but already taken
+                    self.duplicates += 1
+                    continue
+                session.received = seq
+                self.frames[kind] += 1
+                self.outbox.append((session, seq, self._item(session, kind, payload)))
+                if len(self.outbox) >= self.batch_size:
+                    self._flush_event.set()
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            pass
+        except ValueError as e:
+            self.protocol_errors += 1
+            print(f"[STREAM] Protocol error from {writer.get_extra_info('peername')}: {e}", file=sys.stderr)
+        finally:
+            self._handlers.discard(asyncio.current_task())
+            if session is not None and session.writer is writer:
+                session.writer = None
+            if not writer.transport.is_closing():
+                writer.close()
+
+    def _hello(self, hello: dict) -> StreamSession:
+        session_id = str(hello.get("session", ""))
+        if not session_id or not hello.get("token"):
+            raise ValueError("HELLO needs a session and a token")
+        info = {"token": hello["token"], "deviceName": hello.get("deviceName"), "ip": hello.get("ip")}
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = StreamSession(session_id, info)
+            # A receiver restart loses delivery state; trust the meter's oldest unacked frame
+            session.received = session.acked = max(0, int(hello.get("first_seq", 1)) - 1)
+        session.info = info
+        session.last_seen = time.monotonic()
+        return session
+
+    @staticmethod
+    def _item(session: StreamSession, kind: int, payload) -> dict:
+        info = session.info
+        if kind == STATUS:
+            return {"path": STATUS_PATH, "body": {"token": info["token"], "status": payload,
+                                                  "deviceName": info["deviceName"], "ip": info["ip"]}}
+        return {"path": METER, "body": {
+            "token": info["token"],
+            "deviceName": info["deviceName"],
+            **{name: value for name, value in payload.items() if name != "timestamp"},
+            "ip": info["ip"],
+            "protocol": "TCP",
+        }}
+
+    # ----- forwarding -----
+    async def flush(self, final: bool = False):
+        loop = asyncio.get_running_loop()
+        while self.outbox and (final or time.monotonic() >= self._retry_at):
+            entries = [self.outbox.popleft() for _ in range(min(self.batch_size, len(self.outbox)))]
+            delivered = await loop.run_in_executor(
+                self._executor, self.upstream.send, [item for _, _, item in entries])
+            self._acknowledge(entries[:delivered])
+            if delivered < len(entries):
+                # Not acked, so the meters hold them too; keep them first in line
+                self.outbox.extendleft(reversed(entries[delivered:]))
+                delay = self.upstream.resilience.reconnect_delay(self._failures)
+                self._failures += 1
+                self._retry_at = time.monotonic() + min(delay, 60.0)
+                break
+            self._failures = 0
+            self._retry_at = 0.0
+
+    def _acknowledge(self, entries: list):
+        touched = {}
+        for session, seq, _ in entries:
+            if seq > session.acked:
+                session.acked = seq
+                touched[session.session] = session
+        for session in touched.values():
+            writer = session.writer
+            if writer is not None and not writer.transport.is_closing():
+                writer.write(encode_ack(session.acked))
+
+    async def close_streams(self, timeout: float = 2.0):
+        for session in self.sessions.values():
+            if session.writer is not None:
+                session.writer.close()
+        if self._handlers:
+            await asyncio.wait(list(self._handlers), timeout=timeout)
+
+    def sweep(self):
+        now = time.monotonic()
+        for session_id, session in list(self.sessions.items()):
+            if session.writer is None and now - session.last_seen > self.session_timeout:
+                del self.sessions[session_id]
+                self.expired_sessions += 1
+
+    async def flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+            try:
+                self.sweep()
+                await self.flush()
+            except Exception as e:
+                # A bad upstream reply must not stop forwarding for good; unacked readings are retried
+                print(f"[STREAM] Flush failed: {type(e).__name__}: {e}", file=sys.stderr)
+
+    def summary(self) -> dict:
+        sessions = list(self.sessions.values())
+        return {
+            "uptime_s": round(time.monotonic() - self.started, 1),
+            "connections": self.connections,
+            "connected": sum(1 for s in sessions if s.writer is not None),
+            "sessions": len(sessions),
+            "expired_sessions": self.expired_sessions,
+            "readings": self.frames[READING_FRAME],
+            "status_updates": self.frames[STATUS],
+            "duplicates": self.duplicates,
+            "protocol_errors": self.protocol_errors,
+            "backlog": len(self.outbox),
+            "forwarded": self.upstream.forwarded,
+            "rejected_upstream": self.upstream.rejected,
+        }
+
+    async def report(self, interval: float):
+        last_frames = last_forwarded = 0
+        while True:
+            await asyncio.sleep(interval)
+            summary = self.summary()
+            frames = summary["readings"] + summary["status_updates"]
+            print(f"[STREAM] in {(frames - last_frames) / interval:,.0f}/s  "
+                  f"out {(summary['forwarded'] - last_forwarded) / interval:,.0f}/s  "
+                  f"connected {summary['connected']}  backlog {summary['backlog']}", flush=True)
+            last_frames, last_forwarded = frames, summary["forwarded"]
+
+
+async def serve(args, receiver: StreamReceiver):
+    listener = await asyncio.start_server(receiver.handle_connection, args.host, args.port, backlog=args.backlog)
+    print(f"[✓] Receiving meter streams on tcp://{args.host}:{args.port} -> {args.upstream}", flush=True)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    tasks = [asyncio.ensure_future(receiver.flush_loop())]
+    if args.report_interval > 0:
+        tasks.append(asyncio.ensure_future(receiver.report(args.report_interval)))
+    async with listener:
+        await stop.wait()
+    for task in tasks:
+        task.cancel()
+
+    # Anything upstream does not take now was never acked and the meters send it again
+    await receiver.flush(final=True)
+    await receiver.close_streams()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Receive meter TCP streams and forward them to the monitoring server")
+    parser.add_argument("--upstream", required=True, help="Dashboard base URL, e.g. http://localhost:3000")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5141)
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--window", type=int, default=64, help="Unacknowledged frames allowed per meter")
+    parser.add_argument("--batch-size", type=int, default=500, help=f"Frames per upstream batch (max {MAX_BATCH_ITEMS})")
+    parser.add_argument("--flush-interval", type=float, default=0.5)
+    parser.add_argument("--upstream-connections", type=int, default=2)
+    parser.add_argument("--session-timeout", type=float, default=3600.0, help="Forget disconnected meters after this long")
+    parser.add_argument("--report-interval", type=float, default=10.0)
+    args = parser.parse_args()
+
+    upstream = Upstream(args.upstream, args.upstream_connections)
+    receiver = StreamReceiver(upstream, args.window, args.batch_size, args.flush_interval, args.session_timeout)
+    try:
+        asyncio.run(serve(args, receiver))
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(receiver.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Local HS256 Token Verifier
+Validates agent and meter JWTs for stand-in servers, with an LRU cache of verified tokens
+"""
+
+import os
+import sys
+import json
+import hmac
+import time
+import base64
+import hashlib
+import argparse
+from collections import OrderedDict
+
+# Secrets baked into the Python clients: agent/generate_token.py and
+# meter/meter.py generate_jwt_token respectively
+DEFAULT_SECRETS = (
+    "your-secret-key-change-this-in-production",
+    "default-secret",
+)
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+class TokenVerifier:
+    """
+    Checks signature, algorithm and `iat` (milliseconds, as both clients
+    emit). Verified claims are cached per token string, so a device that
+    keeps presenting the same token skips the HMAC on every later request.
+    """
+
+    def __init__(self, secrets=DEFAULT_SECRETS, max_age=None, max_skew=300, cache_size=100000):
+        # Keyed HMAC state is prepared once and copied per verification
+        self._macs = [hmac.new(secret.encode(), digestmod=hashlib.sha256) for secret in secrets]
+        self.max_age = max_age
+        self.max_skew = max_skew
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+
+    def _check_signature(self, token: str):
+        try:
+            header_b64, payload_b64, signature_b64 = token.split(".")
+            signature = _b64decode(signature_b64)
+        except (ValueError, TypeError):
+            return None
+
+        message = f"{header_b64}.{payload_b64}".encode()
+        for base in self._macs:
+            mac = base.copy()
+            mac.update(message)
+            if hmac.compare_digest(mac.digest(), signature):
+                break
+        else:
+            return None
+
+        try:
+            header = json.loads(_b64decode(header_b64))
+            claims = json.loads(_b64decode(payload_b64))
+        except ValueError:
+            return None
+
+        if header.get("alg") != "HS256" or not isinstance(claims, dict):
+            return None
+        return claims
+
+    def _check_time(self, claims: dict, now_ms: int) -> bool:
+        iat = claims.get("iat")
+        if not isinstance(iat, int):
+            return False
+        if iat > now_ms + self.max_skew * 1000:
+            return False
+        if self.max_age is not None and now_ms - iat > self.max_age * 1000:
+            return False
+        return True
+
+    def verify(self, token: str, now_ms: int = None):
+        """Return the token's claims, or None if it is not valid"""
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        if not isinstance(token, str):
+            # JSON bodies can carry lists or objects here, which are not even hashable
+            self.rejected += 1
+            return None
+
+        claims = self._cache.get(token)
+        if claims is not None:
+            self._cache.move_to_end(token)
+            self.hits += 1
+        else:
+            self.misses += 1
+            claims = self._check_signature(token)
+            if claims is None:
+                self.rejected += 1
+                return None
+            if self.cache_size:
+                self._cache[token] = claims
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        # Age is re-checked on hits because time moves on while cached
+        if not self._check_time(claims, now_ms):
+            self._cache.pop(token, None)
+            self.rejected += 1
+            return None
+        return claims
+
+    def verify_request(self, body: dict):
+        """Verify the credential of a /api/monitor/* body ('userId' or 'token')"""
+        return self.verify(body.get("userId") or body.get("token"))
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "rejected": self.rejected,
+            "cached": len(self._cache),
+        }
+
+
+# =========================
+# BENCHMARK
+# =========================
+def benchmark(devices: int, requests: int, cache_size: int):
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, os.path.join(repo_root, "agent"))
+    from generate_token import TokenMinter
+
+    minter = TokenMinter()
+    tokens = [minter.mint(f"user-{i}", f"device-{i}") for i in range(devices)]
+
+    print(f"{'cache':<10}{'verified/s':>14}{'hit rate':>10}")
+    for size in (0, cache_size):
+        verifier = TokenVerifier(cache_size=size)
+        started = time.perf_counter()
+        for i in range(requests):
+            if verifier.verify(tokens[i % devices]) is None:
+                raise RuntimeError("benchmark token failed verification")
+        elapsed = time.perf_counter() - started
+        hit_rate = verifier.hits / requests
+        label = "off" if size == 0 else str(size)
+        print(f"{label:<10}{requests / elapsed:>14,.0f}{hit_rate:>10.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify monitor JWTs or benchmark the verifier")
+    parser.add_argument("tokens", nargs="*", help="Tokens to verify")
+    parser.add_argument("--max-age", type=int, help="Reject tokens older than this many seconds")
+    parser.add_argument("--bench", action="store_true", help="Benchmark verification with and without the cache")
+    parser.add_argument("--devices", type=int, default=1000, help="Distinct tokens in the benchmark")
+    parser.add_argument("--requests", type=int, default=200000, help="Verifications in the benchmark")
+    parser.add_argument("--cache-size", type=int, default=100000)
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.devices, args.requests, args.cache_size)
+        return
+
+    verifier = TokenVerifier(max_age=args.max_age)
+    failed = False
+    for token in args.tokens:
+        claims = verifier.verify(token)
+        if claims is None:
+            failed = True
+            print(f"[✗] invalid: {token[:32]}...")
+        else:
+            print(f"[✓] valid: {json.dumps(claims)}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
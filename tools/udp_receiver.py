@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+UDP Meter Receiver
+Accepts meter datagrams (PROTOCOL=UDP), restores per-session order, detects loss
+and forwards the readings to /api/monitor/meter in batches
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import asyncio
+import argparse
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(REPO_ROOT, "meter"))
+
+from udp_transport import decode, encode_hello_request, HELLO, DATA
+from monitor_relay import Upstream, METER
+from standin_server import MAX_BATCH_ITEMS
+
+
+class Session:
+    """Reorder state for one sender; sequence numbers are per reading"""
+
+    def __init__(self, session: int, addr):
+        self.session = session
+        self.addr = addr
+        self.info = None
+        self.next_seq = None
+        self.pending = {}
+        # Recently skipped sequence numbers, to tell late readings from duplicates
+        self.skipped = set()
+        self.gap_since = None
+        self.last_seen = time.monotonic()
+        self.last_request = 0.0
+
+
+class UdpReceiver(asyncio.DatagramProtocol):
+    """
+    Readings wait in a per-session buffer until every earlier sequence number
+    has arrived. A gap is declared lost after `reorder_window` seconds (or once
+    `max_pending` readings are waiting behind it) and readings arriving after
+    that are counted as late and dropped, so the server always sees each
+    device's readings in order. Sender redundancy usually fills a gap with the
+    next datagram, so the window only needs to cover the sender's interval
+    when readings are infrequent and loss matters more than latency.
+
+    Until a sender answers HELLO_REQUEST its readings cannot be forwarded, so
+    such a session holds at most `max_pending` of them and at most
+    `max_unidentified` sessions are kept waiting; past that the one waiting
+    longest is evicted.
+    """
+
+    def __init__(self, upstream: Upstream, reorder_window: float = 5.0, max_pending: int = 1024,
+                 session_timeout: float = 900.0, batch_size: int = 500, flush_interval: float = 1.0,
+                 max_backlog: int = 100000, max_unidentified: int = 1024):
+        self.upstream = upstream
+        self.reorder_window = reorder_window
+        self.max_pending = max_pending
+        self.session_timeout = session_timeout
+        self.batch_size = min(batch_size, MAX_BATCH_ITEMS)
+        self.flush_interval = flush_interval
+        self.sessions = {}
+        self.max_unidentified = max_unidentified
+        # Session ids still waiting for a HELLO, oldest first
+        self._unidentified = OrderedDict()
+        self.outbox = deque()
+        self.max_backlog = max_backlog
+        self.transport = None
+        # One thread keeps forwarded readings in order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="udp-forward")
+        self._failures = 0
+        self._retry_at = 0.0
+
+        self.datagrams = 0
+        self.malformed = 0
+        self.readings = 0
+        self.duplicates = 0
+        self.late = 0
+        self.lost = 0
+        self.dropped = 0
+        self.unidentified_dropped = 0
+        self.expired_sessions = 0
+        self.evicted_sessions = 0
+        self.started = time.monotonic()
+
+    # ----- receiving -----
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        self.datagrams += 1
+        try:
+            kind, session_id, first_seq, body = decode(data)
+        except ValueError:
+            self.malformed += 1
+            return
+
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = Session(session_id, addr)
+            if kind != HELLO:
+                self._wait_for_hello(session_id)
+        session.addr = addr
+        session.last_seen = time.monotonic()
+
+        if kind == HELLO:
+            session.info = body
+            self._unidentified.pop(session_id, None)
+        elif kind == DATA:
+            self._accept(session, first_seq, body)
+            if session.info is None:
+                self._request_hello(session)
+        self._drain(session)
+
+    def _wait_for_hello(self, session_id: int):
+        self._unidentified[session_id] = None
+        while len(self._unidentified) > self.max_unidentified:
+            oldest, _ = self._unidentified.popitem(last=False)
+            self.unidentified_dropped += len(self.sessions.pop(oldest).pending)
+            self.evicted_sessions += 1
+
+    def _accept(self, session: Session, first_seq: int, readings: list):
+        for offset, reading in enumerate(readings):
+            seq = first_seq + offset
+            if session.info is None and len(session.pending) >= self.max_pending:
+                # Nothing drains until the sender identifies itself; keep the oldest
+                self.unidentified_dropped += 1
+                continue
+            if session.next_seq is not None and seq < session.next_seq:
+                # Either a redundant copy of a forwarded reading or one already given up on
+                if seq in session.skipped:
+                    session.skipped.discard(seq)
+                    self.late += 1
+                else:
+                    self.duplicates += 1
+                continue
+            if seq in session.pending:
+                self.duplicates += 1
+                continue
+            session.pending[seq] = reading
+            self.readings += 1
+
+    def _request_hello(self, session: Session):
+        now = time.monotonic()
+        if now - session.last_request >= 1.0:
+            session.last_request = now
+            self.transport.sendto(encode_hello_request(session.session), session.addr)
+
+    def _drain(self, session: Session, now: float = None):
+        if session.info is None or not session.pending:
+            return
+        if session.next_seq is None:
+            session.next_seq = min(session.pending)
+        now = now or time.monotonic()
+
+        while session.pending:
+            reading = session.pending.pop(session.next_seq, None)
+            if reading is not None:
+                self._forward(session, reading)
+                session.next_seq += 1
+                session.gap_since = None
+                continue
+            # Gap: wait for the missing readings unless they have had their chance
+            if session.gap_since is None:
+                session.gap_since = now
+            if now - session.gap_since < self.reorder_window and len(session.pending) < self.max_pending:
+                return
+            resume = min(session.pending)
+            self.lost += resume - session.next_seq
+            if len(session.skipped) > self.max_pending:
+                session.skipped.clear()
+            session.skipped.update(range(session.next_seq, min(resume, session.next_seq + self.max_pending)))
+            session.next_seq = resume
+            session.gap_since = None
+
+    def _forward(self, session: Session, reading: dict):
+        body = {
+            "token": session.info.get("token"),
+            "deviceName": session.info.get("deviceName"),
+            **{name: value for name, value in reading.items() if name != "timestamp"},
+            "ip": session.info.get("ip"),
+            "protocol": "UDP",
+        }
+        if len(self.outbox) >= self.max_backlog:
+            self.outbox.popleft()
+            self.dropped += 1
+        self.outbox.append({"path": METER, "body": body})
+
+    # ----- forwarding -----
+    def sweep(self):
+        """Release gaps whose reorder window has passed and forget idle senders"""
+        now = time.monotonic()
+        for session_id, session in list(self.sessions.items()):
+            self._drain(session, now)
+            if now - session.last_seen > self.session_timeout:
+                del self.sessions[session_id]
+                self._unidentified.pop(session_id, None)
+                self.expired_sessions += 1
+
+    async def flush(self, final: bool = False):
+        loop = asyncio.get_running_loop()
+        while self.outbox and (final or time.monotonic() >= self._retry_at):
+            items = [self.outbox.popleft() for _ in range(min(self.batch_size, len(self.outbox)))]
+            delivered = await loop.run_in_executor(self._executor, self.upstream.send, items)
+            if delivered < len(items):
+                # Put the rest back in front; the backlog limit applies as new readings arrive
+                self.outbox.extendleft(reversed(items[delivered:]))
+                delay = self.upstream.resilience.reconnect_delay(self._failures)
+                self._failures += 1
+                self._retry_at = time.monotonic() + min(delay, 60.0)
+                break
+            self._failures = 0
+            self._retry_at = 0.0
+
+    async def flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                self.sweep()
+                await self.flush()
+            except Exception as e:
+                # Meters resend whatever was not acked, so log and try again next interval
+                print(f"[UDP] Flush failed: {type(e).__name__}: {e}", file=sys.stderr)
+
+    def summary(self) -> dict:
+        sessions = list(self.sessions.values())
+        return {
+            "uptime_s": round(time.monotonic() - self.started, 1),
+            "datagrams": self.datagrams,
+            "malformed": self.malformed,
+            "sessions": len(sessions),
+            "expired_sessions": self.expired_sessions,
+            "unidentified_sessions": len(self._unidentified),
+            "evicted_sessions": self.evicted_sessions,
+            "unidentified_dropped": self.unidentified_dropped,
+            "readings": self.readings,
+            "duplicates": self.duplicates,
+            "late": self.late,
+            "lost": self.lost,
+            "loss_rate": round(self.lost / (self.readings + self.lost), 4) if self.readings + self.lost else 0.0,
+            "waiting": sum(len(s.pending) for s in sessions),
+            "backlog": len(self.outbox),
+            "dropped": self.dropped,
+            "forwarded": self.upstream.forwarded,
+            "rejected_upstream": self.upstream.rejected,
+        }
+
+    async def report(self, interval: float):
+        last_readings = last_forwarded = 0
+        while True:
+            await asyncio.sleep(interval)
+            summary = self.summary()
+            print(f"[UDP] in {(summary['readings'] - last_readings) / interval:,.0f}/s  "
+                  f"out {(summary['forwarded'] - last_forwarded) / interval:,.0f}/s  "
+                  f"sessions {summary['sessions']}  lost {summary['lost']} ({summary['loss_rate']:.2%})  "
+                  f"backlog {summary['backlog']}", flush=True)
+            last_readings, last_forwarded = summary["readings"], summary["forwarded"]
+
+
+async def serve(args, receiver: UdpReceiver):
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(lambda: receiver, local_addr=(args.host, args.port))
+    sock = transport.get_extra_info("socket")
+    if args.rcvbuf and sock is not None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, args.rcvbuf)
+    print(f"[✓] Receiving meter datagrams on udp://{args.host}:{args.port} -> {args.upstream}", flush=True)
+
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    tasks = [asyncio.ensure_future(receiver.flush_loop())]
+    if args.report_interval > 0:
+        tasks.append(asyncio.ensure_future(receiver.report(args.report_interval)))
+    await stop.wait()
+    for task in tasks:
+        task.cancel()
+    transport.close()
+
+    # Forward whatever is waiting behind a gap; the gap will not fill now
+    receiver.reorder_window = 0
+    receiver.sweep()
+    await receiver.flush(final=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Receive UDP meter readings and forward them to the monitoring server")
+    parser.add_argument("--upstream", required=True, help="Dashboard base URL, e.g. http://localhost:3000")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5140)
+    parser.add_argument("--reorder-window", type=float, default=5.0, help="Seconds to wait for a missing reading")
+    parser.add_argument("--max-pending", type=int, default=1024, help="Readings held behind a gap per sender")
+    parser.add_argument("--session-timeout", type=float, default=900.0, help="Forget senders silent this long")
+    parser.add_argument("--max-unidentified", type=int, default=1024,
+                        help="Senders kept waiting for a HELLO before the oldest is evicted")
+    parser.add_argument("--batch-size", type=int, default=500, help=f"Readings per upstream batch (max {MAX_BATCH_ITEMS})")
+    parser.add_argument("--flush-interval", type=float, default=1.0)
+    parser.add_argument("--upstream-connections", type=int, default=2)
+    parser.add_argument("--max-backlog", type=int, default=100000, help="Readings kept while upstream is down")
+    parser.add_argument("--rcvbuf", type=int, default=4 << 20, help="Socket receive buffer in bytes (0 = system default)")
+    parser.add_argument("--report-interval", type=float, default=10.0)
+    args = parser.parse_args()
+
+    upstream = Upstream(args.upstream, args.upstream_connections)
+    receiver = UdpReceiver(upstream, args.reorder_window, args.max_pending, args.session_timeout,
+                           args.batch_size, args.flush_interval, args.max_backlog, args.max_unidentified)
+    try:
+        asyncio.run(serve(args, receiver))
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(receiver.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()